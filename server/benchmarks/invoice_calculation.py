@@ -0,0 +1,236 @@
+"""Micro-benchmark for invoice recalculation.
+
+Compares the pure calculation kernel (``openinvoice.invoices.calculations.calculate_invoice``) with the
+baseline ORM recalculation it replaced (``baseline_recalculate``, a copy of the previous
+``Invoice.recalculate``) and with the current ``Invoice.recalculate`` on synthetic draft invoices. All data
+is created inside a transaction that is rolled back, so it is safe to run against a development database:
+
+    DJANGO_SETTINGS_MODULE=config.settings.test uv run python -m benchmarks.invoice_calculation --lines 300
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from collections.abc import Callable
+from decimal import Decimal
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started_at)
+    return min(timings)
+
+
+def baseline_recalculate(invoice) -> None:  # noqa: C901
+    """The line-by-line ``Invoice.recalculate`` implementation the calculation kernel replaced.
+
+    Kept as it was (minus shipping, which the synthetic invoices do not have, and adapted to the Decimal
+    calculation helpers) so the benchmark keeps measuring
+    against the original code path: allocations are deleted and recreated one row at a time, and line
+    coupons and tax rates are queried per line.
+    """
+    from djmoney.money import Money
+
+    from openinvoice.core.calculations import allocate_proportionally, calculate_tax_amounts, zero
+    from openinvoice.invoices.choices import InvoiceDiscountSource, InvoiceTaxSource
+    from openinvoice.invoices.models import InvoiceDiscountAllocation, InvoiceLine, InvoiceTaxAllocation
+
+    invoice.discount_allocations.all().delete()
+    invoice.tax_allocations.all().delete()
+
+    lines = list(invoice.lines.select_related("price").all())
+    invoice_tax_rates = list(invoice.tax_rates.order_by("invoice_tax_rates__position"))
+
+    for line in lines:
+        line.amount = line.price.calculate_amount(line.quantity) if line.price else line.unit_amount * line.quantity
+        line_tax_rates = list(line.tax_rates.order_by("invoice_line_tax_rates__position"))
+        tax_rates = line_tax_rates if line_tax_rates else invoice_tax_rates
+        line.total_tax_rate = sum((tax_rate.percentage for tax_rate in tax_rates), Decimal(0))
+        line.unit_excluding_tax_amount = line.unit_amount / line.tax_multiplier
+        line.subtotal_amount = line.amount
+        line.total_taxable_amount = line.amount
+        line.total_discount_amount = zero(invoice.currency)
+        line.total_tax_amount = zero(invoice.currency)
+
+    def add_discount_allocation(line, amount, coupon, source) -> None:
+        InvoiceDiscountAllocation.objects.create(
+            invoice=invoice, invoice_line=line, coupon=coupon, source=source, currency=line.currency, amount=amount
+        )
+
+    discountable_lines = []
+    for line in lines:
+        coupons = list(line.coupons.order_by("invoice_line_coupons__position"))
+        if not coupons:
+            discountable_lines.append(line)
+            continue
+
+        for coupon in coupons:
+            discount_amount = coupon.calculate_amount(line.subtotal_amount)
+            if discount_amount.amount <= 0:
+                continue
+
+            line.subtotal_amount -= discount_amount
+            line.total_taxable_amount -= discount_amount
+            line.total_discount_amount += discount_amount
+            add_discount_allocation(line, discount_amount, coupon, InvoiceDiscountSource.LINE)
+
+    total_taxable_amount = sum(
+        (line.total_taxable_amount for line in discountable_lines),
+        start=zero(invoice.currency),
+    )
+
+    for coupon in list(invoice.coupons.order_by("invoice_coupons__position")):
+        if total_taxable_amount.amount <= 0 or not discountable_lines:
+            break
+
+        discount_amount = coupon.calculate_amount(total_taxable_amount)
+        if discount_amount.amount <= 0:
+            continue
+
+        bases = [line.total_taxable_amount.amount for line in discountable_lines]
+        discount_shares = [
+            Money(share, invoice.currency) for share in allocate_proportionally(discount_amount.amount, bases=bases)
+        ]
+
+        for line, share_amount in zip(discountable_lines, discount_shares, strict=False):
+            share_amount = min(share_amount, line.total_taxable_amount)
+            if share_amount.amount <= 0:
+                continue
+
+            total_taxable_amount -= share_amount
+            line.total_taxable_amount -= share_amount
+            line.total_discount_amount += share_amount
+            add_discount_allocation(line, share_amount, coupon, InvoiceDiscountSource.INVOICE)
+
+    for line in lines:
+        line_tax_rates = list(line.tax_rates.order_by("invoice_line_tax_rates__position"))
+        tax_rates = line_tax_rates if line_tax_rates else invoice_tax_rates
+        line.total_excluding_tax_amount = line.total_taxable_amount / line.tax_multiplier
+
+        source = InvoiceTaxSource.LINE if line_tax_rates else InvoiceTaxSource.INVOICE
+        tax_amounts = [
+            Money(tax_amount, invoice.currency)
+            for tax_amount in calculate_tax_amounts(
+                base_amount=line.total_excluding_tax_amount.amount,
+                taxable_amount=line.total_taxable_amount.amount,
+                tax_multiplier=line.tax_multiplier,
+                percentages=[tax_rate.percentage for tax_rate in tax_rates],
+            )
+        ]
+
+        line.total_tax_amount = zero(invoice.currency)
+        for tax_rate, tax_amount in zip(tax_rates, tax_amounts, strict=False):
+            if tax_amount.amount <= 0:
+                continue
+
+            line.total_tax_amount += tax_amount
+            InvoiceTaxAllocation.objects.create(
+                invoice=invoice,
+                invoice_line=line,
+                tax_rate=tax_rate,
+                source=source,
+                currency=line.currency,
+                amount=tax_amount,
+            )
+
+        line.total_amount = line.total_excluding_tax_amount + line.total_tax_amount
+        line.outstanding_amount = line.total_amount
+        line.outstanding_quantity = line.quantity
+
+    InvoiceLine.objects.bulk_update(lines, fields=InvoiceLine.CALCULATED_FIELDS)
+
+    invoice.subtotal_amount = sum([line.subtotal_amount for line in lines], zero(invoice.currency))
+    invoice.total_discount_amount = sum([line.total_discount_amount for line in lines], zero(invoice.currency))
+    invoice.total_excluding_tax_amount = sum(
+        [line.total_excluding_tax_amount for line in lines], zero(invoice.currency)
+    )
+    invoice.total_tax_amount = sum([line.total_tax_amount for line in lines], zero(invoice.currency))
+    invoice.total_amount = invoice.total_excluding_tax_amount + invoice.total_tax_amount
+    invoice.shipping_amount = zero(invoice.currency)
+    invoice.outstanding_amount = invoice.calculate_outstanding_amount()
+    invoice.save(update_fields=invoice.CALCULATED_FIELDS)
+
+
+def build_invoice(line_count: int):
+    from openinvoice.invoices.choices import InvoiceTaxBehavior
+    from tests.factories import CouponFactory, InvoiceFactory, InvoiceLineFactory, TaxRateFactory
+
+    invoice = InvoiceFactory(currency="EUR", tax_behavior=InvoiceTaxBehavior.INCLUSIVE)
+    account = invoice.account
+    invoice.set_coupons([CouponFactory(account=account, currency="EUR", percentage=Decimal("5"))])
+    invoice.set_tax_rates([TaxRateFactory(account=account, percentage=Decimal("20"))])
+
+    line_coupon = CouponFactory(account=account, currency="EUR", percentage=Decimal("10"))
+    line_tax_rates = [
+        TaxRateFactory(account=account, percentage=Decimal("7")),
+        TaxRateFactory(account=account, percentage=Decimal("3")),
+    ]
+    for idx in range(line_count):
+        line = InvoiceLineFactory(invoice=invoice, unit_amount=Decimal("19.99"), quantity=idx % 7 + 1)
+        if idx % 3 == 0:
+            line.set_coupons([line_coupon])
+        if idx % 2 == 0:
+            line.set_tax_rates(line_tax_rates)
+
+    return invoice
+
+
+def benchmark(line_count: int, repeat: int) -> tuple[float, float, float, float]:
+    from openinvoice.invoices.calculations import calculate_invoice
+
+    invoice = build_invoice(line_count)
+
+    def load_inputs():
+        return invoice.build_calculation_input(list(invoice.lines.for_calculation()))
+
+    calculation_input = load_inputs()
+
+    return (
+        measure(lambda: baseline_recalculate(invoice), repeat),
+        measure(invoice.recalculate, repeat),
+        measure(load_inputs, repeat),
+        measure(lambda: calculate_invoice(calculation_input), repeat),
+    )
+
+
+def run(line_counts: list[int], repeat: int) -> None:
+    from django.db import transaction
+
+    sys.stdout.write(
+        f"{'lines':>6} {'baseline':>14} {'recalculate':>14} {'load inputs':>14} {'kernel':>14} {'kernel/line':>14}\n"
+    )
+
+    for line_count in line_counts:
+        with transaction.atomic():
+            baseline_time, recalculate_time, load_time, kernel_time = benchmark(line_count, repeat)
+            transaction.set_rollback(True)
+
+        sys.stdout.write(
+            f"{line_count:>6} {baseline_time * 1000:>12.2f}ms {recalculate_time * 1000:>12.2f}ms "
+            f"{load_time * 1000:>12.2f}ms {kernel_time * 1000:>12.2f}ms "
+            f"{kernel_time / line_count * 1_000_000:>12.2f}us\n"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, nargs="+", default=[10, 100, 300])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.development")
+
+    import django
+
+    django.setup()
+    run(args.lines, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -50,6 +50,7 @@ LOCAL_APPS = [
     "openinvoice.portal",
     "openinvoice.quotes",
     "openinvoice.prices",
+    "openinvoice.rendering",
     "openinvoice.products",
     "openinvoice.search",
     "openinvoice.shipping_rates",
@@ -57,6 +58,7 @@ LOCAL_APPS = [
     "openinvoice.tax_ids",
     "openinvoice.tax_rates",
     "openinvoice.users",
+    "openinvoice.webhooks",
 ]
 
 THIRD_PARTY_APPS = [
@@ -305,9 +307,65 @@ if PDF_ENGINE == "gotenberg":
     PDF_GENERATOR_BACKEND = "openinvoice.core.pdf.backends.gotenberg.GotenbergBackend"
     GOTENBERG_URL = env.str("DJANGO_GOTENBERG_URL", default="http://localhost:3000")
     GOTENBERG_TIMEOUT = env.int("DJANGO_GOTENBERG_TIMEOUT", default=60)
+    # Requests in flight per process, retries of busy responses and the circuit breaker opening after
+    # GOTENBERG_FAILURE_THRESHOLD failed documents in a row for GOTENBERG_RESET_TIMEOUT seconds
+    GOTENBERG_MAX_IN_FLIGHT = env.int("DJANGO_GOTENBERG_MAX_IN_FLIGHT", default=4)
+    GOTENBERG_MAX_RETRIES = env.int("DJANGO_GOTENBERG_MAX_RETRIES", default=3)
+    GOTENBERG_RETRY_DELAY = env.float("DJANGO_GOTENBERG_RETRY_DELAY", default=0.5)
+    GOTENBERG_FAILURE_THRESHOLD = env.int("DJANGO_GOTENBERG_FAILURE_THRESHOLD", default=5)
+    GOTENBERG_RESET_TIMEOUT = env.int("DJANGO_GOTENBERG_RESET_TIMEOUT", default=30)
+elif PDF_ENGINE == "weasyprint-pool":
+    PDF_GENERATOR_BACKEND = "openinvoice.core.pdf.backends.weasyprint.WeasyPrintPoolBackend"
+    # Seconds a worker may spend on one document and peak memory in MB after which it is replaced
+    PDF_WEASYPRINT_TIMEOUT = env.int("DJANGO_PDF_WEASYPRINT_TIMEOUT", default=60)
+    PDF_WEASYPRINT_MAX_MEMORY = env.int("DJANGO_PDF_WEASYPRINT_MAX_MEMORY", default=512)
+    # Static files loaded once per worker instead of being fetched for every document
+    PDF_WEASYPRINT_PRELOAD = ["css/pdf/classic.css", "fonts/Geist/Geist.woff2"]
 else:
     PDF_GENERATOR_BACKEND = "openinvoice.core.pdf.backends.weasyprint.WeasyPrintBackend"
 
+# Content-addressed cache of generated PDFs, skipping generation for HTML that was rendered before
+PDF_CACHE_STORE = env.str("DJANGO_PDF_CACHE_STORE", default="")
+PDF_CACHE_MAX_SIZE = env.int("DJANGO_PDF_CACHE_MAX_SIZE", default=512) * 1024 * 1024
+PDF_CACHE: dict | None
+if PDF_CACHE_STORE == "filesystem":
+    PDF_CACHE = {
+        "BACKEND": "openinvoice.core.pdf.stores.filesystem.FileSystemStore",
+        "OPTIONS": {
+            "location": env.str("DJANGO_PDF_CACHE_LOCATION", default=str(BASE_DIR.path("pdf-cache"))),
+            "max_size": PDF_CACHE_MAX_SIZE,
+        },
+    }
+elif PDF_CACHE_STORE == "cache":
+    PDF_CACHE = {"BACKEND": "openinvoice.core.pdf.stores.cache.CacheStore"}
+elif PDF_CACHE_STORE == "storage":
+    PDF_CACHE = {
+        "BACKEND": "openinvoice.core.pdf.stores.storage.StorageStore",
+        "OPTIONS": {"max_size": PDF_CACHE_MAX_SIZE},
+    }
+else:
+    PDF_CACHE = None
+# Static files linked from the PDF templates, their content is part of the cache key
+PDF_CACHE_ASSETS = ["css/pdf/classic.css", "fonts/Geist/Geist.woff2"]
+
+# Concurrency used when rendering several documents at once, threads for Gotenberg and processes for WeasyPrint
+PDF_RENDER_THREADS = env.int("DJANGO_PDF_RENDER_THREADS", default=4)
+PDF_RENDER_PROCESSES = env.int("DJANGO_PDF_RENDER_PROCESSES", default=2)
+
+# Render PDFs in the process_render_jobs worker instead of the request, only enable it where that worker runs
+PDF_RENDER_ASYNC = env.bool("DJANGO_PDF_RENDER_ASYNC", default=False)
+PDF_RENDER_MAX_ATTEMPTS = env.int("DJANGO_PDF_RENDER_MAX_ATTEMPTS", default=5)
+PDF_RENDER_RETRY_DELAY = env.int("DJANGO_PDF_RENDER_RETRY_DELAY", default=30)
+# Seconds a claimed job may run before another worker takes it over
+PDF_RENDER_LEASE_TIMEOUT = env.int("DJANGO_PDF_RENDER_LEASE_TIMEOUT", default=600)
+
+# Process webhook events in the process_webhook_events worker instead of the request Stripe waits on, only enable
+# it where that worker runs
+WEBHOOK_PROCESS_ASYNC = env.bool("DJANGO_WEBHOOK_PROCESS_ASYNC", default=False)
+WEBHOOK_BATCH_SIZE = env.int("DJANGO_WEBHOOK_BATCH_SIZE", default=100)
+WEBHOOK_MAX_ATTEMPTS = env.int("DJANGO_WEBHOOK_MAX_ATTEMPTS", default=8)
+WEBHOOK_RETRY_DELAY = env.int("DJANGO_WEBHOOK_RETRY_DELAY", default=30)
+
 # API
 
 REST_FRAMEWORK = {
@@ -629,6 +687,18 @@ MAX_TAXES = 5
 MAX_REVISIONS_PER_INVOICE = 50
 MAX_INVOICE_TAX_RATES = 5
 MAX_INVOICE_COUPONS = 5
+# Seconds a finalized invoice's serialized payload stays cached, kept below the lifetime of signed document URLs
+INVOICE_CACHE_TIMEOUT = env.int("DJANGO_INVOICE_CACHE_TIMEOUT", default=300)
+
+# Payments
+
+# Create provider checkout sessions in the process_payment_checkouts worker instead of the finalize request, only
+# enable it where that worker runs
+PAYMENT_CHECKOUT_ASYNC = env.bool("DJANGO_PAYMENT_CHECKOUT_ASYNC", default=False)
+PAYMENT_CHECKOUT_MAX_ATTEMPTS = env.int("DJANGO_PAYMENT_CHECKOUT_MAX_ATTEMPTS", default=5)
+PAYMENT_CHECKOUT_RETRY_DELAY = env.int("DJANGO_PAYMENT_CHECKOUT_RETRY_DELAY", default=10)
+# Rows accepted by one payment reconciliation request
+MAX_PAYMENT_RECONCILIATION_ROWS = env.int("DJANGO_MAX_PAYMENT_RECONCILIATION_ROWS", default=5000)
 
 # Customers
 
@@ -647,3 +717,9 @@ PORTAL_TOKEN_MAX_AGE = env.int("DJANGO_PORTAL_TOKEN_MAX_AGE", 60 * 60 * 12)  # 1
 INTEGRATIONS = {
     "stripe": "openinvoice.integrations.stripe.integration.StripeIntegration",
 }
+# Transport of the Stripe clients of connections, e.g. openinvoice.integrations.stripe.fake.FakeHTTPClient to work
+# without reaching Stripe. The library's default when unset.
+STRIPE_HTTP_CLIENT = env.str("DJANGO_STRIPE_HTTP_CLIENT", default=None)
+# Seconds a Stripe connection, its decrypted secrets and its client stay cached in each process, on top of
+# invalidation when the connection changes in that process
+STRIPE_CONNECTION_CACHE_TIMEOUT = env.int("DJANGO_STRIPE_CONNECTION_CACHE_TIMEOUT", default=5 * 60)
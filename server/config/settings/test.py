@@ -37,6 +37,10 @@ EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 # PDF
 
 PDF_GENERATOR_BACKEND = "openinvoice.core.pdf.backends.dummy.DummyBackend"
+PDF_RENDER_ASYNC = False
+WEBHOOK_PROCESS_ASYNC = False
+PAYMENT_CHECKOUT_ASYNC = False
+PDF_CACHE = None
 
 # Storage
 
@@ -55,3 +59,7 @@ STORAGES = {
 # Logging
 
 logging.disable()
+
+# Stripe
+
+STRIPE_HTTP_CLIENT = "openinvoice.integrations.stripe.fake.FakeHTTPClient"
@@ -1,5 +1,8 @@
 import structlog
 from django.utils.deprecation import MiddlewareMixin
+from django.utils.functional import SimpleLazyObject
+
+from openinvoice.core.access import resolve_plan
 
 from .models import Account
 from .session import get_active_account_session
@@ -11,6 +14,8 @@ class AccountMiddleware(MiddlewareMixin):
     def process_request(self, request):
         request.account = None
         request.accounts = Account.objects.none()
+        # Resolved on first use and shared by every feature and limit check of the request
+        request.plan = SimpleLazyObject(lambda: resolve_plan(request.account))
 
         if not request.user.is_authenticated:
             return
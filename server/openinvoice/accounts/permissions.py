@@ -38,4 +38,4 @@ class MaxAccountsLimit(WithinLimit):
             return True
 
         usage = self.get_usage(request)
-        return not is_limit_exceeded(request.account, self.key, usage)
+        return not is_limit_exceeded(request.plan, self.key, usage)
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from openinvoice.analytics.models import InvoiceRollup
+from openinvoice.invoices.models import Invoice
+
+
+class Command(BaseCommand):
+    help = "Rebuild the monthly invoice rollups used by the analytics endpoints, e.g. after deploying them."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--account", help="Only rebuild the rollups of this account ID")
+        parser.add_argument("--all", action="store_true", help="Rebuild the rollups of every account")
+
+    def handle(self, *_, **options):
+        if not options["all"] and not options["account"]:
+            raise CommandError("Pass --all or --account")
+
+        if options["account"]:
+            account_ids = [options["account"]]
+        else:
+            account_ids = Invoice.objects.order_by("account_id").values_list("account_id", flat=True).distinct()
+
+        total = 0
+        for account_id in account_ids:
+            rows = InvoiceRollup.objects.rebuild(account_id)
+            total += rows
+            self.stdout.write(f"Rebuilt {rows} rollups for account {account_id}")
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {total} invoice rollups"))
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from django.db import connection, models, transaction
+
+LOCK_ACCOUNT_ROLLUPS_SQL = """
+SELECT pg_advisory_xact_lock(hashtext('analytics_invoicerollup'), hashtext(%(account_id)s::uuid::text));
+"""
+
+REBUILD_INVOICE_ROLLUPS_SQL = """
+INSERT INTO analytics_invoicerollup (
+  account_id, customer_id, currency, status, issue_month, due_month, total_amount, invoice_count, invoice_ids
+)
+SELECT
+  i.account_id,
+  i.customer_id,
+  i.currency,
+  i.status,
+  date_trunc('month', i.issue_date)::date,
+  date_trunc('month', i.due_date)::date,
+  SUM(i.total_amount),
+  COUNT(*),
+  array_agg(i.id)
+FROM invoices_invoice i
+WHERE i.account_id = %(account_id)s AND i.status IN ('open', 'paid')
+GROUP BY 1, 2, 3, 4, 5, 6;
+"""
+
+
+class InvoiceRollupManager(models.Manager):
+    def rebuild(self, account_id: UUID) -> int:
+        """Recompute the rollups of an account from its invoices and return the number of rows written.
+
+        Invoice writes of the account wait until the rebuild commits so the trigger can't apply a change twice. The
+        trigger takes the same advisory lock shared, so other accounts keep writing.
+        """
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(LOCK_ACCOUNT_ROLLUPS_SQL, {"account_id": account_id})
+            self.filter(account_id=account_id).delete()
+            cursor.execute(REBUILD_INVOICE_ROLLUPS_SQL, {"account_id": account_id})
+            return cursor.rowcount
@@ -0,0 +1,86 @@
+from django.db import migrations
+
+CREATE_TRIGGER_SQL = """
+CREATE FUNCTION analytics_apply_invoice_rollup() RETURNS trigger AS $$
+DECLARE
+  rollup_id bigint;
+  remaining integer;
+BEGIN
+  IF TG_OP = 'UPDATE'
+    AND NEW.account_id = OLD.account_id
+    AND NEW.customer_id = OLD.customer_id
+    AND NEW.currency = OLD.currency
+    AND NEW.status = OLD.status
+    AND NEW.issue_date IS NOT DISTINCT FROM OLD.issue_date
+    AND NEW.due_date IS NOT DISTINCT FROM OLD.due_date
+    AND NEW.total_amount = OLD.total_amount
+  THEN
+    RETURN NULL;
+  END IF;
+
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    UPDATE analytics_invoicerollup r
+    SET
+      total_amount = r.total_amount - OLD.total_amount,
+      invoice_count = r.invoice_count - 1,
+      invoice_ids = array_remove(r.invoice_ids, OLD.id)
+    WHERE
+      r.account_id = OLD.account_id
+      AND r.currency = OLD.currency
+      AND r.status = OLD.status
+      AND r.customer_id = OLD.customer_id
+      AND r.issue_month IS NOT DISTINCT FROM date_trunc('month', OLD.issue_date)::date
+      AND r.due_month IS NOT DISTINCT FROM date_trunc('month', OLD.due_date)::date
+    RETURNING r.id, r.invoice_count INTO rollup_id, remaining;
+
+    IF remaining = 0 THEN
+      DELETE FROM analytics_invoicerollup WHERE id = rollup_id;
+    END IF;
+  END IF;
+
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    INSERT INTO analytics_invoicerollup (
+      account_id, customer_id, currency, status, issue_month, due_month, total_amount, invoice_count, invoice_ids
+    )
+    VALUES (
+      NEW.account_id,
+      NEW.customer_id,
+      NEW.currency,
+      NEW.status,
+      date_trunc('month', NEW.issue_date)::date,
+      date_trunc('month', NEW.due_date)::date,
+      NEW.total_amount,
+      1,
+      ARRAY[NEW.id]
+    )
+    ON CONFLICT (account_id, currency, status, customer_id, issue_month, due_month) DO UPDATE
+    SET
+      total_amount = analytics_invoicerollup.total_amount + EXCLUDED.total_amount,
+      invoice_count = analytics_invoicerollup.invoice_count + 1,
+      invoice_ids = array_append(analytics_invoicerollup.invoice_ids, NEW.id);
+  END IF;
+
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER analytics_invoice_rollup
+AFTER INSERT OR UPDATE OR DELETE ON invoices_invoice
+FOR EACH ROW EXECUTE FUNCTION analytics_apply_invoice_rollup();
+"""
+
+DROP_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS analytics_invoice_rollup ON invoices_invoice;
+DROP FUNCTION IF EXISTS analytics_apply_invoice_rollup();
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("analytics", "0001_initial"),
+        ("invoices", "0003_invoicedocument_status"),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_TRIGGER_SQL, DROP_TRIGGER_SQL),
+    ]
@@ -0,0 +1,140 @@
+from importlib import import_module
+
+from django.db import migrations
+
+previous = import_module("openinvoice.analytics.migrations.0002_invoice_rollup_trigger")
+
+# Only the statuses read by analytics/queries.py are rolled up. Drafts have no issue or due month, so all of a
+# customer's drafts would share one row and every draft edit would queue up on it.
+CREATE_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION analytics_apply_invoice_rollup() RETURNS trigger AS $$
+DECLARE
+  rollup_id bigint;
+  remaining integer;
+BEGIN
+  IF TG_OP = 'UPDATE'
+    AND NEW.account_id = OLD.account_id
+    AND NEW.customer_id = OLD.customer_id
+    AND NEW.currency = OLD.currency
+    AND NEW.status = OLD.status
+    AND NEW.issue_date IS NOT DISTINCT FROM OLD.issue_date
+    AND NEW.due_date IS NOT DISTINCT FROM OLD.due_date
+    AND NEW.total_amount = OLD.total_amount
+  THEN
+    RETURN NULL;
+  END IF;
+
+  IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.status IN ('open', 'paid') THEN
+    -- Rebuilds of the account hold this lock exclusively, see InvoiceRollupManager.rebuild
+    PERFORM pg_advisory_xact_lock_shared(hashtext('analytics_invoicerollup'), hashtext(OLD.account_id::text));
+
+    UPDATE analytics_invoicerollup r
+    SET
+      total_amount = r.total_amount - OLD.total_amount,
+      invoice_count = r.invoice_count - 1,
+      invoice_ids = array_remove(r.invoice_ids, OLD.id)
+    WHERE
+      r.account_id = OLD.account_id
+      AND r.currency = OLD.currency
+      AND r.status = OLD.status
+      AND r.customer_id = OLD.customer_id
+      AND r.issue_month IS NOT DISTINCT FROM date_trunc('month', OLD.issue_date)::date
+      AND r.due_month IS NOT DISTINCT FROM date_trunc('month', OLD.due_date)::date
+    RETURNING r.id, r.invoice_count INTO rollup_id, remaining;
+
+    IF remaining = 0 THEN
+      DELETE FROM analytics_invoicerollup WHERE id = rollup_id;
+    END IF;
+  END IF;
+
+  IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.status IN ('open', 'paid') THEN
+    PERFORM pg_advisory_xact_lock_shared(hashtext('analytics_invoicerollup'), hashtext(NEW.account_id::text));
+
+    INSERT INTO analytics_invoicerollup (
+      account_id, customer_id, currency, status, issue_month, due_month, total_amount, invoice_count, invoice_ids
+    )
+    VALUES (
+      NEW.account_id,
+      NEW.customer_id,
+      NEW.currency,
+      NEW.status,
+      date_trunc('month', NEW.issue_date)::date,
+      date_trunc('month', NEW.due_date)::date,
+      NEW.total_amount,
+      1,
+      ARRAY[NEW.id]
+    )
+    ON CONFLICT (account_id, currency, status, customer_id, issue_month, due_month) DO UPDATE
+    SET
+      total_amount = analytics_invoicerollup.total_amount + EXCLUDED.total_amount,
+      invoice_count = analytics_invoicerollup.invoice_count + 1,
+      invoice_ids = array_append(analytics_invoicerollup.invoice_ids, NEW.id);
+  END IF;
+
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS analytics_invoice_rollup ON invoices_invoice;
+
+CREATE TRIGGER analytics_invoice_rollup_insert
+AFTER INSERT ON invoices_invoice
+FOR EACH ROW WHEN (NEW.status IN ('open', 'paid'))
+EXECUTE FUNCTION analytics_apply_invoice_rollup();
+
+CREATE TRIGGER analytics_invoice_rollup_update
+AFTER UPDATE ON invoices_invoice
+FOR EACH ROW WHEN (OLD.status IN ('open', 'paid') OR NEW.status IN ('open', 'paid'))
+EXECUTE FUNCTION analytics_apply_invoice_rollup();
+
+CREATE TRIGGER analytics_invoice_rollup_delete
+AFTER DELETE ON invoices_invoice
+FOR EACH ROW WHEN (OLD.status IN ('open', 'paid'))
+EXECUTE FUNCTION analytics_apply_invoice_rollup();
+"""
+
+DROP_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS analytics_invoice_rollup_insert ON invoices_invoice;
+DROP TRIGGER IF EXISTS analytics_invoice_rollup_update ON invoices_invoice;
+DROP TRIGGER IF EXISTS analytics_invoice_rollup_delete ON invoices_invoice;
+DROP FUNCTION IF EXISTS analytics_apply_invoice_rollup();
+"""
+
+# Invoices that existed before the rollups were deployed only reach them through this backfill. Invoice writes
+# wait for it, so the trigger can't apply a change the backfill already counted.
+BACKFILL_SQL = """
+LOCK TABLE invoices_invoice IN SHARE MODE;
+
+DELETE FROM analytics_invoicerollup;
+
+INSERT INTO analytics_invoicerollup (
+  account_id, customer_id, currency, status, issue_month, due_month, total_amount, invoice_count, invoice_ids
+)
+SELECT
+  i.account_id,
+  i.customer_id,
+  i.currency,
+  i.status,
+  date_trunc('month', i.issue_date)::date,
+  date_trunc('month', i.due_date)::date,
+  SUM(i.total_amount),
+  COUNT(*),
+  array_agg(i.id)
+FROM invoices_invoice i
+WHERE i.status IN ('open', 'paid')
+GROUP BY 1, 2, 3, 4, 5, 6;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("analytics", "0002_invoice_rollup_trigger"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            CREATE_TRIGGER_SQL,
+            DROP_TRIGGER_SQL + previous.CREATE_TRIGGER_SQL,
+        ),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from django.contrib.postgres.fields import ArrayField
+from django.db import models
+from djmoney import settings as djmoney_settings
+
+from openinvoice.invoices.choices import InvoiceStatus
+
+from .managers import InvoiceRollupManager
+
+
+class InvoiceRollup(models.Model):
+    """Monthly totals of open and paid invoices per account, currency, customer and status.
+
+    Rows are maintained by a database trigger on ``invoices_invoice`` so every write path, including bulk updates,
+    keeps them current. ``rebuild_invoice_rollups`` repopulates them from scratch.
+    """
+
+    account = models.ForeignKey("accounts.Account", on_delete=models.CASCADE, related_name="invoice_rollups")
+    customer = models.ForeignKey("customers.Customer", on_delete=models.CASCADE, related_name="invoice_rollups")
+    currency = models.CharField(max_length=3, choices=djmoney_settings.CURRENCY_CHOICES)
+    status = models.CharField(max_length=50, choices=InvoiceStatus.choices)
+    issue_month = models.DateField(null=True)
+    due_month = models.DateField(null=True)
+    total_amount = models.DecimalField(max_digits=19, decimal_places=2, default=0)
+    invoice_count = models.PositiveIntegerField(default=0)
+    invoice_ids = ArrayField(models.UUIDField(), default=list)
+
+    objects = InvoiceRollupManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["account", "currency", "status", "customer", "issue_month", "due_month"],
+                nulls_distinct=False,
+                name="unique_invoice_rollup",
+            )
+        ]
@@ -18,18 +18,18 @@ months AS (
 ),
 base AS (
   SELECT
-    date_trunc('month', i.issue_date)::date AS month_start,
-    i.currency,
-    SUM(i.total_amount) AS total_amount,
-    COUNT(*)            AS invoice_count
-  FROM invoices_invoice i
+    r.issue_month             AS month_start,
+    r.currency,
+    SUM(r.total_amount)       AS total_amount,
+    SUM(r.invoice_count)      AS invoice_count
+  FROM analytics_invoicerollup r
   WHERE
-    i.account_id = %(account_id)s
-    AND i.status = 'paid'
-    AND i.currency = %(currency)s
-    AND i.issue_date >= %(date_after)s::date
-    AND i.issue_date <  (%(date_before)s::date + INTERVAL '1 day')
-    AND (%(customer_id)s IS NULL OR i.customer_id = %(customer_id)s)
+    r.account_id = %(account_id)s
+    AND r.status = 'paid'
+    AND r.currency = %(currency)s
+    AND r.issue_month >= %(date_after)s::date
+    AND r.issue_month <= %(date_before)s::date
+    AND (%(customer_id)s IS NULL OR r.customer_id = %(customer_id)s)
   GROUP BY 1, 2
 ),
 currencies AS (
@@ -80,22 +80,54 @@ months AS (
   FROM bounds b,
   LATERAL generate_series(b.start_month, b.end_month, interval '1 month') AS gs
 ),
-base AS (
+-- Months before the current one are fully overdue and come from the rollups, the current month is only
+-- overdue up to today so it's read from the invoices themselves.
+overdue AS (
   SELECT
-    date_trunc('month', i.due_date)::date AS month_start,
+    r.due_month AS month_start,
+    r.currency,
+    r.total_amount,
+    r.invoice_count,
+    r.invoice_ids
+  FROM analytics_invoicerollup r
+  WHERE
+    r.account_id = %(account_id)s
+    AND r.status = 'open'
+    AND r.currency = %(currency)s
+    AND r.due_month < date_trunc('month', %(today)s::date)::date
+    AND r.due_month >= %(date_after)s::date
+    AND r.due_month <= %(date_before)s::date
+    AND (%(customer_id)s IS NULL OR r.customer_id = %(customer_id)s)
+  UNION ALL
+  SELECT
+    date_trunc('month', i.due_date)::date,
     i.currency,
-    SUM(i.total_amount)      AS total_amount,
-    COUNT(*)                 AS invoice_count,
-    array_agg(i.id)          AS invoice_ids
+    i.total_amount,
+    1,
+    ARRAY[i.id]
   FROM invoices_invoice i
   WHERE
     i.account_id = %(account_id)s
     AND i.status = 'open'
     AND i.currency = %(currency)s
+    AND i.due_date >= date_trunc('month', %(today)s::date)
     AND i.due_date < %(today)s::date
     AND i.due_date >= %(date_after)s::date
-    AND i.due_date <  (%(date_before)s::date + INTERVAL '1 day')
+    AND i.due_date < (%(date_before)s::date + INTERVAL '1 month')
     AND (%(customer_id)s IS NULL OR i.customer_id = %(customer_id)s)
+),
+base AS (
+  SELECT
+    o.month_start,
+    o.currency,
+    SUM(o.total_amount)   AS total_amount,
+    SUM(o.invoice_count)  AS invoice_count,
+    (
+      SELECT array_agg(ids.id)
+      FROM overdue oi, LATERAL unnest(oi.invoice_ids) AS ids(id)
+      WHERE oi.month_start = o.month_start AND oi.currency = o.currency
+    )                     AS invoice_ids
+  FROM overdue o
   GROUP BY 1, 2
 ),
 currencies AS (
@@ -20,16 +20,14 @@ def resolve_plan(account: Account) -> str:
     return settings.DEFAULT_PLAN
 
 
-def has_feature(account: Account, code: FeatureCode) -> bool:
-    plan = resolve_plan(account)
+def has_feature(plan: str, code: FeatureCode) -> bool:
     feature = settings.PLANS.get(plan, {}).get("features", {}).get(code)
     if isinstance(feature, bool):
         return feature
     return False
 
 
-def is_limit_exceeded(account: Account, code: LimitCode, usage: int) -> bool:
-    plan = resolve_plan(account)
+def is_limit_exceeded(plan: str, code: LimitCode, usage: int) -> bool:
     limit = settings.PLANS.get(plan, {}).get("limits", {}).get(code)
     if isinstance(limit, int):
         return usage >= limit
@@ -18,10 +18,6 @@ class SupportsOrdering(Protocol):
     def __lt__(self, other: Any, /) -> bool: ...
 
 
-class SupportsTaxRate(Protocol):
-    def calculate_amount(self, base_amount: Money) -> Money: ...
-
-
 def zero(currency: str | Currency) -> Money:
     """Return a zero-valued :class:`Money` in ``currency``."""
 
@@ -36,23 +32,20 @@ def calculate_percentage_amount(base: Money, percentage: Decimal) -> Money:
     return base * (percentage / Decimal(100))
 
 
-def allocate_proportionally(money: Money, bases: list[Money]) -> list[Money]:
-    """Allocate `money` proportionally across `bases`."""
+def allocate_proportionally(amount: Decimal, bases: list[Decimal]) -> list[Decimal]:
+    """Allocate ``amount`` proportionally across ``bases``, rounded to cents."""
     if len(bases) == 0:
         return []
 
-    amount = money.amount
-    base_amounts = [base.amount for base in bases]
-
     if amount <= 0:
-        return [zero(money.currency) for _ in bases]
+        return [Decimal(0) for _ in bases]
 
-    total_base_amount = sum(base_amounts, Decimal("0"))
+    total_base_amount = sum(bases, Decimal("0"))
     if total_base_amount <= 0:
-        return [zero(money.currency) for _ in bases]
+        return [Decimal(0) for _ in bases]
 
     # Raw proportional shares (unrounded)
-    raw = [amount * (b / total_base_amount) for b in base_amounts]
+    raw = [amount * (b / total_base_amount) for b in bases]
 
     # First rounding pass
     rounded_amounts = [r.quantize(CENT, rounding=ROUND_HALF_UP) for r in raw]
@@ -62,7 +55,7 @@ def allocate_proportionally(money: Money, bases: list[Money]) -> list[Money]:
 
     if remainder_amount != 0:
         # Largest remainder method: distribute leftover cents to the largest fractional parts
-        fractions = [(i, raw[i] - rounded_amounts[i]) for i in range(len(base_amounts))]
+        fractions = [(i, raw[i] - rounded_amounts[i]) for i in range(len(bases))]
         fractions.sort(key=lambda t: t[1], reverse=(remainder_amount > 0))
 
         step = CENT if remainder_amount > 0 else -CENT
@@ -72,7 +65,7 @@ def allocate_proportionally(money: Money, bases: list[Money]) -> list[Money]:
             idx = fractions[k % len(fractions)][0]
             rounded_amounts[idx] += step
 
-    return [Money(amount, money.currency) for amount in rounded_amounts]
+    return rounded_amounts
 
 
 def aggregate_allocations(
@@ -96,20 +89,28 @@ def aggregate_allocations(
 
 
 def calculate_tax_amounts(
-    base_amount: Money,
-    taxable_amount: Money,
+    base_amount: Decimal,
+    taxable_amount: Decimal,
     tax_multiplier: Decimal,
-    tax_rates: Iterable[SupportsTaxRate],
-) -> list[Money]:
-    tax_rates = list(tax_rates)
-    if not tax_rates:
+    percentages: Iterable[Decimal],
+) -> list[Decimal]:
+    """Return the cent-rounded tax amount for each of ``percentages`` applied to ``base_amount``.
+
+    For tax-inclusive amounts (``tax_multiplier`` above one) the last tax absorbs the rounding
+    difference, so the taxes add up to ``taxable_amount - base_amount``.
+    """
+    percentages = list(percentages)
+    if not percentages:
         return []
 
-    tax_amounts = [tax_rate.calculate_amount(base_amount).round(2) for tax_rate in tax_rates]
-    if tax_multiplier > Decimal(1) and tax_amounts:
-        total_tax_amount = sum(tax_amounts, zero(base_amount.currency))
-        target_total_tax_amount = max(taxable_amount - base_amount, zero(base_amount.currency))
+    tax_amounts = [
+        (base_amount * (percentage / Decimal(100))).quantize(CENT) if percentage > 0 else Decimal("0.00")
+        for percentage in percentages
+    ]
+    if tax_multiplier > Decimal(1):
+        total_tax_amount = sum(tax_amounts, Decimal(0))
+        target_total_tax_amount = max(taxable_amount - base_amount, Decimal(0))
         adjustment = target_total_tax_amount - total_tax_amount
-        tax_amounts[-1] = max(tax_amounts[-1] + adjustment, zero(base_amount.currency))
+        tax_amounts[-1] = max(tax_amounts[-1] + adjustment, Decimal(0))
 
     return tax_amounts
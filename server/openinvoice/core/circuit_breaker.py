@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a service whose circuit is open."""
+
+
+class CircuitBreaker:
+    """Stop calling a failing service for a while.
+
+    After ``threshold`` consecutive failures the circuit opens and calls fail fast for ``reset_timeout``
+    seconds. Then a single trial call is let through: its success closes the circuit again, its failure
+    opens it for another ``reset_timeout``.
+    """
+
+    def __init__(self, name: str, threshold: int, reset_timeout: float) -> None:
+        self.name = name
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.lock = threading.Lock()
+
+    def check(self) -> None:
+        with self.lock:
+            if self.opened_at is None:
+                return
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                raise CircuitOpenError(f"Circuit to {self.name} is open")
+            # Let this call through as the trial and keep failing the others until it reports back
+            self.opened_at = time.monotonic()
+
+    def record_success(self) -> None:
+        with self.lock:
+            if self.opened_at is not None:
+                logger.info("Circuit closed", name=self.name)
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self) -> None:
+        with self.lock:
+            self.failures += 1
+            if self.failures >= self.threshold:
+                if self.opened_at is None:
+                    logger.warning("Circuit opened", name=self.name, failures=self.failures)
+                self.opened_at = time.monotonic()
@@ -1,7 +1,205 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
 from rest_framework.pagination import PageNumberPagination as DefaultPageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def estimate_count(queryset: QuerySet) -> int:
+    """Return the planner's row estimate for ``queryset``, derived from table statistics instead of counting rows."""
+    plan = json.loads(queryset.order_by().explain(format="json"))
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+@dataclass(frozen=True)
+class Cursor:
+    created_at: datetime
+    id: uuid.UUID
+    reverse: bool
+
+    def encode(self) -> str:
+        payload = json.dumps([self.created_at.isoformat(), str(self.id), self.reverse])
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    @classmethod
+    def decode(cls, value: str) -> Cursor:
+        created_at, id_, reverse = json.loads(base64.urlsafe_b64decode(value.encode()))
+        return cls(created_at=datetime.fromisoformat(created_at), id=uuid.UUID(id_), reverse=bool(reverse))
+
+
+class CursorPagination(BasePagination):
+    """Keyset pagination over ``(created_at, id)``.
+
+    Pages are fetched with a range condition instead of an offset, so deep pages cost the same as the first one, and
+    no total is counted. An estimated count can be requested with ``estimate_count=true``.
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    estimate_count_query_param = "estimate_count"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):  # noqa: ARG002
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.cursor = self.decode_cursor(request)
+        self.estimated_count = None
+        if request.query_params.get(self.estimate_count_query_param) in ("true", "1"):
+            self.estimated_count = estimate_count(queryset)
+
+        descending = self.is_descending(queryset)
+        # Following a previous link walks backwards from the cursor and flips the page afterwards
+        reverse = self.cursor is not None and self.cursor.reverse
+        if descending != reverse:
+            queryset = queryset.order_by("-created_at", "-id")
+        else:
+            queryset = queryset.order_by("created_at", "id")
+
+        if self.cursor is not None:
+            lookup = "lt" if descending != reverse else "gt"
+            queryset = queryset.filter(
+                Q(**{f"created_at__{lookup}": self.cursor.created_at})
+                | Q(created_at=self.cursor.created_at, **{f"id__{lookup}": self.cursor.id})
+            )
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if reverse:
+            results.reverse()
+
+        self.has_next = has_more if not reverse else True
+        self.has_previous = has_more if reverse else self.cursor is not None
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        response = {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
+        if self.estimated_count is not None:
+            response["estimated_count"] = self.estimated_count
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "estimated_count": {"type": "integer"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request) -> int:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(page_size, self.max_page_size) if page_size > 0 else self.page_size
+
+    def decode_cursor(self, request) -> Cursor | None:
+        value = request.query_params.get(self.cursor_query_param)
+        if not value:
+            return None
+        try:
+            return Cursor.decode(value)
+        except (binascii.Error, TypeError, ValueError) as e:
+            raise NotFound(self.invalid_cursor_message) from e
+
+    def is_descending(self, queryset: QuerySet) -> bool:
+        ordering = tuple(queryset.query.order_by or queryset.query.get_meta().ordering or ())
+        if ordering in (("-created_at",), ("-created_at", "-id")):
+            return True
+        if ordering in (("created_at",), ("created_at", "id")):
+            return False
+        raise ValidationError("Cursor pagination only supports ordering by created_at")
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next or not self.page:
+            return None
+        last = self.page[-1]
+        return self.build_link(Cursor(created_at=last.created_at, id=last.id, reverse=False))
+
+    def get_previous_link(self) -> str | None:
+        if not self.has_previous or not self.page:
+            return None
+        first = self.page[0]
+        return self.build_link(Cursor(created_at=first.created_at, id=first.id, reverse=True))
+
+    def build_link(self, cursor: Cursor) -> str:
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.estimate_count_query_param)
+        return replace_query_param(url, self.cursor_query_param, cursor.encode())
 
 
 class PageNumberPagination(DefaultPageNumberPagination):
+    """Page number pagination, or cursor pagination when requested with ``pagination=cursor`` or a ``cursor``."""
+
     page_size = 20
     page_size_query_param = "page_size"
     max_page_size = 100
+    pagination_query_param = "pagination"
+
+    cursor_pagination_class = CursorPagination
+    cursor_pagination = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.is_cursor_requested(request):
+            self.cursor_pagination = self.cursor_pagination_class()
+            return self.cursor_pagination.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_pagination is not None:
+            return self.cursor_pagination.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        return [
+            *parameters,
+            {
+                "name": self.pagination_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Set to `cursor` to paginate by cursor instead of page number",
+                "schema": {"type": "string", "enum": ["cursor"]},
+            },
+            {
+                "name": self.cursor_pagination_class.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.cursor_pagination_class.estimate_count_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Include an estimated total count with cursor pagination",
+                "schema": {"type": "boolean"},
+            },
+        ]
+
+    def is_cursor_requested(self, request) -> bool:
+        return (
+            request.query_params.get(self.pagination_query_param) == "cursor"
+            or self.cursor_pagination_class.cursor_query_param in request.query_params
+        )
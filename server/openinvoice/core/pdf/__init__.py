@@ -1,9 +1,13 @@
+from collections.abc import Sequence
+
 from django.conf import settings
 from django.utils.module_loading import import_string
 
 from .backends.base import PdfBackend
+from .cache import PdfCache
 
 _BACKEND: PdfBackend | None = None
+_CACHE: PdfCache | None = None
 
 
 def get_generator() -> PdfBackend:
@@ -15,9 +19,26 @@ def get_generator() -> PdfBackend:
     return _BACKEND
 
 
+def get_cache() -> PdfCache | None:
+    """Return the globally configured PDF cache, or None if caching is disabled."""
+    global _CACHE
+    if _CACHE is None and settings.PDF_CACHE is not None:
+        store_cls = import_string(settings.PDF_CACHE["BACKEND"])
+        _CACHE = PdfCache(store_cls(**settings.PDF_CACHE.get("OPTIONS", {})), assets=settings.PDF_CACHE_ASSETS)
+    return _CACHE
+
+
 def generate_pdf(html: str) -> bytes:
     """Generate PDF bytes from an HTML string using the configured backend."""
-    return get_generator().generate(html)
+    return generate_pdfs([html])[0]
+
+
+def generate_pdfs(htmls: Sequence[str]) -> list[bytes]:
+    """Generate one PDF per HTML string, concurrently when the configured backend supports it."""
+    cache = get_cache()
+    if cache is None:
+        return get_generator().generate_many(htmls)
+    return cache.generate(get_generator(), htmls)
 
 
-__all__ = ["generate_pdf", "get_generator"]
+__all__ = ["generate_pdf", "generate_pdfs", "get_cache", "get_generator"]
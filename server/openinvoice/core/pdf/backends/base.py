@@ -1,12 +1,23 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from typing import Any
 
 
 class PdfBackend(ABC):
     """Base class for PDF generator backends."""
 
+    @property
+    def options(self) -> dict[str, Any]:
+        """Options affecting the generated PDF, part of the PDF cache key."""
+        return {}
+
     @abstractmethod
     def generate(self, html: str) -> bytes:
         """Generate PDF bytes from an HTML string."""
         raise NotImplementedError
+
+    def generate_many(self, htmls: Sequence[str]) -> list[bytes]:
+        """Generate one PDF per HTML string, in order. Backends override this to render concurrently."""
+        return [self.generate(html) for html in htmls]
@@ -1,29 +1,154 @@
 from __future__ import annotations
 
+import asyncio
+import threading
+import time
+import weakref
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import httpx
 from django.conf import settings
-from gotenberg_client import BaseClientError, GotenbergClient
 from gotenberg_client.options import PdfAFormat
 
+from openinvoice.core.circuit_breaker import CircuitBreaker, CircuitOpenError
 from openinvoice.core.pdf.exceptions import PdfError, PdfGenerationError
 
 from .base import PdfBackend
 
+# Gotenberg answers 503 when its Chromium instances are busy, these are worth retrying
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+
 
 class GotenbergBackend(PdfBackend):
-    """Backend that generates PDFs from HTML using a Gotenberg server."""
+    """Backend that generates PDFs from HTML using a Gotenberg server.
+
+    Requests go through a keep-alive connection pool and at most ``GOTENBERG_MAX_IN_FLIGHT`` of them run at
+    once per process (per event loop for ``agenerate``). Busy responses and connection errors are retried with
+    backoff, and after ``GOTENBERG_FAILURE_THRESHOLD`` failed documents in a row a circuit breaker fails
+    further calls fast for ``GOTENBERG_RESET_TIMEOUT`` seconds.
+    """
+
+    route = "/forms/chromium/convert/html"
 
     def __init__(self) -> None:
-        self.client = GotenbergClient(
-            host=settings.GOTENBERG_URL,
-            timeout=settings.GOTENBERG_TIMEOUT,
+        self.max_in_flight = settings.GOTENBERG_MAX_IN_FLIGHT
+        self.max_retries = settings.GOTENBERG_MAX_RETRIES
+        self.retry_delay = settings.GOTENBERG_RETRY_DELAY
+        self.client = httpx.Client(**self.client_options())
+        self.semaphore = threading.BoundedSemaphore(self.max_in_flight)
+        self.breaker = CircuitBreaker(
+            name="gotenberg",
+            threshold=settings.GOTENBERG_FAILURE_THRESHOLD,
+            reset_timeout=settings.GOTENBERG_RESET_TIMEOUT,
         )
+        self.executor = ThreadPoolExecutor(max_workers=settings.PDF_RENDER_THREADS, thread_name_prefix="gotenberg")
+        # Async clients and semaphores are bound to the event loop they're used in
+        self.async_clients: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, tuple[httpx.AsyncClient, asyncio.Semaphore]
+        ] = weakref.WeakKeyDictionary()
 
-    def generate(self, html: str) -> bytes:
+    @property
+    def options(self) -> dict[str, Any]:
+        return PdfAFormat.A2b.to_form() | {"scale": "1.28"}
+
+    def client_options(self) -> dict[str, Any]:
+        return {
+            "base_url": settings.GOTENBERG_URL,
+            "timeout": settings.GOTENBERG_TIMEOUT,
+            "limits": httpx.Limits(
+                max_connections=self.max_in_flight,
+                max_keepalive_connections=self.max_in_flight,
+            ),
+        }
+
+    def request_options(self, html: str) -> dict[str, Any]:
+        return {
+            "files": {"index.html": ("index.html", html.encode(), "text/html")},
+            "data": self.options,
+        }
+
+    def check_circuit(self) -> None:
         try:
-            with self.client.chromium.html_to_pdf() as route:
-                response = route.string_index(html).pdf_format(PdfAFormat.A2b).scale(1.28).run_with_retry()
-        except BaseClientError as e:
-            raise PdfGenerationError from e
-        except Exception as e:
-            raise PdfError from e
-        return response.content
+            self.breaker.check()
+        except CircuitOpenError as e:
+            raise PdfGenerationError("Gotenberg is unavailable") from e
+
+    def get_retry_delay(self, attempt: int) -> float:
+        return self.retry_delay * 2 ** (attempt - 1)
+
+    def handle_response(self, response: httpx.Response | None, error: httpx.TransportError | None) -> bytes:
+        if response is not None and response.is_success:
+            self.breaker.record_success()
+            return response.content
+
+        if response is not None and response.status_code not in RETRY_STATUS_CODES and response.status_code < 500:
+            # Gotenberg is up but rejected the document, which says nothing about its health
+            self.breaker.record_success()
+            raise PdfGenerationError(f"Gotenberg rejected the document with status {response.status_code}")
+
+        self.breaker.record_failure()
+        if response is None:
+            raise PdfError("Gotenberg is unreachable") from error
+        raise PdfGenerationError(f"Gotenberg failed with status {response.status_code}")
+
+    def generate(self, html: str) -> bytes:
+        self.check_circuit()
+
+        response, error = None, None
+        with self.semaphore:
+            for attempt in range(self.max_retries + 1):
+                if attempt:
+                    time.sleep(self.get_retry_delay(attempt))
+                try:
+                    response, error = self.client.post(self.route, **self.request_options(html)), None
+                except httpx.TransportError as e:
+                    response, error = None, e
+                if response is not None and response.status_code not in RETRY_STATUS_CODES:
+                    break
+
+        return self.handle_response(response, error)
+
+    def generate_many(self, htmls: Sequence[str]) -> list[bytes]:
+        if len(htmls) < 2:
+            return super().generate_many(htmls)
+        return list(self.executor.map(self.generate, htmls))
+
+    def get_async_client(self) -> tuple[httpx.AsyncClient, asyncio.Semaphore]:
+        loop = asyncio.get_running_loop()
+        if loop not in self.async_clients:
+            self.async_clients[loop] = (
+                httpx.AsyncClient(**self.client_options()),
+                asyncio.Semaphore(self.max_in_flight),
+            )
+        return self.async_clients[loop]
+
+    async def agenerate(self, html: str) -> bytes:
+        """Generate PDF bytes from an HTML string without blocking the event loop."""
+        self.check_circuit()
+        client, semaphore = self.get_async_client()
+
+        response, error = None, None
+        async with semaphore:
+            for attempt in range(self.max_retries + 1):
+                if attempt:
+                    await asyncio.sleep(self.get_retry_delay(attempt))
+                try:
+                    response, error = await client.post(self.route, **self.request_options(html)), None
+                except httpx.TransportError as e:
+                    response, error = None, e
+                if response is not None and response.status_code not in RETRY_STATUS_CODES:
+                    break
+
+        return self.handle_response(response, error)
+
+    async def agenerate_many(self, htmls: Sequence[str]) -> list[bytes]:
+        """Generate one PDF per HTML string, as many at once as the in-flight limit allows."""
+        return list(await asyncio.gather(*(self.agenerate(html) for html in htmls)))
+
+    async def aclose(self) -> None:
+        """Close the async client of the running event loop."""
+        client, _ = self.async_clients.pop(asyncio.get_running_loop(), (None, None))
+        if client is not None:
+            await client.aclose()
@@ -1,18 +1,132 @@
 from __future__ import annotations
 
+import mimetypes
+import multiprocessing
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any
+from urllib.parse import urljoin, urlsplit
+
 from django.conf import settings
-from weasyprint import HTML
+from django.contrib.staticfiles import finders
+from django.core.exceptions import ImproperlyConfigured
+from django.templatetags.static import static
+from weasyprint import HTML, default_url_fetcher
+from weasyprint.text.fonts import FontConfiguration
 
 from openinvoice.core.pdf.exceptions import PdfError
+from openinvoice.core.pdf.workers import Renderer, WorkerPool
 
 from .base import PdfBackend
 
 
+def write_pdf(html: str, base_url: str) -> bytes:
+    try:
+        return HTML(string=html, base_url=base_url).write_pdf(pdf_variant="pdf/a-2b", zoom=1.28)
+    except Exception as e:
+        raise PdfError from e
+
+
 class WeasyPrintBackend(PdfBackend):
     """Backend that generates PDFs from HTML using a weasyprint cli."""
 
+    def __init__(self) -> None:
+        self.executor: ProcessPoolExecutor | None = None
+
+    @property
+    def options(self) -> dict[str, Any]:
+        return {"base_url": settings.BASE_URL, "pdf_variant": "pdf/a-2b", "zoom": 1.28}
+
     def generate(self, html: str) -> bytes:
-        try:
-            return HTML(string=html, base_url=settings.BASE_URL).write_pdf(pdf_variant="pdf/a-2b", zoom=1.28)
-        except Exception as e:
-            raise PdfError from e
+        return write_pdf(html, settings.BASE_URL)
+
+    def generate_many(self, htmls: Sequence[str]) -> list[bytes]:
+        if len(htmls) < 2:
+            return super().generate_many(htmls)
+
+        # Layout is CPU-bound and holds the GIL, so documents are spread over processes. Workers are spawned
+        # rather than forked as they only need weasyprint, not the state of the (possibly threaded) server.
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(
+                max_workers=settings.PDF_RENDER_PROCESSES,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return list(self.executor.map(partial(write_pdf, base_url=settings.BASE_URL), htmls))
+
+
+def strip_query(url: str) -> str:
+    """Return ``url`` without its query string, which for signed storage URLs changes on every call."""
+    return urlsplit(url)._replace(query="").geturl()
+
+
+def load_renderer(options: dict[str, Any]) -> Renderer:
+    """Build the renderer of a pool worker.
+
+    Preloaded static assets are read once and served from memory instead of being fetched from the server for
+    every document, and a single font configuration is shared by all the documents of the worker. Assets are
+    matched on their URL without the query string, so freshly signed storage URLs still hit the preload.
+    """
+    font_config = FontConfiguration()
+    assets = {url: (Path(path).read_bytes(), mime_type) for url, path, mime_type in options["assets"]}
+
+    def fetch(url: str, *args, **kwargs) -> dict[str, Any]:
+        asset = assets.get(strip_query(url))
+        if asset is not None:
+            string, mime_type = asset
+            return {"string": string, "mime_type": mime_type, "redirected_url": url}
+        return default_url_fetcher(url, *args, **kwargs)
+
+    def render(html: str) -> bytes:
+        return HTML(string=html, base_url=options["base_url"], url_fetcher=fetch).write_pdf(
+            pdf_variant="pdf/a-2b",
+            zoom=1.28,
+            font_config=font_config,
+        )
+
+    # Lay out a blank page with the preloaded stylesheets so fonts are resolved before the first document
+    stylesheets = "".join(
+        f'<link rel="stylesheet" href="{url}">' for url, _, mime_type in options["assets"] if mime_type == "text/css"
+    )
+    render(f"{stylesheets}<p></p>")
+    return render
+
+
+class WeasyPrintPoolBackend(PdfBackend):
+    """Backend that generates PDFs in a pool of persistent weasyprint worker processes."""
+
+    def __init__(self) -> None:
+        self.pool = WorkerPool(
+            factory=load_renderer,
+            options={"base_url": settings.BASE_URL, "assets": self.get_assets()},
+            size=settings.PDF_RENDER_PROCESSES,
+            timeout=settings.PDF_WEASYPRINT_TIMEOUT,
+            max_memory=settings.PDF_WEASYPRINT_MAX_MEMORY * 1024 * 1024,
+        )
+        # Threads only wait on the worker pipes, one per worker is enough to keep them all busy
+        self.executor = ThreadPoolExecutor(max_workers=settings.PDF_RENDER_PROCESSES, thread_name_prefix="weasyprint")
+
+    @property
+    def options(self) -> dict[str, Any]:
+        return {"base_url": settings.BASE_URL, "pdf_variant": "pdf/a-2b", "zoom": 1.28}
+
+    @staticmethod
+    def get_assets() -> list[tuple[str, str, str]]:
+        assets = []
+        for path in settings.PDF_WEASYPRINT_PRELOAD:
+            location = finders.find(path)
+            if location is None:
+                raise ImproperlyConfigured(f"Static file {path!r} in PDF_WEASYPRINT_PRELOAD does not exist")
+            mime_type, _ = mimetypes.guess_type(path)
+            url = strip_query(urljoin(settings.BASE_URL, static(path)))
+            assets.append((url, location, mime_type or "application/octet-stream"))
+        return assets
+
+    def generate(self, html: str) -> bytes:
+        return self.pool.render(html)
+
+    def generate_many(self, htmls: Sequence[str]) -> list[bytes]:
+        if len(htmls) < 2:
+            return super().generate_many(htmls)
+        return list(self.executor.map(self.generate, htmls))
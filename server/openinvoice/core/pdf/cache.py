@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import threading
+from collections.abc import Sequence
+from pathlib import Path
+
+import structlog
+from django.contrib.staticfiles import finders
+from django.core.exceptions import ImproperlyConfigured
+
+from .backends.base import PdfBackend
+from .stores.base import PdfStore
+
+logger = structlog.get_logger(__name__)
+
+# Query strings of linked URLs, which for signed storage URLs change on every render
+LINK_QUERY_RE = re.compile(r"""((?:href|src)=["'][^"'?]*)\?[^"']*""")
+
+
+class PdfCache:
+    """Content-addressed cache of generated PDFs.
+
+    Entries are keyed on a hash of the backend, its options, the content of the static ``assets`` the documents
+    link to and the rendered HTML, so identical inputs skip generation entirely. Query strings are stripped from
+    the links in the HTML, as signed storage URLs differ on every render. A deploy changing the assets changes
+    every key, so nothing needs to be invalidated. Store failures are logged and treated as misses.
+    """
+
+    def __init__(self, store: PdfStore, assets: Sequence[str] = ()) -> None:
+        self.store = store
+        self.assets_version = self.hash_assets(assets)
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def hash_assets(paths: Sequence[str]) -> str:
+        digest = hashlib.sha256()
+        for path in paths:
+            location = finders.find(path)
+            if location is None:
+                raise ImproperlyConfigured(f"Static file {path!r} in PDF_CACHE_ASSETS does not exist")
+            digest.update(path.encode())
+            digest.update(b"\0")
+            digest.update(Path(location).read_bytes())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def key(self, backend: PdfBackend, html: str) -> str:
+        digest = hashlib.sha256()
+        backend_cls = type(backend)
+        options = {"backend": f"{backend_cls.__module__}.{backend_cls.__qualname__}", "options": backend.options}
+        digest.update(json.dumps(options, sort_keys=True, default=str).encode())
+        digest.update(b"\0")
+        digest.update(self.assets_version.encode())
+        digest.update(b"\0")
+        digest.update(LINK_QUERY_RE.sub(r"\1", html).encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> bytes | None:
+        try:
+            return self.store.get(key)
+        except Exception:
+            logger.exception("Failed to read cached PDF", key=key)
+            return None
+
+    def set(self, key: str, content: bytes) -> None:
+        try:
+            self.store.set(key, content)
+        except Exception:
+            logger.exception("Failed to cache PDF", key=key)
+
+    def generate(self, backend: PdfBackend, htmls: Sequence[str]) -> list[bytes]:
+        """Generate one PDF per HTML string, only calling ``backend`` for the ones that aren't cached."""
+        keys = [self.key(backend, html) for html in htmls]
+        contents = [self.get(key) for key in keys]
+
+        # Identical documents in one batch are only generated once
+        missing = {key: html for key, html, content in zip(keys, htmls, contents, strict=True) if content is None}
+        generated = dict(zip(missing, backend.generate_many(list(missing.values())), strict=True))
+        for key, content in generated.items():
+            self.set(key, content)
+
+        with self.lock:
+            self.hits += len(keys) - len(generated)
+            self.misses += len(generated)
+            hits, misses = self.hits, self.misses
+        logger.debug("PDF cache lookup", requested=len(keys), generated=len(generated), hits=hits, misses=misses)
+
+        return [content if content is not None else generated[key] for key, content in zip(keys, contents, strict=True)]
+
+    def stats(self) -> dict[str, int | float]:
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
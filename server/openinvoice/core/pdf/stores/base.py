@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+
+# Eviction trims a full store to this share of its maximum size, so it only runs again once that much was written
+EVICTION_TARGET = 0.8
+
+
+class PdfStore(ABC):
+    """Base class for the stores of the PDF cache, mapping content hashes to PDF bytes."""
+
+    @abstractmethod
+    def get(self, key: str) -> bytes | None:
+        """Return the PDF stored under ``key``, or None if there is none."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def set(self, key: str, content: bytes) -> None:
+        """Store ``content`` under ``key``, evicting older entries if the store is full."""
+        raise NotImplementedError
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from django.core.cache import caches
+
+from .base import PdfStore
+
+
+class CacheStore(PdfStore):
+    """Store keeping PDFs in a Django cache, which takes care of eviction (e.g. ``MAX_ENTRIES``)."""
+
+    def __init__(self, alias: str = "default", timeout: int | None = None, key_prefix: str = "pdf") -> None:
+        self.alias = alias
+        self.timeout = timeout
+        self.key_prefix = key_prefix
+
+    def get(self, key: str) -> bytes | None:
+        return caches[self.alias].get(f"{self.key_prefix}:{key}")
+
+    def set(self, key: str, content: bytes) -> None:
+        caches[self.alias].set(f"{self.key_prefix}:{key}", content, timeout=self.timeout)
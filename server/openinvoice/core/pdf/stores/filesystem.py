@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+
+from .base import EVICTION_TARGET, PdfStore
+
+
+class FileSystemStore(PdfStore):
+    """Store keeping PDFs in a local directory, evicting the least recently used ones above ``max_size`` bytes.
+
+    The size of the directory is scanned once and then tracked as entries are written, so it's only scanned
+    again when the store is full. Other processes writing to the same directory are caught up with on that scan.
+    """
+
+    def __init__(self, location: str, max_size: int) -> None:
+        self.location = Path(location)
+        self.max_size = max_size
+        self.size: int | None = None
+
+    def path(self, key: str) -> Path:
+        return self.location / key[:2] / f"{key}.pdf"
+
+    def get(self, key: str) -> bytes | None:
+        path = self.path(key)
+        try:
+            content = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        # Bump the modification time so eviction keeps recently used entries
+        path.touch()
+        return content
+
+    def set(self, key: str, content: bytes) -> None:
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so concurrent readers never see a partial PDF
+        with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as file:
+            file.write(content)
+        Path(file.name).replace(path)
+
+        if self.size is not None:
+            self.size += len(content)
+        if self.size is None or self.size > self.max_size:
+            self.evict()
+
+    def evict(self) -> None:
+        entries = []
+        for path in self.location.glob("*/*.pdf"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        size = sum(entry_size for _, entry_size, _ in entries)
+        if size > self.max_size:
+            for _, entry_size, path in sorted(entries):
+                if size <= self.max_size * EVICTION_TARGET:
+                    break
+                path.unlink(missing_ok=True)
+                size -= entry_size
+        self.size = size
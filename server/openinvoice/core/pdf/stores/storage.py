@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import storages
+
+from .base import EVICTION_TARGET, PdfStore
+
+
+class StorageStore(PdfStore):
+    """Store keeping PDFs in a Django storage, evicting the oldest ones above ``max_size`` bytes.
+
+    Storages can't record reads, so unlike the file system store eviction is by creation rather than last use.
+    Listing a remote storage is expensive, so its size is listed once and then tracked as entries are written;
+    it's only listed again when the store is full.
+    """
+
+    def __init__(self, max_size: int, alias: str = "default", location: str = "pdf-cache") -> None:
+        self.alias = alias
+        self.location = location
+        self.max_size = max_size
+        self.size: int | None = None
+
+    @property
+    def storage(self):
+        return storages[self.alias]
+
+    def name(self, key: str) -> str:
+        return f"{self.location}/{key}.pdf"
+
+    def get(self, key: str) -> bytes | None:
+        try:
+            with self.storage.open(self.name(key), "rb") as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
+
+    def set(self, key: str, content: bytes) -> None:
+        name = self.name(key)
+        if self.storage.exists(name):
+            return
+        self.storage.save(name, ContentFile(content))
+
+        if self.size is not None:
+            self.size += len(content)
+        if self.size is None or self.size > self.max_size:
+            self.evict()
+
+    def evict(self) -> None:
+        _, filenames = self.storage.listdir(self.location)
+        entries = []
+        for filename in filenames:
+            name = f"{self.location}/{filename}"
+            entries.append((self.storage.get_modified_time(name), self.storage.size(name), name))
+
+        size = sum(entry_size for _, entry_size, _ in entries)
+        if size > self.max_size:
+            for _, entry_size, name in sorted(entries):
+                if size <= self.max_size * EVICTION_TARGET:
+                    break
+                self.storage.delete(name)
+                size -= entry_size
+        self.size = size
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import atexit
+import contextlib
+import multiprocessing
+import os
+import queue
+import resource
+import threading
+from collections.abc import Callable
+from multiprocessing.connection import Connection
+from multiprocessing.context import SpawnContext
+from typing import Any
+
+import structlog
+
+from .exceptions import PdfError, PdfGenerationError
+
+logger = structlog.get_logger(__name__)
+
+Renderer = Callable[[str], bytes]
+RendererFactory = Callable[[dict[str, Any]], Renderer]
+
+
+def serve(connection: Connection, factory: RendererFactory, options: dict[str, Any]) -> None:
+    """Worker process loop: build the renderer once, then render every HTML string received on the pipe."""
+    render = factory(options)
+    while True:
+        try:
+            html = connection.recv()
+        except EOFError:
+            return
+        if html is None:
+            return
+
+        payload: bytes | str
+        try:
+            ok, payload = True, render(html)
+        except Exception as e:  # noqa: BLE001
+            ok, payload = False, repr(e)
+        # ru_maxrss is the peak resident set size in kilobytes
+        connection.send((ok, payload, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024))
+
+
+class Worker:
+    """A warm renderer process talking to the pool over a pipe."""
+
+    def __init__(self, context: SpawnContext, factory: RendererFactory, options: dict[str, Any]) -> None:
+        self.connection, child = context.Pipe()
+        self.process = context.Process(target=serve, args=(child, factory, options), daemon=True)
+        self.process.start()
+        child.close()
+
+    def render(self, html: str, timeout: float) -> tuple[bool, bytes | str, int]:
+        self.connection.send(html)
+        if not self.connection.poll(timeout):
+            raise TimeoutError
+        return self.connection.recv()
+
+    def stop(self) -> None:
+        with contextlib.suppress(OSError):
+            self.connection.send(None)
+        self.process.join(timeout=1)
+        self.kill()
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+
+class WorkerPool:
+    """Pool of persistent renderer processes.
+
+    Workers are spawned on first use and serve one document at a time. A worker that exceeds ``timeout`` is
+    killed, and one whose peak memory exceeds ``max_memory`` bytes is recycled after its document, so a
+    pathological document only costs a restart of its worker.
+    """
+
+    def __init__(
+        self,
+        factory: RendererFactory,
+        options: dict[str, Any],
+        size: int,
+        timeout: float,
+        max_memory: int,
+    ) -> None:
+        self.factory = factory
+        self.options = options
+        self.size = size
+        self.timeout = timeout
+        self.max_memory = max_memory
+        self.context = multiprocessing.get_context("spawn")
+        self.idle: queue.LifoQueue[Worker] = queue.LifoQueue()
+        self.pid: int | None = None
+        self.lock = threading.Lock()
+        atexit.register(self.close)
+
+    def spawn(self) -> Worker:
+        return Worker(self.context, self.factory, self.options)
+
+    def start(self) -> None:
+        with self.lock:
+            if self.pid == os.getpid():
+                return
+            # A forked copy of the pool (e.g. in preloaded Gunicorn workers) starts its own processes rather
+            # than sharing the parent's pipes
+            self.idle = queue.LifoQueue()
+            for _ in range(self.size):
+                self.idle.put(self.spawn())
+            self.pid = os.getpid()
+
+    def render(self, html: str) -> bytes:
+        self.start()
+        try:
+            worker = self.idle.get(timeout=self.timeout)
+        except queue.Empty as e:
+            raise PdfGenerationError(f"No PDF worker available after {self.timeout}s") from e
+
+        healthy = False
+        try:
+            ok, payload, memory = worker.render(html, self.timeout)
+            healthy = True
+        except TimeoutError as e:
+            logger.warning("PDF worker timed out", pid=worker.process.pid, timeout=self.timeout)
+            raise PdfGenerationError(f"PDF rendering timed out after {self.timeout}s") from e
+        except (EOFError, OSError) as e:
+            logger.warning("PDF worker exited", pid=worker.process.pid, exitcode=worker.process.exitcode)
+            raise PdfError("PDF worker exited unexpectedly") from e
+        finally:
+            if not healthy:
+                worker.kill()
+                worker = self.spawn()
+            elif memory > self.max_memory:
+                logger.info("Recycling PDF worker", pid=worker.process.pid, memory=memory, max_memory=self.max_memory)
+                worker.stop()
+                worker = self.spawn()
+            self.idle.put(worker)
+
+        if not ok or not isinstance(payload, bytes):
+            raise PdfGenerationError(payload)
+        return payload
+
+    def close(self) -> None:
+        if self.pid != os.getpid():
+            return
+        while True:
+            try:
+                self.idle.get_nowait().stop()
+            except queue.Empty:
+                break
+        self.pid = None
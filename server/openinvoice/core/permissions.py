@@ -18,7 +18,7 @@ class HasFeature(BasePermission):
         if request.account is None:
             return False
 
-        return has_feature(request.account, self.key)
+        return has_feature(request.plan, self.key)
 
 
 class WithinLimit(BasePermission):
@@ -38,4 +38,4 @@ class WithinLimit(BasePermission):
             return False
 
         usage = self.get_usage(request)
-        return not is_limit_exceeded(request.account, self.key, usage)
+        return not is_limit_exceeded(request.plan, self.key, usage)
@@ -25,3 +25,29 @@ class ConfigSerializer(serializers.Serializer):
     is_billing_enabled = serializers.BooleanField()
     current_plan_code = serializers.CharField(max_length=100)
     plans = PlanSerializer(many=True)
+
+
+class SelectableFieldsMixin:
+    """Serialize only the fields named in the ``fields`` context entry, or every field when it isn't set."""
+
+    # Set by the serializer metaclass of the class this is mixed into
+    _declared_fields: dict[str, serializers.Field]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        selected = self.context.get("fields")
+        if selected is not None:
+            for name in set(self.fields) - set(selected):
+                self.fields.pop(name)
+
+    @classmethod
+    def parse_fields(cls, value: str | None) -> list[str] | None:
+        """Parse a comma separated ``fields`` query parameter, rejecting names the serializer doesn't declare."""
+        if value is None:
+            return None
+
+        fields = [name.strip() for name in value.split(",") if name.strip()]
+        unknown = [name for name in fields if name not in cls._declared_fields]
+        if unknown:
+            raise serializers.ValidationError({"fields": [f"Unknown field: {name}" for name in unknown]})
+        return fields
@@ -6,7 +6,6 @@ from rest_framework.response import Response
 
 from openinvoice.accounts.permissions import IsAccountMember
 
-from .access import resolve_plan
 from .serializers import ConfigSerializer
 
 
@@ -22,7 +21,7 @@ class ConfigAPIView(generics.GenericAPIView):
         serializer = self.get_serializer(
             {
                 "is_billing_enabled": hasattr(settings, "STRIPE_API_KEY"),
-                "current_plan_code": resolve_plan(request.account),
+                "current_plan_code": request.plan,
                 "plans": [
                     {
                         "name": plan["name"],
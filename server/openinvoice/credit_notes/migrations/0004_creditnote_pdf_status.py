@@ -0,0 +1,25 @@
+# Generated by Django 5.2 on 2026-10-17 05:23
+
+from django.db import migrations, models
+
+
+def mark_rendered_credit_notes_ready(apps, _):
+    CreditNote = apps.get_model("credit_notes", "CreditNote")
+    CreditNote.objects.filter(pdf__isnull=False).update(pdf_status="ready")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("credit_notes", "0003_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="creditnote",
+            name="pdf_status",
+            field=models.CharField(
+                choices=[("pending", "Pending"), ("ready", "Ready"), ("failed", "Failed")], max_length=50, null=True
+            ),
+        ),
+        migrations.RunPython(mark_rendered_credit_notes_ready, migrations.RunPython.noop),
+    ]
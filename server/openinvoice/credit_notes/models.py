@@ -5,6 +5,7 @@ from collections.abc import Mapping
 from datetime import datetime
 from decimal import Decimal
 
+from django.conf import settings
 from django.contrib.postgres.fields import ArrayField
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.db import models
@@ -24,6 +25,8 @@ from openinvoice.integrations.choices import PaymentProvider
 from openinvoice.invoices.choices import InvoiceStatus
 from openinvoice.invoices.models import InvoiceLine
 from openinvoice.numbering_systems.models import NumberingSystem
+from openinvoice.rendering.choices import RenderJobKind, RenderStatus
+from openinvoice.rendering.models import RenderJob
 from openinvoice.tax_rates.models import TaxRate
 
 from .calculations import calculate_credit_note_line_amounts
@@ -71,6 +74,7 @@ class CreditNote(models.Model):
     issued_at = models.DateTimeField(null=True)
     voided_at = models.DateTimeField(null=True)
     pdf = models.OneToOneField("files.File", on_delete=models.SET_NULL, null=True, related_name="credit_notes_pdf")
+    pdf_status = models.CharField(max_length=50, choices=RenderStatus.choices, null=True)
 
     objects = CreditNoteManager.from_queryset(CreditNoteQuerySet)()
 
@@ -97,18 +101,16 @@ class CreditNote(models.Model):
             return None
 
         timestamp = timezone.now()
-        start_at, end_at = self.numbering_system.calculate_bounds(effective_at=timestamp)
-
-        query = Q(numbering_system=self.numbering_system) & ~Q(status=CreditNoteStatus.DRAFT)
-        if start_at:
-            query &= Q(issued_at__gte=start_at)
-        if end_at:
-            query &= Q(issued_at__lt=end_at)
-
-        issued_count = CreditNote.objects.filter(query).count()
+        if hasattr(self, "projected_draft_offset"):
+            return self.numbering_system.project_number(
+                effective_at=timestamp,
+                offset=self.projected_draft_offset or 0,
+                count=getattr(self, "projected_sequence_count", None),
+            )
 
         draft_offset = 0
-        if self.status == InvoiceStatus.DRAFT:
+        if self.status == CreditNoteStatus.DRAFT:
+            start_at, end_at = self.numbering_system.calculate_bounds(effective_at=timestamp)
             draft_query = Q(numbering_system=self.numbering_system, status=CreditNoteStatus.DRAFT)
             if start_at:
                 draft_query &= Q(created_at__gte=start_at)
@@ -119,7 +121,7 @@ class CreditNote(models.Model):
             earlier_condition = Q(created_at__lt=self.created_at) | (Q(created_at=self.created_at) & Q(pk__lt=self.pk))
             draft_offset = drafts.filter(earlier_condition).count()
 
-        return self.numbering_system.render_number(count=issued_count + draft_offset, effective_at=timestamp)
+        return self.numbering_system.project_number(effective_at=timestamp, offset=draft_offset)
 
     @cached_property
     def effective_number(self) -> str | None:
@@ -212,22 +214,22 @@ class CreditNote(models.Model):
     def issue(self, issue_date: datetime | None = None) -> None:
         self.status = CreditNoteStatus.ISSUED
 
-        if self.number is None and self.numbering_system is not None:
-            self.number = self.generate_number()
-
         self.issue_date = issue_date or self.issue_date or timezone.now().date()
         self.issued_at = timezone.now()
-        self.save()
 
-        pdf_file = self.generate_pdf()
-        self.pdf = pdf_file
-        self.save(update_fields=["pdf", "updated_at"])
+        if self.number is None and self.numbering_system is not None:
+            self.number = self.numbering_system.allocate_number(effective_at=self.issued_at)
+        if settings.PDF_RENDER_ASYNC:
+            self.pdf_status = RenderStatus.PENDING
+        self.save()
 
         self.invoice.recalculate_credit()
 
         if self.invoice.status == InvoiceStatus.OPEN and self.invoice.outstanding_amount.amount == 0:
             self.invoice.mark_paid()
 
+        RenderJob.objects.enqueue(RenderJobKind.CREDIT_NOTE, self.id)
+
     def void(self) -> None:
         self.status = CreditNoteStatus.VOIDED
         self.voided_at = timezone.now()
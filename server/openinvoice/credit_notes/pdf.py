@@ -0,0 +1,36 @@
+from uuid import UUID
+
+import structlog
+from django.db import transaction
+
+from openinvoice.rendering.choices import RenderStatus
+
+from .choices import CreditNoteDeliveryMethod
+from .mail import send_credit_note
+from .models import CreditNote
+
+logger = structlog.get_logger(__name__)
+
+
+def render_credit_note(credit_note_id: UUID) -> None:
+    credit_note = CreditNote.objects.get(id=credit_note_id)
+    credit_note.pdf = credit_note.generate_pdf()
+    credit_note.pdf_status = RenderStatus.READY
+    credit_note.save(update_fields=["pdf", "pdf_status", "updated_at"])
+
+    if credit_note.delivery_method == CreditNoteDeliveryMethod.AUTOMATIC and len(credit_note.recipients) > 0:
+        # Deliver only once the rendered PDF is committed, a rolled back render must not send anything
+        transaction.on_commit(lambda: deliver_credit_note(credit_note), robust=True)
+
+
+def deliver_credit_note(credit_note: CreditNote) -> None:
+    send_credit_note(credit_note=credit_note)
+    logger.info(
+        "Credit note delivered automatically",
+        credit_note_id=credit_note.id,
+        recipients=credit_note.recipients,
+    )
+
+
+def fail_credit_note_rendering(credit_note_id: UUID) -> None:
+    CreditNote.objects.filter(id=credit_note_id, pdf_status=RenderStatus.PENDING).update(pdf_status=RenderStatus.FAILED)
@@ -7,6 +7,8 @@ from django.db import models
 from django.db.models import Sum
 from djmoney.money import Money
 
+from openinvoice.numbering_systems.querysets import annotate_projected_numbers
+
 from .choices import CreditNoteStatus
 
 if TYPE_CHECKING:
@@ -20,6 +22,9 @@ class CreditNoteQuerySet(models.QuerySet):
     def issued(self):
         return self.filter(status=CreditNoteStatus.ISSUED)
 
+    def with_projected_numbers(self):
+        return annotate_projected_numbers(self, draft_status=CreditNoteStatus.DRAFT, numbered_at="issued_at")
+
     def total_amount(self, *, currency: str) -> Money:
         total = self.aggregate(total=Sum("total_amount")).get("total")
         if isinstance(total, Money):
@@ -14,6 +14,7 @@ from openinvoice.invoices.choices import InvoiceStatus
 from openinvoice.invoices.fields import InvoiceLineRelatedField, InvoiceRelatedField
 from openinvoice.numbering_systems.choices import NumberingSystemAppliesTo
 from openinvoice.numbering_systems.fields import NumberingSystemRelatedField
+from openinvoice.rendering.choices import RenderStatus
 from openinvoice.tax_rates.fields import TaxRateRelatedField
 
 from .calculations import calculate_credit_note_line_amounts
@@ -81,6 +82,7 @@ class CreditNoteSerializer(serializers.Serializer):
     issued_at = serializers.DateTimeField(allow_null=True)
     voided_at = serializers.DateTimeField(allow_null=True)
     pdf_id = serializers.UUIDField(allow_null=True)
+    pdf_status = serializers.ChoiceField(choices=RenderStatus.choices, allow_null=True)
     billing_profile = BillingProfileSerializer(source="invoice.billing_profile", read_only=True)
     business_profile = BusinessProfileSerializer(source="invoice.business_profile", read_only=True)
     lines = CreditNoteLineSerializer(many=True, read_only=True)
@@ -115,10 +117,10 @@ class CreditNoteCreateSerializer(serializers.Serializer):
         return value
 
     def validate_delivery_method(self, value):
-        account = self.context["request"].account
+        plan = self.context["request"].plan
 
         if value == CreditNoteDeliveryMethod.AUTOMATIC and not has_feature(
-            account, FeatureCode.AUTOMATIC_CREDIT_NOTE_DELIVERY
+            plan, FeatureCode.AUTOMATIC_CREDIT_NOTE_DELIVERY
         ):
             raise serializers.ValidationError("Automatic delivery is forbidden for your account.")
 
@@ -139,10 +141,10 @@ class CreditNoteUpdateSerializer(serializers.Serializer):
     recipients = serializers.ListField(child=serializers.EmailField(), required=False, allow_empty=True)
 
     def validate_delivery_method(self, value):
-        account = self.context["request"].account
+        plan = self.context["request"].plan
 
         if value == CreditNoteDeliveryMethod.AUTOMATIC and not has_feature(
-            account, FeatureCode.AUTOMATIC_CREDIT_NOTE_DELIVERY
+            plan, FeatureCode.AUTOMATIC_CREDIT_NOTE_DELIVERY
         ):
             raise serializers.ValidationError("Automatic delivery is forbidden for your account.")
 
@@ -13,9 +13,8 @@ from openinvoice.comments.models import Comment
 from openinvoice.comments.serializers import CommentCreateSerializer, CommentSerializer
 from openinvoice.invoices.choices import InvoiceStatus
 
-from .choices import CreditNoteDeliveryMethod, CreditNotePreviewFormat, CreditNoteStatus
+from .choices import CreditNotePreviewFormat, CreditNoteStatus
 from .filtersets import CreditNoteFilterSet
-from .mail import send_credit_note
 from .models import CreditNote, CreditNoteLine, CreditNoteTax
 from .permissions import MaxCreditNotesLimit
 from .serializers import (
@@ -50,6 +49,7 @@ class CreditNoteListCreateAPIView(generics.ListAPIView):
     def get_queryset(self):
         return (
             CreditNote.objects.for_account(self.request.account)
+            .with_projected_numbers()
             .select_related(
                 "invoice",
                 "customer",
@@ -402,9 +402,7 @@ class CreditNoteIssueAPIView(generics.GenericAPIView):
 
         credit_note.issue(issue_date=serializer.validated_data.get("issue_date", credit_note.issue_date))
 
-        if credit_note.delivery_method == CreditNoteDeliveryMethod.AUTOMATIC and len(credit_note.recipients) > 0:
-            send_credit_note(credit_note=credit_note)
-
+        credit_note = self.get_object()
         serializer = CreditNoteSerializer(credit_note)
         return Response(serializer.data)
 
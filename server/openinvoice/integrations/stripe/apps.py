@@ -5,3 +5,6 @@ class StripeIntegrationsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "openinvoice.integrations.stripe"
     label = "stripe_integrations"
+
+    def ready(self) -> None:
+        from . import signals  # noqa: F401
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from uuid import UUID
+
+from django.conf import settings
+from stripe import StripeClient
+
+from .client import get_http_client
+from .models import StripeConnection
+
+
+@dataclass(frozen=True)
+class CachedConnection:
+    id: UUID
+    account_id: UUID
+    redirect_url: str | None
+    webhook_secret: str
+    client: StripeClient
+    expires_at: float
+
+
+class ConnectionCache:
+    """In-process cache of Stripe connections with their secrets decrypted and a client kept per connection.
+
+    Entries expire after ``STRIPE_CONNECTION_CACHE_TIMEOUT`` seconds. Changes made in this process drop the entry
+    right away, other processes pick them up once their entry expires.
+    """
+
+    def __init__(self) -> None:
+        self.entries: dict[UUID, CachedConnection] = {}
+        self.lock = threading.Lock()
+
+    def get(self, connection_id: UUID) -> CachedConnection:
+        """Return the cached connection, loading it when missing or expired.
+
+        Raises ``StripeConnection.DoesNotExist`` for unknown connections, which are not cached.
+        """
+        with self.lock:
+            entry = self.entries.get(connection_id)
+        if entry is not None and entry.expires_at > time.monotonic():
+            return entry
+
+        connection = StripeConnection.objects.get(id=connection_id)
+        entry = CachedConnection(
+            id=connection.id,
+            account_id=connection.account_id,
+            redirect_url=connection.redirect_url,
+            webhook_secret=connection.webhook_secret,
+            client=StripeClient(connection.api_key, http_client=get_http_client()),
+            expires_at=time.monotonic() + settings.STRIPE_CONNECTION_CACHE_TIMEOUT,
+        )
+        with self.lock:
+            self.entries[connection.id] = entry
+        return entry
+
+    def invalidate(self, connection_id: UUID) -> None:
+        with self.lock:
+            self.entries.pop(connection_id, None)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+
+connection_cache = ConnectionCache()
@@ -0,0 +1,10 @@
+from django.conf import settings
+from django.utils.module_loading import import_string
+from stripe import HTTPClient
+
+
+def get_http_client() -> HTTPClient | None:
+    """Return the transport configured with ``STRIPE_HTTP_CLIENT``, or None for the library's default."""
+    if settings.STRIPE_HTTP_CLIENT is None:
+        return None
+    return import_string(settings.STRIPE_HTTP_CLIENT)()
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import json
+import uuid
+from collections.abc import Mapping
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+from stripe import HTTPClient
+
+
+class FakeHTTPClient(HTTPClient):
+    """Stripe transport answering the calls made by the integration without reaching the network.
+
+    Meant for tests and local development, set ``STRIPE_HTTP_CLIENT`` to its import path. Checkout sessions and
+    webhook endpoints are created with made up ids, any other call gets a 404 like an unknown Stripe resource.
+    """
+
+    name = "fake"
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Mapping[str, str] | None,  # noqa: ARG002
+        post_data: Any = None,
+        *,
+        _usage: list[str] | None = None,
+    ) -> tuple[str, int, Mapping[str, str]]:
+        path = urlsplit(url).path
+        params = {key: values[0] for key, values in parse_qs(post_data or "").items()}
+
+        match method.lower(), path:
+            case "post", "/v1/checkout/sessions":
+                session_id = f"cs_test_{uuid.uuid4().hex}"
+                body = {
+                    "id": session_id,
+                    "object": "checkout.session",
+                    "client_reference_id": params.get("client_reference_id"),
+                    "mode": params.get("mode"),
+                    "status": "open",
+                    "success_url": params.get("success_url"),
+                    "url": f"https://checkout.stripe.com/c/pay/{session_id}",
+                }
+            case "post", "/v1/webhook_endpoints":
+                body = {
+                    "id": f"we_{uuid.uuid4().hex}",
+                    "object": "webhook_endpoint",
+                    "url": params.get("url"),
+                    "secret": f"whsec_{uuid.uuid4().hex}",
+                }
+            case _:
+                error = {"type": "invalid_request_error", "message": f"Unrecognized request URL ({method} {path})"}
+                return json.dumps({"error": error}), 404, {}
+
+        return json.dumps(body), 200, {}
+
+    def close(self) -> None:
+        pass
@@ -1,7 +1,6 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, cast
 from uuid import UUID
 
-import stripe
 import structlog
 from djmoney.money import Money
 from stripe import StripeError
@@ -9,6 +8,7 @@ from stripe import StripeError
 from openinvoice.integrations.base import PaymentProviderIntegration
 from openinvoice.integrations.exceptions import IntegrationConnectionError, IntegrationError
 
+from .cache import connection_cache
 from .models import StripeConnection
 
 if TYPE_CHECKING:
@@ -53,29 +53,32 @@ class StripeIntegration(PaymentProviderIntegration):
 
     def checkout(self, invoice: "Invoice", payment_id: UUID) -> tuple[str, str | None]:
         try:
-            connection = StripeConnection.objects.for_account(invoice.account).get(id=invoice.payment_connection_id)
+            connection = connection_cache.get(cast(UUID, invoice.payment_connection_id))
         except StripeConnection.DoesNotExist as e:
             raise IntegrationConnectionError from e
+        if connection.account_id != invoice.account_id:
+            raise IntegrationConnectionError
 
-        client = stripe.StripeClient(api_key=connection.api_key)
         try:
-            session = client.checkout.sessions.create(
-                mode="payment",
-                customer_email=invoice.billing_profile.email,
-                client_reference_id=str(payment_id),
-                success_url=connection.redirect_url or self.default_success_url,
-                invoice_creation={"enabled": False},
-                line_items=[
-                    {
-                        "price_data": {
-                            "currency": line.currency.lower(),
-                            "product_data": {"name": line.description},
-                            "unit_amount": convert_amount(line.unit_amount),
-                        },
-                        "quantity": line.quantity,
-                    }
-                    for line in invoice.lines.all()
-                ],
+            session = connection.client.checkout.sessions.create(
+                params={
+                    "mode": "payment",
+                    "customer_email": invoice.billing_profile.email,
+                    "client_reference_id": str(payment_id),
+                    "success_url": connection.redirect_url or self.default_success_url,
+                    "invoice_creation": {"enabled": False},
+                    "line_items": [
+                        {
+                            "price_data": {
+                                "currency": line.currency.lower(),
+                                "product_data": {"name": line.description},
+                                "unit_amount": convert_amount(line.unit_amount),
+                            },
+                            "quantity": line.quantity,
+                        }
+                        for line in invoice.lines.all()
+                    ],
+                }
             )
         except StripeError as e:
             raise IntegrationError from e
@@ -7,6 +7,8 @@ from django.conf import settings
 from django.db import models
 from stripe import StripeClient
 
+from .client import get_http_client
+
 if TYPE_CHECKING:
     from openinvoice.accounts.models import Account
 
@@ -23,16 +25,18 @@ class StripeConnectionManager(models.Manager):
         redirect_url: str | None = None,
     ) -> StripeConnection:
         connection_id = uuid.uuid4()
-        client = StripeClient(api_key)
+        client = StripeClient(api_key, http_client=get_http_client())
         webhook_endpoint = client.webhook_endpoints.create(
-            url=settings.BASE_URL + f"/api/v1/integrations/stripe/connections/{connection_id}/webhook",
-            description=f"OpenInvoice connection - {code}",
-            enabled_events=[
-                "checkout.session.completed",
-                "checkout.session.async_payment_succeeded",
-                "checkout.session.async_payment_failed",
-                "checkout.session.expired",
-            ],
+            params={
+                "url": settings.BASE_URL + f"/api/v1/integrations/stripe/connections/{connection_id}/webhook",
+                "description": f"OpenInvoice connection - {code}",
+                "enabled_events": [
+                    "checkout.session.completed",
+                    "checkout.session.async_payment_succeeded",
+                    "checkout.session.async_payment_failed",
+                    "checkout.session.expired",
+                ],
+            }
         )
         return self.create(
             id=connection_id,
@@ -0,0 +1,13 @@
+from typing import Any
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import connection_cache
+from .models import StripeConnection
+
+
+@receiver(post_save, sender=StripeConnection)
+@receiver(post_delete, sender=StripeConnection)
+def invalidate_connection(instance: StripeConnection, **_: Any) -> None:
+    connection_cache.invalidate(instance.id)
@@ -7,38 +7,58 @@ from openinvoice.payments.models import Payment
 
 logger = structlog.get_logger(__name__)
 
+# Checkout session payment statuses that settle the payment, delayed methods complete as "unpaid" and settle
+# later through an async_payment_succeeded or async_payment_failed event
+SETTLED_PAYMENT_STATUSES = {"paid", "no_payment_required"}
+
+
+def get_payment(event: stripe.Event) -> Payment:
+    # Locked so concurrent deliveries for the same payment apply their transition one after the other
+    return Payment.objects.select_for_update().get(id=event["data"]["object"].get("client_reference_id"))
+
 
 def handle_checkout_session_completed_event(event: stripe.Event) -> None:
     session_data = event["data"]["object"]
     created_at = datetime.fromtimestamp(session_data["created"], tz=UTC)
-    payment = Payment.objects.get(id=session_data.get("client_reference_id"))
-    payment.complete(extra_data=event, received_at=created_at)
+    payment = get_payment(event)
+    if session_data.get("payment_status") not in SETTLED_PAYMENT_STATUSES:
+        logger.info("Stripe payment awaiting settlement", payment_id=str(payment.id))
+        return
+    if not payment.complete(extra_data=event, received_at=created_at):
+        logger.info("Stripe payment event skipped", payment_id=str(payment.id), status=payment.status)
+        return
     logger.info("Stripe payment succeeded", payment_id=str(payment.id))
 
 
 def handle_checkout_async_payment_succeeded_event(event: stripe.Event) -> None:
     session_data = event["data"]["object"]
     created_at = datetime.fromtimestamp(session_data["created"], tz=UTC)
-    payment = Payment.objects.get(id=session_data.get("client_reference_id"))
-    payment.complete(extra_data=event, received_at=created_at)
+    payment = get_payment(event)
+    if not payment.complete(extra_data=event, received_at=created_at):
+        logger.info("Stripe payment event skipped", payment_id=str(payment.id), status=payment.status)
+        return
     logger.info("Stripe payment succeeded", payment_id=str(payment.id))
 
 
 def handle_checkout_async_payment_failed_event(event: stripe.Event) -> None:
     session_data = event["data"]["object"]
     created_at = datetime.fromtimestamp(session_data["created"], tz=UTC)
-    payment = Payment.objects.get(id=session_data.get("client_reference_id"))
+    payment = get_payment(event)
     message = (
         session_data.get("last_payment_error", {}).get("message") or session_data.get("status") or "payment_failed"
     )
-    payment.fail(message=message, extra_data=event, received_at=created_at)
+    if not payment.fail(message=message, extra_data=event, received_at=created_at):
+        logger.info("Stripe payment event skipped", payment_id=str(payment.id), status=payment.status)
+        return
     logger.info("Stripe payment failed", payment_id=str(payment.id))
 
 
 def handle_checkout_session_expired_event(event: stripe.Event) -> None:
     session_data = event["data"]["object"]
     created_at = datetime.fromtimestamp(session_data["created"], tz=UTC)
-    payment = Payment.objects.get(id=session_data.get("client_reference_id"))
+    payment = get_payment(event)
     message = session_data.get("message", "Checkout session expired")
-    payment.reject(message=message, extra_data=event, received_at=created_at)
+    if not payment.reject(message=message, extra_data=event, received_at=created_at):
+        logger.info("Stripe payment event skipped", payment_id=str(payment.id), status=payment.status)
+        return
     logger.info("Stripe payment expired", payment_id=str(payment.id))
@@ -7,8 +7,10 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from openinvoice.accounts.permissions import IsAccountMember
-from openinvoice.payments.models import Payment
+from openinvoice.webhooks.choices import WebhookSource
+from openinvoice.webhooks.models import WebhookEvent
 
+from .cache import connection_cache
 from .models import StripeConnection
 from .permissions import StripeIntegrationFeature
 from .serializers import (
@@ -16,12 +18,6 @@ from .serializers import (
     StripeConnectionSerializer,
     StripeConnectionUpdateSerializer,
 )
-from .tasks import (
-    handle_checkout_async_payment_failed_event,
-    handle_checkout_async_payment_succeeded_event,
-    handle_checkout_session_completed_event,
-    handle_checkout_session_expired_event,
-)
 
 logger = structlog.get_logger(__name__)
 
@@ -106,7 +102,7 @@ class StripeWebhookAPIView(APIView):
     @extend_schema(request=None, responses={200: {}}, exclude=True)
     def post(self, request, pk):
         try:
-            connection = StripeConnection.objects.get(id=pk)
+            connection = connection_cache.get(pk)
         except StripeConnection.DoesNotExist:
             return Response(status=status.HTTP_400_BAD_REQUEST)
 
@@ -121,19 +117,7 @@ class StripeWebhookAPIView(APIView):
         except stripe.SignatureVerificationError:
             return Response(status=status.HTTP_400_BAD_REQUEST)
 
-        try:
-            match event.get("type"):
-                case "checkout.session.completed":
-                    handle_checkout_session_completed_event(event)
-                case "checkout.session.async_payment_succeeded":
-                    handle_checkout_async_payment_succeeded_event(event)
-                case "checkout.session.async_payment_failed":
-                    handle_checkout_async_payment_failed_event(event)
-                case "checkout.session.expired":
-                    handle_checkout_session_expired_event(event)
-                case _:
-                    logger.info("Stripe event ignored", event_type=event.get("type"))
-        except Payment.DoesNotExist:
-            return Response(status=status.HTTP_400_BAD_REQUEST)
+        # Handled by the webhook worker, Stripe only waits for the event to be stored
+        WebhookEvent.objects.receive(WebhookSource.STRIPE_CONNECTION, event, connection_id=connection.id)
 
         return Response(status=status.HTTP_200_OK)
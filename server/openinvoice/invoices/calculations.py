@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from decimal import Decimal
+from uuid import UUID
+
+from openinvoice.core.calculations import allocate_proportionally, calculate_tax_amounts
+
+from .choices import InvoiceDiscountSource, InvoiceTaxSource
+
+# Plain-value calculation kernel for invoices. Inputs and results only hold decimals and ids,
+# the ORM layer (``Invoice.recalculate``) loads the inputs and persists the results.
+
+
+@dataclass(slots=True)
+class CouponInput:
+    id: UUID
+    amount: Decimal | None
+    percentage: Decimal | None
+
+
+@dataclass(slots=True)
+class TaxRateInput:
+    id: UUID
+    percentage: Decimal
+
+
+@dataclass(slots=True)
+class LineInput:
+    id: UUID
+    quantity: int
+    unit_amount: Decimal
+    amount: Decimal
+    coupons: list[CouponInput] = field(default_factory=list)
+    tax_rates: list[TaxRateInput] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class ShippingInput:
+    id: UUID
+    amount: Decimal
+    tax_rates: list[TaxRateInput] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class InvoiceInput:
+    tax_inclusive: bool
+    lines: list[LineInput] = field(default_factory=list)
+    coupons: list[CouponInput] = field(default_factory=list)
+    tax_rates: list[TaxRateInput] = field(default_factory=list)
+    shipping: ShippingInput | None = None
+
+
+@dataclass(slots=True)
+class DiscountAllocationResult:
+    line_id: UUID
+    coupon_id: UUID
+    source: InvoiceDiscountSource
+    amount: Decimal
+    position: int = 0
+
+
+@dataclass(slots=True)
+class TaxAllocationResult:
+    tax_rate_id: UUID
+    source: InvoiceTaxSource
+    amount: Decimal
+    line_id: UUID | None = None
+    shipping_id: UUID | None = None
+    position: int = 0
+
+
+@dataclass(slots=True)
+class LineResult:
+    id: UUID
+    quantity: int
+    unit_excluding_tax_amount: Decimal
+    amount: Decimal
+    subtotal_amount: Decimal
+    total_discount_amount: Decimal
+    total_taxable_amount: Decimal
+    total_excluding_tax_amount: Decimal
+    total_tax_amount: Decimal
+    total_tax_rate: Decimal
+    total_amount: Decimal
+
+
+@dataclass(slots=True)
+class ShippingResult:
+    id: UUID
+    amount: Decimal
+    total_excluding_tax_amount: Decimal
+    total_tax_amount: Decimal
+    total_tax_rate: Decimal
+    total_amount: Decimal
+    tax_allocations: list[TaxAllocationResult] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class InvoiceResult:
+    lines: list[LineResult]
+    shipping: ShippingResult | None
+    discount_allocations: list[DiscountAllocationResult]
+    tax_allocations: list[TaxAllocationResult]
+    subtotal_amount: Decimal
+    total_discount_amount: Decimal
+    total_excluding_tax_amount: Decimal
+    shipping_amount: Decimal
+    total_tax_amount: Decimal
+    total_amount: Decimal
+
+
+def calculate_discount_amount(coupon: CouponInput, base_amount: Decimal) -> Decimal:
+    """Return the discount ``coupon`` grants on ``base_amount``, capped at ``base_amount``."""
+
+    if coupon.amount is not None:
+        if coupon.amount <= 0:
+            return Decimal(0)
+        return min(coupon.amount, base_amount)
+
+    if coupon.percentage is not None:
+        percentage_amount = base_amount * (coupon.percentage / Decimal(100))
+        if percentage_amount <= 0:
+            return Decimal(0)
+        return min(percentage_amount, base_amount)
+
+    return Decimal(0)
+
+
+def calculate_tax_multiplier(tax_inclusive: bool, total_tax_rate: Decimal) -> Decimal:
+    if tax_inclusive and total_tax_rate > 0:
+        return Decimal(1) + (total_tax_rate / Decimal(100))
+    return Decimal(1)
+
+
+def calculate_shipping(shipping: ShippingInput, tax_inclusive: bool) -> ShippingResult:
+    total_tax_rate = sum((tax_rate.percentage for tax_rate in shipping.tax_rates), Decimal(0))
+    tax_multiplier = calculate_tax_multiplier(tax_inclusive, total_tax_rate)
+    total_excluding_tax_amount = shipping.amount / tax_multiplier
+
+    tax_amounts = calculate_tax_amounts(
+        base_amount=total_excluding_tax_amount,
+        taxable_amount=shipping.amount,
+        tax_multiplier=tax_multiplier,
+        percentages=[tax_rate.percentage for tax_rate in shipping.tax_rates],
+    )
+
+    total_tax_amount = Decimal(0)
+    tax_allocations = []
+    for position, (tax_rate, tax_amount) in enumerate(zip(shipping.tax_rates, tax_amounts, strict=False)):
+        if tax_amount <= 0:
+            continue
+
+        total_tax_amount += tax_amount
+        tax_allocations.append(
+            TaxAllocationResult(
+                tax_rate_id=tax_rate.id,
+                source=InvoiceTaxSource.SHIPPING,
+                amount=tax_amount,
+                shipping_id=shipping.id,
+                position=position,
+            )
+        )
+
+    return ShippingResult(
+        id=shipping.id,
+        amount=shipping.amount,
+        total_excluding_tax_amount=total_excluding_tax_amount,
+        total_tax_amount=total_tax_amount,
+        total_tax_rate=total_tax_rate,
+        total_amount=total_excluding_tax_amount + total_tax_amount,
+        tax_allocations=tax_allocations,
+    )
+
+
+def calculate_invoice(invoice: InvoiceInput) -> InvoiceResult:  # noqa: C901
+    discount_allocations: list[DiscountAllocationResult] = []
+    tax_allocations: list[TaxAllocationResult] = []
+    results: list[LineResult] = []
+    multipliers: list[Decimal] = []
+
+    # Calculate base
+
+    for line in invoice.lines:
+        tax_rates = line.tax_rates or invoice.tax_rates
+        total_tax_rate = sum((tax_rate.percentage for tax_rate in tax_rates), Decimal(0))
+        tax_multiplier = calculate_tax_multiplier(invoice.tax_inclusive, total_tax_rate)
+        multipliers.append(tax_multiplier)
+        results.append(
+            LineResult(
+                id=line.id,
+                quantity=line.quantity,
+                unit_excluding_tax_amount=line.unit_amount / tax_multiplier,
+                amount=line.amount,
+                subtotal_amount=line.amount,
+                total_discount_amount=Decimal(0),
+                total_taxable_amount=line.amount,
+                total_excluding_tax_amount=Decimal(0),
+                total_tax_amount=Decimal(0),
+                total_tax_rate=total_tax_rate,
+                total_amount=Decimal(0),
+            )
+        )
+
+    # Calculate line discounts
+
+    discountable_lines = []
+    for line, result in zip(invoice.lines, results, strict=True):
+        if not line.coupons:
+            # Accumulate invoice-level discountable lines for later discount calculation
+            discountable_lines.append(result)
+            continue
+
+        for position, coupon in enumerate(line.coupons):
+            discount_amount = calculate_discount_amount(coupon, result.subtotal_amount)
+            if discount_amount <= 0:
+                continue
+
+            result.subtotal_amount -= discount_amount
+            result.total_taxable_amount -= discount_amount
+            result.total_discount_amount += discount_amount
+            discount_allocations.append(
+                DiscountAllocationResult(
+                    line_id=line.id,
+                    coupon_id=coupon.id,
+                    source=InvoiceDiscountSource.LINE,
+                    amount=discount_amount,
+                    position=position,
+                )
+            )
+
+    # Calculate invoice discounts
+
+    total_taxable_amount = sum((result.total_taxable_amount for result in discountable_lines), Decimal(0))
+
+    for position, coupon in enumerate(invoice.coupons):
+        if total_taxable_amount <= 0 or not discountable_lines:
+            break
+
+        discount_amount = calculate_discount_amount(coupon, total_taxable_amount)
+        if discount_amount <= 0:
+            continue
+
+        bases = [result.total_taxable_amount for result in discountable_lines]
+        discount_shares = allocate_proportionally(discount_amount, bases=bases)
+
+        for result, share_amount in zip(discountable_lines, discount_shares, strict=False):
+            share_amount = min(share_amount, result.total_taxable_amount)
+            if share_amount <= 0:
+                continue
+
+            total_taxable_amount -= share_amount
+            result.total_taxable_amount -= share_amount
+            result.total_discount_amount += share_amount
+            discount_allocations.append(
+                DiscountAllocationResult(
+                    line_id=result.id,
+                    coupon_id=coupon.id,
+                    source=InvoiceDiscountSource.INVOICE,
+                    amount=share_amount,
+                    position=position,
+                )
+            )
+
+    # Calculate taxes
+
+    for line, result, tax_multiplier in zip(invoice.lines, results, multipliers, strict=True):
+        tax_rates = line.tax_rates or invoice.tax_rates
+        source = InvoiceTaxSource.LINE if line.tax_rates else InvoiceTaxSource.INVOICE
+        result.total_excluding_tax_amount = result.total_taxable_amount / tax_multiplier
+
+        tax_amounts = calculate_tax_amounts(
+            base_amount=result.total_excluding_tax_amount,
+            taxable_amount=result.total_taxable_amount,
+            tax_multiplier=tax_multiplier,
+            percentages=[tax_rate.percentage for tax_rate in tax_rates],
+        )
+
+        for position, (tax_rate, tax_amount) in enumerate(zip(tax_rates, tax_amounts, strict=False)):
+            if tax_amount <= 0:
+                continue
+
+            result.total_tax_amount += tax_amount
+            tax_allocations.append(
+                TaxAllocationResult(
+                    tax_rate_id=tax_rate.id,
+                    source=source,
+                    amount=tax_amount,
+                    line_id=line.id,
+                    position=position,
+                )
+            )
+
+        result.total_amount = result.total_excluding_tax_amount + result.total_tax_amount
+
+    # Calculate total
+
+    subtotal_amount = sum((result.subtotal_amount for result in results), Decimal(0))
+    total_discount_amount = sum((result.total_discount_amount for result in results), Decimal(0))
+    total_excluding_tax_amount = sum((result.total_excluding_tax_amount for result in results), Decimal(0))
+    total_tax_amount = sum((result.total_tax_amount for result in results), Decimal(0))
+    total_amount = total_excluding_tax_amount + total_tax_amount
+
+    # Calculate shipping
+
+    shipping = None
+    shipping_amount = Decimal(0)
+    if invoice.shipping is not None:
+        shipping = calculate_shipping(invoice.shipping, invoice.tax_inclusive)
+        shipping_amount = shipping.amount
+        total_excluding_tax_amount += shipping.total_excluding_tax_amount
+        total_tax_amount += shipping.total_tax_amount
+        total_amount += shipping.total_amount
+
+    return InvoiceResult(
+        lines=results,
+        shipping=shipping,
+        discount_allocations=discount_allocations,
+        tax_allocations=tax_allocations,
+        subtotal_amount=subtotal_amount,
+        total_discount_amount=total_discount_amount,
+        total_excluding_tax_amount=total_excluding_tax_amount,
+        shipping_amount=shipping_amount,
+        total_tax_amount=total_tax_amount,
+        total_amount=total_amount,
+    )
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from openinvoice.invoices.models import Invoice
+from openinvoice.invoices.recalculation import RecalculationProgress, recalculate_invoices
+
+
+class Command(BaseCommand):
+    help = "Recalculate draft invoices in bulk, e.g. after a tax rate or coupon correction."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--account", help="Only recalculate invoices of this account ID")
+        parser.add_argument("--customer", help="Only recalculate invoices of this customer ID")
+        parser.add_argument(
+            "--tax-rate",
+            help="Only recalculate invoices using this tax rate ID on the invoice, a line or the shipping",
+        )
+        parser.add_argument("--coupon", help="Only recalculate invoices using this coupon ID on the invoice or a line")
+        parser.add_argument("--all", action="store_true", help="Recalculate the drafts of every account")
+        parser.add_argument("--chunk-size", type=int, default=100, help="Invoices per transaction")
+        parser.add_argument("--workers", type=int, default=1, help="Number of worker processes")
+
+    def handle(self, *_, **options):
+        filters = ("account", "customer", "tax_rate", "coupon")
+        if not options["all"] and not any(options[name] for name in filters):
+            raise CommandError("Pass --all or at least one of --account, --customer, --tax-rate and --coupon")
+        if options["chunk_size"] < 1 or options["workers"] < 1:
+            raise CommandError("--chunk-size and --workers must be positive")
+
+        invoices = Invoice.objects.all()
+        if options["account"]:
+            invoices = invoices.filter(account_id=options["account"])
+        if options["customer"]:
+            invoices = invoices.filter(customer_id=options["customer"])
+        if options["tax_rate"]:
+            invoices = invoices.filter(
+                Q(tax_rates=options["tax_rate"])
+                | Q(lines__tax_rates=options["tax_rate"])
+                | Q(shipping__tax_rates=options["tax_rate"])
+            )
+        if options["coupon"]:
+            invoices = invoices.filter(Q(coupons=options["coupon"]) | Q(lines__coupons=options["coupon"]))
+
+        def on_progress(progress: RecalculationProgress) -> None:
+            self.stdout.write(
+                f"Recalculated {progress.processed}/{progress.total} invoices ({progress.rate:.1f} invoices/s)"
+            )
+
+        progress = recalculate_invoices(
+            invoices,
+            chunk_size=options["chunk_size"],
+            workers=options["workers"],
+            on_progress=on_progress,
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Recalculated {progress.processed} draft invoices in {progress.elapsed:.2f}s "
+                f"({progress.rate:.1f} invoices/s)"
+            )
+        )
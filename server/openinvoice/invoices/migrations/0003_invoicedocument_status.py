@@ -0,0 +1,25 @@
+# Generated by Django 5.2 on 2026-10-17 05:23
+
+from django.db import migrations, models
+
+
+def mark_rendered_documents_ready(apps, _):
+    InvoiceDocument = apps.get_model("invoices", "InvoiceDocument")
+    InvoiceDocument.objects.filter(file__isnull=False).update(status="ready")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("invoices", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="invoicedocument",
+            name="status",
+            field=models.CharField(
+                choices=[("pending", "Pending"), ("ready", "Ready"), ("failed", "Failed")], max_length=50, null=True
+            ),
+        ),
+        migrations.RunPython(mark_rendered_documents_ready, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2 on 2026-10-17 06:09
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Indexes are built without locking invoices against writes, which can't happen inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("invoices", "0003_invoicedocument_status"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="invoice",
+            index=models.Index(fields=["account_id", "-created_at"], name="invoice_account_created_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="invoice",
+            index=models.Index(fields=["account_id", "status", "-created_at"], name="invoice_account_status_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="invoice",
+            index=models.Index(fields=["customer_id", "-created_at"], name="invoice_customer_created_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="invoice",
+            index=models.Index(fields=["account_id", "issue_date"], name="invoice_account_issue_date_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="invoice",
+            index=models.Index(fields=["account_id", "due_date"], name="invoice_account_due_date_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="invoice",
+            index=models.Index(
+                condition=models.Q(("status", "open")),
+                fields=["account_id", "currency", "due_date"],
+                name="invoice_open_due_date_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="invoice",
+            index=models.Index(
+                condition=models.Q(("status", "draft")),
+                fields=["numbering_system_id", "created_at"],
+                name="invoice_draft_numbering_idx",
+            ),
+        ),
+    ]
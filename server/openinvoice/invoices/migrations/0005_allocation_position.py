@@ -0,0 +1,45 @@
+# Generated by Django 5.2 on 2026-10-17 06:40
+
+from django.db import migrations, models
+
+BACKFILL_POSITION_SQL = """
+UPDATE invoices_invoicediscountallocation a SET position = c.position
+FROM invoices_invoicelinecoupon c
+WHERE a.source = 'line' AND c.invoice_line_id = a.invoice_line_id AND c.coupon_id = a.coupon_id;
+
+UPDATE invoices_invoicediscountallocation a SET position = c.position
+FROM invoices_invoicecoupon c
+WHERE a.source = 'invoice' AND c.invoice_id = a.invoice_id AND c.coupon_id = a.coupon_id;
+
+UPDATE invoices_invoicetaxallocation a SET position = t.position
+FROM invoices_invoicelinetaxrate t
+WHERE a.source = 'line' AND t.invoice_line_id = a.invoice_line_id AND t.tax_rate_id = a.tax_rate_id;
+
+UPDATE invoices_invoicetaxallocation a SET position = t.position
+FROM invoices_invoiceshippingtaxrate t
+WHERE a.source = 'shipping' AND t.invoice_shipping_id = a.invoice_shipping_id AND t.tax_rate_id = a.tax_rate_id;
+
+UPDATE invoices_invoicetaxallocation a SET position = t.position
+FROM invoices_invoicetaxrate t
+WHERE a.source = 'invoice' AND t.invoice_id = a.invoice_id AND t.tax_rate_id = a.tax_rate_id;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("invoices", "0004_invoice_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="invoicediscountallocation",
+            name="position",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="invoicetaxallocation",
+            name="position",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunSQL(BACKFILL_POSITION_SQL, migrations.RunSQL.noop),
+    ]
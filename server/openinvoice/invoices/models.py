@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import uuid
 from collections.abc import Iterable, Mapping
+from contextlib import suppress
 from datetime import date, datetime
-from decimal import Decimal
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from itertools import chain
 from typing import Any
 
 from dateutil.relativedelta import relativedelta
@@ -19,7 +21,7 @@ from djmoney.models.fields import MoneyField
 from djmoney.money import Money
 
 from openinvoice.accounts.models import BusinessProfile
-from openinvoice.core.calculations import aggregate_allocations, allocate_proportionally, calculate_tax_amounts, zero
+from openinvoice.core.calculations import CENT, aggregate_allocations, zero
 from openinvoice.coupons.models import Coupon
 from openinvoice.credit_notes.choices import CreditNoteStatus
 from openinvoice.customers.models import BillingProfile, Customer, ShippingProfile
@@ -27,9 +29,25 @@ from openinvoice.integrations.choices import PaymentProvider
 from openinvoice.numbering_systems.models import NumberingSystem
 from openinvoice.payments.models import Payment
 from openinvoice.prices.models import Price
+from openinvoice.rendering.choices import RenderJobKind, RenderStatus
+from openinvoice.rendering.models import RenderJob
 from openinvoice.shipping_rates.models import ShippingRate
 from openinvoice.tax_rates.models import TaxRate
 
+from .calculations import (
+    CouponInput,
+    DiscountAllocationResult,
+    InvoiceInput,
+    InvoiceResult,
+    LineInput,
+    LineResult,
+    ShippingInput,
+    ShippingResult,
+    TaxAllocationResult,
+    TaxRateInput,
+    calculate_invoice,
+    calculate_tax_multiplier,
+)
 from .choices import (
     InvoiceDeliveryMethod,
     InvoiceDiscountSource,
@@ -132,12 +150,39 @@ class Invoice(models.Model):  # type: ignore[django-manager-missing]
 
     objects = InvoiceManager.from_queryset(InvoiceQuerySet)()
 
+    CALCULATED_FIELDS = [
+        "subtotal_amount",
+        "total_discount_amount",
+        "total_excluding_tax_amount",
+        "shipping_amount",
+        "total_tax_amount",
+        "total_amount",
+        "outstanding_amount",
+    ]
+
     class Meta:
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["account_id", "number"], name="account_id_number_idx"),
             models.Index(fields=["head_id"]),
             models.Index(fields=["previous_revision_id"]),
+            models.Index(fields=["account_id", "-created_at"], name="invoice_account_created_idx"),
+            models.Index(fields=["account_id", "status", "-created_at"], name="invoice_account_status_idx"),
+            models.Index(fields=["customer_id", "-created_at"], name="invoice_customer_created_idx"),
+            models.Index(fields=["account_id", "issue_date"], name="invoice_account_issue_date_idx"),
+            models.Index(fields=["account_id", "due_date"], name="invoice_account_due_date_idx"),
+            # Open invoices by due date, for overdue balances and reminders
+            models.Index(
+                fields=["account_id", "currency", "due_date"],
+                name="invoice_open_due_date_idx",
+                condition=Q(status=InvoiceStatus.OPEN),
+            ),
+            # Drafts in creation order per numbering system, for projecting their numbers
+            models.Index(
+                fields=["numbering_system_id", "created_at"],
+                name="invoice_draft_numbering_idx",
+                condition=Q(status=InvoiceStatus.DRAFT),
+            ),
         ]
         constraints = [
             models.CheckConstraint(
@@ -169,23 +214,20 @@ class Invoice(models.Model):  # type: ignore[django-manager-missing]
         return InvoiceTaxBehavior.INCLUSIVE
 
     def generate_number(self) -> str | None:
-        # TODO: add much more tests for this method
         if self.numbering_system is None:
             return None
 
         timestamp = timezone.now()
-        start_at, end_at = self.numbering_system.calculate_bounds(effective_at=timestamp)
-
-        query = Q(numbering_system=self.numbering_system) & ~Q(status=InvoiceStatus.DRAFT)
-        if start_at:
-            query &= Q(opened_at__gte=start_at)
-        if end_at:
-            query &= Q(opened_at__lt=end_at)
-
-        finalized_count = Invoice.objects.filter(query).count()
+        if hasattr(self, "projected_draft_offset"):
+            return self.numbering_system.project_number(
+                effective_at=timestamp,
+                offset=self.projected_draft_offset or 0,
+                count=getattr(self, "projected_sequence_count", None),
+            )
 
         draft_offset = 0
         if self.status == InvoiceStatus.DRAFT:
+            start_at, end_at = self.numbering_system.calculate_bounds(effective_at=timestamp)
             draft_query = Q(numbering_system=self.numbering_system, status=InvoiceStatus.DRAFT)
             if start_at:
                 draft_query &= Q(created_at__gte=start_at)
@@ -196,7 +238,7 @@ class Invoice(models.Model):  # type: ignore[django-manager-missing]
             earlier_condition = Q(created_at__lt=self.created_at) | (Q(created_at=self.created_at) & Q(pk__lt=self.pk))
             draft_offset = drafts.filter(earlier_condition).count()
 
-        return self.numbering_system.render_number(count=finalized_count + draft_offset, effective_at=timestamp)
+        return self.numbering_system.project_number(effective_at=timestamp, offset=draft_offset)
 
     @cached_property
     def effective_number(self) -> str | None:
@@ -227,7 +269,7 @@ class Invoice(models.Model):  # type: ignore[django-manager-missing]
                 "name": allocation.coupon.name,
                 "amount": allocation.amount,
             },
-            order=lambda allocation: (getattr(allocation, "position", 0)),
+            order=lambda allocation: allocation.position,
         )
 
     @property
@@ -245,7 +287,7 @@ class Invoice(models.Model):  # type: ignore[django-manager-missing]
                 "name": allocation.coupon.name,
                 "amount": allocation.amount,
             },
-            order=lambda allocation: (source_order[allocation.source], getattr(allocation, "position", 0)),
+            order=lambda allocation: (source_order[allocation.source], allocation.position),
         )
 
     @property
@@ -262,7 +304,7 @@ class Invoice(models.Model):  # type: ignore[django-manager-missing]
                 "percentage": allocation.tax_rate.percentage,
                 "amount": allocation.amount,
             },
-            order=lambda allocation: (getattr(allocation, "position", 0)),
+            order=lambda allocation: allocation.position,
         )
 
     @property
@@ -282,7 +324,7 @@ class Invoice(models.Model):  # type: ignore[django-manager-missing]
                 "percentage": allocation.tax_rate.percentage,
                 "amount": allocation.amount,
             },
-            order=lambda allocation: (source_order[allocation.source], getattr(allocation, "position", 0)),
+            order=lambda allocation: (source_order[allocation.source], allocation.position),
         )
 
     @property
@@ -295,161 +337,148 @@ class Invoice(models.Model):  # type: ignore[django-manager-missing]
             zero(self.currency),
         )
 
-    def recalculate(self) -> None:  # noqa: C901
-        # Cleanup existing calculations
-        self.discount_allocations.all().delete()
-        self.tax_allocations.all().delete()
+    def build_calculation_input(self, lines: Iterable[InvoiceLine]) -> InvoiceInput:
+        # Invoices loaded with ``for_calculation()`` carry their inputs, others fetch them here
+        coupons = getattr(self, "calculation_coupons", None)
+        if coupons is None:
+            coupons = self.coupons.order_by("invoice_coupons__position")
+
+        tax_rates = getattr(self, "calculation_tax_rates", None)
+        if tax_rates is None:
+            tax_rates = self.tax_rates.order_by("invoice_tax_rates__position")
+
+        return InvoiceInput(
+            tax_inclusive=self.effective_tax_behavior == InvoiceTaxBehavior.INCLUSIVE,
+            lines=[line.build_calculation_input() for line in lines],
+            coupons=[
+                CouponInput(
+                    id=coupon.id,
+                    amount=coupon.amount.amount if coupon.amount is not None else None,
+                    percentage=coupon.percentage,
+                )
+                for coupon in coupons
+            ],
+            tax_rates=[TaxRateInput(id=tax_rate.id, percentage=tax_rate.percentage) for tax_rate in tax_rates],
+            shipping=self.shipping.build_calculation_input() if self.shipping else None,
+        )
 
-        lines = list(self.lines.select_related("price").all())
-        invoice_tax_rates = list(self.tax_rates.order_by("invoice_tax_rates__position"))
+    def calculate(self) -> tuple[list[InvoiceLine], InvoiceResult]:
+        lines = getattr(self, "calculation_lines", None)
+        if lines is None:
+            lines = list(self.lines.for_calculation())
+        return lines, calculate_invoice(self.build_calculation_input(lines))
 
-        # Calculate base
+    def build_discount_allocations(
+        self,
+        allocations: Iterable[DiscountAllocationResult],
+        lines: Mapping[uuid.UUID, InvoiceLine],
+    ) -> list[InvoiceDiscountAllocation]:
+        return [
+            InvoiceDiscountAllocation(
+                invoice=self,
+                invoice_line=lines[allocation.line_id],
+                coupon_id=allocation.coupon_id,
+                source=allocation.source,
+                position=allocation.position,
+                currency=self.currency,
+                amount=Money(allocation.amount, self.currency),
+            )
+            for allocation in allocations
+        ]
 
-        for line in lines:
-            line.amount = line.price.calculate_amount(line.quantity) if line.price else line.unit_amount * line.quantity
-            line_tax_rates = list(line.tax_rates.order_by("invoice_line_tax_rates__position"))
-            tax_rates = line_tax_rates if line_tax_rates else invoice_tax_rates
-            line.total_tax_rate = sum((tax_rate.percentage for tax_rate in tax_rates), Decimal(0))
-            line.unit_excluding_tax_amount = line.unit_amount / line.tax_multiplier
-            line.subtotal_amount = line.amount
-            line.total_taxable_amount = line.amount
-            line.total_discount_amount = zero(self.currency)
-            line.total_tax_amount = zero(self.currency)
-
-        # Calculate line discounts
-
-        discountable_lines = []
-        for line in lines:
-            coupons = list(line.coupons.order_by("invoice_line_coupons__position"))
+    def build_tax_allocations(
+        self,
+        allocations: Iterable[TaxAllocationResult],
+        lines: Mapping[uuid.UUID, InvoiceLine],
+    ) -> list[InvoiceTaxAllocation]:
+        return [
+            InvoiceTaxAllocation(
+                invoice=self,
+                invoice_line=lines[allocation.line_id] if allocation.line_id else None,
+                invoice_shipping=self.shipping if allocation.shipping_id else None,
+                tax_rate_id=allocation.tax_rate_id,
+                source=allocation.source,
+                position=allocation.position,
+                currency=self.currency,
+                amount=Money(allocation.amount, self.currency),
+            )
+            for allocation in allocations
+        ]
 
-            if coupons:
-                # Calculate discounts for line-level coupons
-                for coupon in coupons:
-                    discount_amount = coupon.calculate_amount(line.subtotal_amount)
+    def apply_calculation(self, calculation: InvoiceResult) -> None:
+        self.subtotal_amount = Money(calculation.subtotal_amount, self.currency)
+        self.total_discount_amount = Money(calculation.total_discount_amount, self.currency)
+        self.total_excluding_tax_amount = Money(calculation.total_excluding_tax_amount, self.currency)
+        self.shipping_amount = Money(calculation.shipping_amount, self.currency)
+        self.total_tax_amount = Money(calculation.total_tax_amount, self.currency)
+        self.total_amount = Money(calculation.total_amount, self.currency)
+        self.outstanding_amount = self.calculate_outstanding_amount()
 
-                    if discount_amount.amount <= 0:
-                        continue
+    def recalculate(self) -> None:
+        lines, calculation = self.calculate()
 
-                    line.subtotal_amount -= discount_amount
-                    line.total_taxable_amount -= discount_amount
-                    line.total_discount_amount += discount_amount
-                    line.add_discount_allocation(discount_amount, coupon, InvoiceDiscountSource.LINE)
-            else:
-                # Accumulate invoice-level discountable lines for later discount calculation
-                discountable_lines.append(line)
+        # Persist line calculations
 
-        # Calculate invoice discounts
+        lines_by_id = {line.id: line for line in lines}
+        changed_lines = [
+            lines_by_id[result.id] for result in calculation.lines if lines_by_id[result.id].apply_calculation(result)
+        ]
 
-        total_taxable_amount = sum(
-            (line.total_taxable_amount for line in discountable_lines),
-            start=zero(self.currency),
+        self.discount_allocations.sync(self.build_discount_allocations(calculation.discount_allocations, lines_by_id))
+        self.tax_allocations.sync(
+            self.build_tax_allocations(
+                chain(
+                    calculation.tax_allocations,
+                    calculation.shipping.tax_allocations if calculation.shipping else [],
+                ),
+                lines_by_id,
+            )
         )
+        InvoiceLine.objects.bulk_update(changed_lines, fields=InvoiceLine.CALCULATED_FIELDS)
 
-        for coupon in list(self.coupons.order_by("invoice_coupons__position")):
-            if total_taxable_amount.amount <= 0 or not discountable_lines:
-                break
+        # Persist shipping and totals
 
-            discount_amount = coupon.calculate_amount(total_taxable_amount)
-            if discount_amount.amount <= 0:
-                continue
+        if self.shipping and calculation.shipping:
+            self.shipping.apply_calculation(calculation.shipping)
+            self.shipping.save(update_fields=InvoiceShipping.CALCULATED_FIELDS)
 
-            bases = [line.total_taxable_amount for line in discountable_lines]
-            discount_shares = allocate_proportionally(discount_amount, bases=bases)
+        self.apply_calculation(calculation)
+        self.save(update_fields=self.CALCULATED_FIELDS)
 
-            for line, share_amount in zip(discountable_lines, discount_shares, strict=False):
-                share_amount = min(share_amount, line.total_taxable_amount)
-                if share_amount.amount <= 0:
-                    continue
+    def recalculate_line(self, line_id: uuid.UUID) -> None:
+        """Recalculate the invoice after the line ``line_id`` was added, changed or removed.
 
-                total_taxable_amount -= share_amount
-                line.total_taxable_amount -= share_amount
-                line.total_discount_amount += share_amount
-                line.add_discount_allocation(share_amount, coupon, InvoiceDiscountSource.INVOICE)
+        Without invoice-level coupons a line's amounts and allocations don't depend on the other lines,
+        so only that line, its allocations and the invoice totals are written. Invoice coupons are
+        allocated proportionally across lines, in which case this falls back to :meth:`recalculate`.
+        """
+        if self.coupons.exists():
+            self.recalculate()
+            return
 
-        # Calculate taxes
+        lines, calculation = self.calculate()
+        lines_by_id = {line.id: line for line in lines if line.id == line_id}
 
-        for line in lines:
-            line_tax_rates = list(line.tax_rates.order_by("invoice_line_tax_rates__position"))
-            tax_rates = line_tax_rates if line_tax_rates else invoice_tax_rates
-            line.total_excluding_tax_amount = line.total_taxable_amount / line.tax_multiplier
-
-            source = InvoiceTaxSource.LINE if line_tax_rates else InvoiceTaxSource.INVOICE
-            tax_amounts = calculate_tax_amounts(
-                base_amount=line.total_excluding_tax_amount,
-                taxable_amount=line.total_taxable_amount,
-                tax_multiplier=line.tax_multiplier,
-                tax_rates=tax_rates,
-            )
-
-            line.total_tax_amount = zero(self.currency)
-            for tax_rate, tax_amount in zip(tax_rates, tax_amounts, strict=False):
-                if tax_amount.amount <= 0:
-                    continue
-
-                line.total_tax_amount += tax_amount
-                line.add_tax_allocations(tax_amount, tax_rate, source)
-
-            line.total_amount = line.total_excluding_tax_amount + line.total_tax_amount
-            line.outstanding_amount = line.total_amount
-            line.outstanding_quantity = line.quantity
-
-        # Persist line calculations
+        for result in calculation.lines:
+            if result.id == line_id and lines_by_id[line_id].apply_calculation(result):
+                lines_by_id[line_id].save(update_fields=InvoiceLine.CALCULATED_FIELDS)
 
-        InvoiceLine.objects.bulk_update(
-            lines,
-            fields=[
-                "unit_amount",
-                "unit_excluding_tax_amount",
-                "amount",
-                "subtotal_amount",
-                "total_discount_amount",
-                "total_taxable_amount",
-                "total_excluding_tax_amount",
-                "total_tax_amount",
-                "total_tax_rate",
-                "total_amount",
-                "outstanding_amount",
-                "outstanding_quantity",
-            ],
+        self.discount_allocations.filter(invoice_line_id=line_id).sync(
+            self.build_discount_allocations(
+                [allocation for allocation in calculation.discount_allocations if allocation.line_id == line_id],
+                lines_by_id,
+            )
         )
-
-        # Calculate total
-
-        subtotal_amount = sum([line.subtotal_amount for line in lines], zero(self.currency))
-        total_discount_amount = sum([line.total_discount_amount for line in lines], zero(self.currency))
-        total_excluding_tax_amount = sum([line.total_excluding_tax_amount for line in lines], zero(self.currency))
-        total_tax_amount = sum([line.total_tax_amount for line in lines], zero(self.currency))
-        total_amount = total_excluding_tax_amount + total_tax_amount
-
-        # Calculate shipping
-
-        shipping_amount = zero(self.currency)
-        if self.shipping:
-            self.shipping.recalculate()
-            shipping_amount = self.shipping.amount
-            total_excluding_tax_amount += self.shipping.total_excluding_tax_amount
-            total_tax_amount += self.shipping.total_tax_amount
-            total_amount += self.shipping.total_amount
-
-        self.subtotal_amount = subtotal_amount
-        self.total_discount_amount = total_discount_amount
-        self.total_excluding_tax_amount = total_excluding_tax_amount
-        self.shipping_amount = shipping_amount
-        self.total_tax_amount = total_tax_amount
-        self.total_amount = total_amount
-        self.outstanding_amount = self.calculate_outstanding_amount()
-        self.save(
-            update_fields=[
-                "subtotal_amount",
-                "total_discount_amount",
-                "total_excluding_tax_amount",
-                "shipping_amount",
-                "total_tax_amount",
-                "total_amount",
-                "outstanding_amount",
-            ]
+        self.tax_allocations.filter(invoice_line_id=line_id).sync(
+            self.build_tax_allocations(
+                [allocation for allocation in calculation.tax_allocations if allocation.line_id == line_id],
+                lines_by_id,
+            )
         )
 
+        self.apply_calculation(calculation)
+        self.save(update_fields=self.CALCULATED_FIELDS)
+
     def recalculate_credit(self) -> None:
         lines = self.lines.annotate(
             credited_amount=Coalesce(
@@ -541,7 +570,7 @@ class Invoice(models.Model):  # type: ignore[django-manager-missing]
             self.shipping.save(update_fields=["profile"])
 
         if self.number is None and self.numbering_system is not None:
-            self.number = self.generate_number()
+            self.number = self.numbering_system.allocate_number(effective_at=self.opened_at)
 
         self.save()
 
@@ -556,6 +585,10 @@ class Invoice(models.Model):  # type: ignore[django-manager-missing]
         elif self.payment_provider and self.payment_connection_id:
             Payment.objects.checkout_invoice(invoice=self)
 
+        if settings.PDF_RENDER_ASYNC:
+            InvoiceDocument.objects.filter(invoice=self).update(status=RenderStatus.PENDING, updated_at=timezone.now())
+        RenderJob.objects.enqueue(RenderJobKind.INVOICE, self.id)
+
     def void(self) -> None:
         self.status = InvoiceStatus.VOIDED
         self.voided_at = timezone.now()
@@ -635,6 +668,7 @@ class InvoiceDocument(models.Model):
         null=True,
         related_name="invoice_document_pdf",
     )
+    status = models.CharField(max_length=50, choices=RenderStatus.choices, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -688,14 +722,28 @@ class InvoiceLine(models.Model):
 
     objects = InvoiceLineManager.from_queryset(InvoiceLineQuerySet)()
 
+    CALCULATED_FIELDS = [
+        "unit_amount",
+        "unit_excluding_tax_amount",
+        "amount",
+        "subtotal_amount",
+        "total_discount_amount",
+        "total_taxable_amount",
+        "total_excluding_tax_amount",
+        "total_tax_amount",
+        "total_tax_rate",
+        "total_amount",
+        "outstanding_amount",
+        "outstanding_quantity",
+    ]
+
     class Meta:
         ordering = ["created_at"]
 
     @property
     def tax_multiplier(self) -> Decimal:
-        if self.invoice.effective_tax_behavior == InvoiceTaxBehavior.INCLUSIVE and self.total_tax_rate > 0:
-            return Decimal(1) + (self.total_tax_rate / Decimal(100))
-        return Decimal(1)
+        tax_inclusive = self.invoice.effective_tax_behavior == InvoiceTaxBehavior.INCLUSIVE
+        return calculate_tax_multiplier(tax_inclusive, self.total_tax_rate)
 
     def set_coupons(self, coupons: Iterable[Coupon]) -> None:
         self.coupons.clear()
@@ -710,27 +758,55 @@ class InvoiceLine(models.Model):
             for idx, tax_rate in enumerate(tax_rates)
         )
 
-    def add_discount_allocation(
-        self, amount: Money, coupon: Coupon, source: InvoiceDiscountSource
-    ) -> InvoiceDiscountAllocation:
-        return self.discount_allocations.create(
-            invoice=self.invoice,
-            invoice_line=self,
-            coupon=coupon,
-            source=source,
-            currency=self.currency,
-            amount=amount,
+    def build_calculation_input(self) -> LineInput:
+        amount = self.price.calculate_amount(self.quantity) if self.price else self.unit_amount * self.quantity
+        return LineInput(
+            id=self.id,
+            quantity=self.quantity,
+            unit_amount=self.unit_amount.amount,
+            amount=amount.amount,
+            coupons=[
+                CouponInput(
+                    id=coupon.id,
+                    amount=coupon.amount.amount if coupon.amount is not None else None,
+                    percentage=coupon.percentage,
+                )
+                for coupon in self.coupons.all()
+            ],
+            tax_rates=[
+                TaxRateInput(id=tax_rate.id, percentage=tax_rate.percentage) for tax_rate in self.tax_rates.all()
+            ],
         )
 
-    def add_tax_allocations(self, amount: Money, tax_rate: TaxRate, source: InvoiceTaxSource) -> InvoiceTaxAllocation:
-        return self.tax_allocations.create(
-            invoice=self.invoice,
-            invoice_line=self,
-            tax_rate=tax_rate,
-            source=source,
-            currency=self.currency,
-            amount=amount,
-        )
+    def _stored_calculation_values(self) -> list[Any]:
+        # Values as the database stores them, i.e. rounded to the column's two decimal places
+        values = []
+        for field in self.CALCULATED_FIELDS:
+            value = getattr(self, field)
+            if isinstance(value, Money):
+                value = value.amount
+            if isinstance(value, Decimal):
+                # Values too large to be stored are kept as is, the database rejects the write
+                with suppress(InvalidOperation):
+                    value = value.quantize(CENT, rounding=ROUND_HALF_UP)
+            values.append(value)
+        return values
+
+    def apply_calculation(self, result: LineResult) -> bool:
+        """Apply ``result`` to the line and return whether any stored value changed."""
+        previous_values = self._stored_calculation_values()
+        self.unit_excluding_tax_amount = Money(result.unit_excluding_tax_amount, self.currency)
+        self.amount = Money(result.amount, self.currency)
+        self.subtotal_amount = Money(result.subtotal_amount, self.currency)
+        self.total_discount_amount = Money(result.total_discount_amount, self.currency)
+        self.total_taxable_amount = Money(result.total_taxable_amount, self.currency)
+        self.total_excluding_tax_amount = Money(result.total_excluding_tax_amount, self.currency)
+        self.total_tax_amount = Money(result.total_tax_amount, self.currency)
+        self.total_tax_rate = result.total_tax_rate
+        self.total_amount = Money(result.total_amount, self.currency)
+        self.outstanding_amount = self.total_amount
+        self.outstanding_quantity = self.quantity
+        return self._stored_calculation_values() != previous_values
 
     @property
     def discounts(self) -> list[dict[str, Any]]:
@@ -747,7 +823,7 @@ class InvoiceLine(models.Model):
                 "name": allocation.coupon.name,
                 "amount": allocation.amount,
             },
-            order=lambda allocation: (getattr(allocation, "position", 0)),
+            order=lambda allocation: allocation.position,
         )
 
     @property
@@ -765,7 +841,7 @@ class InvoiceLine(models.Model):
                 "name": allocation.coupon.name,
                 "amount": allocation.amount,
             },
-            order=lambda allocation: (source_order[allocation.source], getattr(allocation, "position", 0)),
+            order=lambda allocation: (source_order[allocation.source], allocation.position),
         )
 
     @property
@@ -782,7 +858,7 @@ class InvoiceLine(models.Model):
                 "percentage": allocation.tax_rate.percentage,
                 "amount": allocation.amount,
             },
-            order=lambda allocation: (getattr(allocation, "position", 0)),
+            order=lambda allocation: allocation.position,
         )
 
     @property
@@ -803,7 +879,7 @@ class InvoiceLine(models.Model):
             },
             order=lambda allocation: (
                 source_order[allocation.source],
-                getattr(allocation, "position", 0),
+                allocation.position,
                 allocation.tax_rate_id,
             ),
         )
@@ -854,11 +930,17 @@ class InvoiceShipping(models.Model):
     shipping_rate = models.ForeignKey("shipping_rates.ShippingRate", on_delete=models.PROTECT)
     tax_rates = models.ManyToManyField("tax_rates.TaxRate", through="InvoiceShippingTaxRate", related_name="+")
 
+    CALCULATED_FIELDS = [
+        "total_excluding_tax_amount",
+        "total_tax_rate",
+        "total_tax_amount",
+        "total_amount",
+    ]
+
     @property
     def tax_multiplier(self) -> Decimal:
-        if self.invoice.effective_tax_behavior == InvoiceTaxBehavior.INCLUSIVE and self.total_tax_rate > 0:
-            return Decimal(1) + (self.total_tax_rate / Decimal(100))
-        return Decimal(1)
+        tax_inclusive = self.invoice.effective_tax_behavior == InvoiceTaxBehavior.INCLUSIVE
+        return calculate_tax_multiplier(tax_inclusive, self.total_tax_rate)
 
     @property
     def total_taxes(self) -> list[dict[str, Any]]:
@@ -874,7 +956,7 @@ class InvoiceShipping(models.Model):
                 "percentage": allocation.tax_rate.percentage,
                 "amount": allocation.amount,
             },
-            order=lambda allocation: (getattr(allocation, "position", 0)),
+            order=lambda allocation: allocation.position,
         )
 
     def set_tax_rates(self, tax_rates: Iterable[TaxRate]) -> None:
@@ -884,45 +966,22 @@ class InvoiceShipping(models.Model):
             for idx, tax_rate in enumerate(tax_rates)
         )
 
-    def add_tax_allocation(self, amount: Money, tax_rate: TaxRate) -> InvoiceTaxAllocation:
-        return self.tax_allocations.create(
-            invoice=self.invoice,
-            invoice_shipping=self,
-            tax_rate=tax_rate,
-            source=InvoiceTaxSource.SHIPPING,
-            currency=self.currency,
-            amount=amount,
-        )
+    def build_calculation_input(self) -> ShippingInput:
+        tax_rates = getattr(self, "calculation_tax_rates", None)
+        if tax_rates is None:
+            tax_rates = self.tax_rates.order_by("invoice_shipping_tax_rates__position")
 
-    def recalculate(self) -> None:
-        tax_rates = list(self.tax_rates.order_by("invoice_shipping_tax_rates__position"))
-        self.total_tax_rate = sum((tax_rate.percentage for tax_rate in tax_rates), Decimal(0))
-        self.total_excluding_tax_amount = self.amount / self.tax_multiplier
-        self.total_tax_amount = zero(self.currency)
-
-        tax_amounts = calculate_tax_amounts(
-            base_amount=self.total_excluding_tax_amount,
-            taxable_amount=self.amount,
-            tax_multiplier=self.tax_multiplier,
-            tax_rates=tax_rates,
+        return ShippingInput(
+            id=self.id,
+            amount=self.amount.amount,
+            tax_rates=[TaxRateInput(id=tax_rate.id, percentage=tax_rate.percentage) for tax_rate in tax_rates],
         )
 
-        for tax_rate, tax_amount in zip(tax_rates, tax_amounts, strict=False):
-            if tax_amount.amount <= 0:
-                continue
-
-            self.total_tax_amount += tax_amount
-            self.add_tax_allocation(tax_amount, tax_rate)
-
-        self.total_amount = self.total_excluding_tax_amount + self.total_tax_amount
-        self.save(
-            update_fields=[
-                "total_excluding_tax_amount",
-                "total_tax_rate",
-                "total_tax_amount",
-                "total_amount",
-            ]
-        )
+    def apply_calculation(self, result: ShippingResult) -> None:
+        self.total_excluding_tax_amount = Money(result.total_excluding_tax_amount, self.currency)
+        self.total_tax_rate = result.total_tax_rate
+        self.total_tax_amount = Money(result.total_tax_amount, self.currency)
+        self.total_amount = Money(result.total_amount, self.currency)
 
 
 class InvoiceCoupon(models.Model):
@@ -1011,6 +1070,8 @@ class InvoiceDiscountAllocation(models.Model):
     invoice_line = models.ForeignKey("InvoiceLine", on_delete=models.CASCADE, related_name="discount_allocations")
     coupon = models.ForeignKey("coupons.Coupon", on_delete=models.PROTECT, related_name="+")
     source = models.CharField(max_length=20, choices=InvoiceDiscountSource.choices)
+    # Position of the coupon on its line or invoice, stored at recalculation time for ordering
+    position = models.PositiveIntegerField(default=0)
     currency = models.CharField(max_length=3, choices=djmoney_settings.CURRENCY_CHOICES)
     amount = MoneyField(max_digits=19, decimal_places=2, currency_field_name="currency")
     created_at = models.DateTimeField(auto_now_add=True)
@@ -1050,6 +1111,8 @@ class InvoiceTaxAllocation(models.Model):
     )
     tax_rate = models.ForeignKey("tax_rates.TaxRate", on_delete=models.PROTECT, related_name="+")
     source = models.CharField(max_length=20, choices=InvoiceTaxSource.choices)
+    # Position of the tax rate on its line, shipping or invoice, stored at recalculation time for ordering
+    position = models.PositiveIntegerField(default=0)
     currency = models.CharField(max_length=3, choices=djmoney_settings.CURRENCY_CHOICES)
     amount = MoneyField(max_digits=19, decimal_places=2, currency_field_name="currency")
     created_at = models.DateTimeField(auto_now_add=True)
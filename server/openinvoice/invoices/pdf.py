@@ -1,38 +1,116 @@
+from uuid import UUID
+
+import structlog
+from django.conf import settings
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import transaction
 from django.template.loader import render_to_string
+from django.utils import timezone
 
-from openinvoice.core.pdf import generate_pdf
+from openinvoice.core.pdf import generate_pdfs
 from openinvoice.files.choices import FilePurpose
 from openinvoice.files.models import File
+from openinvoice.payments.choices import PaymentStatus
+from openinvoice.rendering.choices import RenderJobKind, RenderJobStatus, RenderStatus
+from openinvoice.rendering.models import RenderJob
 
+from .choices import InvoiceDeliveryMethod
+from .mail import send_invoice
 from .models import Invoice, InvoiceDocument
 
+logger = structlog.get_logger(__name__)
+
 
 def render_invoice_documents(invoice: Invoice) -> None:
     documents = list(invoice.documents.all())
     content_type = "application/pdf"
 
-    for document in documents:
-        filename = f"{document.id}.pdf"
-        html = render_to_string(
+    # Templates may hit the database, so they're rendered here and only PDF generation and uploads run concurrently
+    htmls = [
+        render_to_string(
             "invoices/pdf/classic.html",
             {
                 "invoice": invoice,
                 "document": document,
             },
         )
-        content = generate_pdf(html)
-        file = File.objects.upload_for_account(
-            account=invoice.account,
-            purpose=FilePurpose.INVOICE_PDF,
-            filename=filename,
-            data=SimpleUploadedFile(
-                name=filename,
+        for document in documents
+    ]
+    contents = generate_pdfs(htmls)
+    files = File.objects.bulk_upload_for_account(
+        account=invoice.account,
+        purpose=FilePurpose.INVOICE_PDF,
+        uploads=[
+            SimpleUploadedFile(
+                name=f"{document.id}.pdf",
                 content=content,
                 content_type=content_type,
-            ),
-            content_type=content_type,
-        )
+            )
+            for document, content in zip(documents, contents, strict=True)
+        ],
+        content_type=content_type,
+        max_workers=settings.PDF_RENDER_THREADS,
+    )
+
+    now = timezone.now()
+    for document, file in zip(documents, files, strict=True):
         document.file = file
+        document.status = RenderStatus.READY
+        document.updated_at = now
+
+    InvoiceDocument.objects.bulk_update(documents, fields=["file", "status", "updated_at"])
+
+
+def is_delivered_automatically(invoice: Invoice) -> bool:
+    return invoice.delivery_method == InvoiceDeliveryMethod.AUTOMATIC and len(invoice.recipients) > 0
+
+
+def render_invoice(invoice_id: UUID) -> None:
+    invoice = Invoice.objects.eager_load().get(id=invoice_id)
+    render_invoice_documents(invoice)
+
+    if not is_delivered_automatically(invoice):
+        return
+
+    # The email links to the payment's checkout, while it's still queued the checkout worker delivers the invoice
+    # instead, see deliver_checked_out_invoice. The lock makes sure exactly one of the two sees the other finished.
+    Invoice.objects.select_for_update().only("id").get(id=invoice_id)
+    if invoice.payments.filter(status=PaymentStatus.PENDING_CHECKOUT).exists():
+        logger.info("Invoice delivery waits for checkout", invoice_id=invoice.id)
+        return
+
+    # Deliver only once the rendered documents are committed, a rolled back render must not send anything
+    transaction.on_commit(lambda: deliver_invoice(invoice), robust=True)
+
+
+def deliver_checked_out_invoice(invoice_id: UUID) -> None:
+    """Deliver an invoice whose documents were rendered while its payment still waited for a checkout session."""
+    invoice = Invoice.objects.eager_load().select_for_update(of=("self",)).get(id=invoice_id)
+    if not is_delivered_automatically(invoice):
+        return
+
+    # Queued, running or failed renders deliver the invoice themselves or not at all
+    if (
+        RenderJob.objects.filter(kind=RenderJobKind.INVOICE, object_id=invoice_id)
+        .exclude(status=RenderJobStatus.COMPLETED)
+        .exists()
+    ):
+        return
+
+    transaction.on_commit(lambda: deliver_invoice(invoice), robust=True)
+
+
+def deliver_invoice(invoice: Invoice) -> None:
+    send_invoice(invoice=invoice)
+    logger.info(
+        "Invoice delivered automatically",
+        invoice_id=invoice.id,
+        recipients=invoice.recipients,
+    )
+
 
-    InvoiceDocument.objects.bulk_update(documents, fields=["file"])
+def fail_invoice_rendering(invoice_id: UUID) -> None:
+    InvoiceDocument.objects.filter(invoice_id=invoice_id, status=RenderStatus.PENDING).update(
+        status=RenderStatus.FAILED,
+        updated_at=timezone.now(),
+    )
@@ -1,24 +1,53 @@
 from __future__ import annotations
 
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from decimal import ROUND_HALF_UP, Decimal
 from typing import TYPE_CHECKING
 from uuid import UUID
 
 from django.apps import apps
 from django.db import models
-from django.db.models import Case, F, IntegerField, OuterRef, Prefetch, Subquery, Value, When
+from django.db.models import (
+    Case,
+    DecimalField,
+    F,
+    Func,
+    IntegerField,
+    OuterRef,
+    Prefetch,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
 from django_cte import CTE, with_cte
 
 if TYPE_CHECKING:
     from openinvoice.accounts.models import Account
 
-from .choices import InvoiceDiscountSource, InvoiceTaxSource
+    from .models import InvoiceDiscountAllocation, InvoiceTaxAllocation
+
+from openinvoice.core.calculations import CENT
+from openinvoice.numbering_systems.querysets import annotate_projected_numbers
+from openinvoice.payments.choices import PaymentStatus
+
+from .choices import InvoiceStatus
 
 
 class InvoiceQuerySet(models.QuerySet):
     def for_account(self, account: Account):
         return self.filter(account=account)
 
-    def eager_load(self):
+    def eager_load(self, fields: Iterable[str] | None = None):
+        """Load the relations rendered by :class:`InvoiceSerializer`.
+
+        When ``fields`` is given, only the relations behind those serializer fields are loaded, so header-only
+        listings skip the lines, allocations and documents entirely.
+        """
         InvoiceLine = apps.get_model("invoices.InvoiceLine")  # noqa: N806
         Coupon = apps.get_model("coupons.Coupon")  # noqa: N806
         TaxRate = apps.get_model("tax_rates.TaxRate")  # noqa: N806
@@ -26,39 +55,207 @@ class InvoiceQuerySet(models.QuerySet):
         InvoiceTaxAllocation = apps.get_model("invoices.InvoiceTaxAllocation")  # noqa: N806
         InvoiceDocument = apps.get_model("invoices.InvoiceDocument")  # noqa: N806
 
-        return self.select_related(
-            "account",
-            "account__default_business_profile",
-            "account__default_business_profile__address",
-            "customer",
-            "customer__default_billing_profile",
-            "customer__default_billing_profile__address",
-            "numbering_system",
-            "previous_revision",
-            "shipping",
-            "shipping__profile",
-            "shipping__profile__address",
-            "shipping__shipping_rate",
-            "billing_profile",
-            "billing_profile__address",
-            "business_profile",
-            "business_profile__address",
-        ).prefetch_related(
-            Prefetch("lines", queryset=InvoiceLine.objects.eager_load().order_by("created_at")),
-            Prefetch("coupons", queryset=Coupon.objects.order_by("invoice_coupons__position")),
-            Prefetch("tax_rates", queryset=TaxRate.objects.order_by("invoice_tax_rates__position")),
-            Prefetch("lines__coupons", queryset=Coupon.objects.order_by("invoice_line_coupons__position")),
-            Prefetch("lines__tax_rates", queryset=TaxRate.objects.order_by("invoice_line_tax_rates__position")),
-            Prefetch("shipping__tax_rates", queryset=TaxRate.objects.order_by("invoice_shipping_tax_rates__position")),
-            Prefetch("discount_allocations", queryset=InvoiceDiscountAllocation.objects.annotate_position()),
-            Prefetch("lines__discount_allocations", queryset=InvoiceDiscountAllocation.objects.annotate_position()),
-            Prefetch("tax_allocations", queryset=InvoiceTaxAllocation.objects.annotate_position()),
-            Prefetch("lines__tax_allocations", queryset=InvoiceTaxAllocation.objects.annotate_position()),
-            Prefetch("shipping__tax_allocations", queryset=InvoiceTaxAllocation.objects.annotate_position()),
-            Prefetch("documents", queryset=InvoiceDocument.objects.select_related("file").order_by("created_at")),
-            "billing_profile__tax_ids",
-            "billing_profile__tax_rates",
-            "business_profile__tax_ids",
+        relations = {
+            "number": ["numbering_system"],
+            "billing_profile": [
+                "billing_profile",
+                "billing_profile__address",
+                "billing_profile__tax_ids",
+                "billing_profile__tax_rates",
+            ],
+            "business_profile": ["business_profile", "business_profile__address", "business_profile__tax_ids"],
+            "lines": [
+                "lines",
+                "lines__coupons",
+                "lines__tax_rates",
+                "lines__discount_allocations",
+                "lines__tax_allocations",
+            ],
+            "documents": ["documents"],
+            "shipping": [
+                "shipping",
+                "shipping__profile",
+                "shipping__profile__address",
+                "shipping__shipping_rate",
+                "shipping__tax_rates",
+                "shipping__tax_allocations",
+            ],
+            "coupons": ["coupons"],
+            "discounts": ["discount_allocations"],
+            "total_discounts": ["discount_allocations"],
+            "tax_rates": ["tax_rates"],
+            "taxes": ["tax_allocations"],
+            "total_taxes": ["tax_allocations"],
+        }
+        # Prefetches are applied in this order, parents before the lookups that traverse them
+        prefetches = {
+            "lines": Prefetch("lines", queryset=InvoiceLine.objects.eager_load().order_by("created_at")),
+            "coupons": Prefetch("coupons", queryset=Coupon.objects.order_by("invoice_coupons__position")),
+            "tax_rates": Prefetch("tax_rates", queryset=TaxRate.objects.order_by("invoice_tax_rates__position")),
+            "lines__coupons": Prefetch(
+                "lines__coupons", queryset=Coupon.objects.order_by("invoice_line_coupons__position")
+            ),
+            "lines__tax_rates": Prefetch(
+                "lines__tax_rates", queryset=TaxRate.objects.order_by("invoice_line_tax_rates__position")
+            ),
+            "shipping__tax_rates": Prefetch(
+                "shipping__tax_rates", queryset=TaxRate.objects.order_by("invoice_shipping_tax_rates__position")
+            ),
+            "discount_allocations": Prefetch(
+                "discount_allocations", queryset=InvoiceDiscountAllocation.objects.select_related("coupon")
+            ),
+            "lines__discount_allocations": Prefetch(
+                "lines__discount_allocations", queryset=InvoiceDiscountAllocation.objects.select_related("coupon")
+            ),
+            "tax_allocations": Prefetch(
+                "tax_allocations", queryset=InvoiceTaxAllocation.objects.select_related("tax_rate")
+            ),
+            "lines__tax_allocations": Prefetch(
+                "lines__tax_allocations", queryset=InvoiceTaxAllocation.objects.select_related("tax_rate")
+            ),
+            "shipping__tax_allocations": Prefetch(
+                "shipping__tax_allocations", queryset=InvoiceTaxAllocation.objects.select_related("tax_rate")
+            ),
+            "documents": Prefetch(
+                "documents", queryset=InvoiceDocument.objects.select_related("file").order_by("created_at")
+            ),
+            "billing_profile__tax_ids": "billing_profile__tax_ids",
+            "billing_profile__tax_rates": "billing_profile__tax_rates",
+            "business_profile__tax_ids": "business_profile__tax_ids",
+        }
+
+        if fields is None:
+            fields = relations
+            select_related = [
+                "account",
+                "account__default_business_profile",
+                "account__default_business_profile__address",
+                "customer",
+                "customer__default_billing_profile",
+                "customer__default_billing_profile__address",
+                "previous_revision",
+            ]
+        else:
+            select_related = []
+
+        lookups = {lookup for field in fields for lookup in relations.get(field, [])}
+        select_related += [lookup for lookup in sorted(lookups) if lookup not in prefetches]
+        return self.select_related(*select_related).prefetch_related(
+            *[prefetch for lookup, prefetch in prefetches.items() if lookup in lookups]
+        )
+
+    def with_version(self):
+        """Annotate ``version`` with the latest change to anything a finalized invoice renders.
+
+        Past finalization an invoice only changes through its own row (void, payments, credits), its documents and
+        the names of the coupons and tax rates it references, its profiles being snapshots. ``document_count`` is
+        annotated alongside since removing a document doesn't move any timestamp.
+        """
+        Coupon = apps.get_model("coupons.Coupon")  # noqa: N806
+        TaxRate = apps.get_model("tax_rates.TaxRate")  # noqa: N806
+        InvoiceDocument = apps.get_model("invoices.InvoiceDocument")  # noqa: N806
+
+        def aggregate(queryset, function, field, output_field=None):
+            return Subquery(
+                queryset.order_by().annotate(value=Func(F(field), function=function)).values("value"),
+                output_field=output_field,
+            )
+
+        documents = InvoiceDocument.objects.filter(invoice_id=OuterRef("pk"))
+        return self.annotate(
+            version=Greatest(
+                "updated_at",
+                aggregate(documents, "MAX", "updated_at"),
+                aggregate(Coupon.objects.filter(invoice_coupons__invoice_id=OuterRef("pk")), "MAX", "updated_at"),
+                aggregate(
+                    Coupon.objects.filter(invoice_line_coupons__invoice_line__invoice_id=OuterRef("pk")),
+                    "MAX",
+                    "updated_at",
+                ),
+                aggregate(TaxRate.objects.filter(invoice_tax_rates__invoice_id=OuterRef("pk")), "MAX", "updated_at"),
+                aggregate(
+                    TaxRate.objects.filter(invoice_line_tax_rates__invoice_line__invoice_id=OuterRef("pk")),
+                    "MAX",
+                    "updated_at",
+                ),
+                aggregate(
+                    TaxRate.objects.filter(invoice_shipping_tax_rates__invoice_shipping_id=OuterRef("shipping_id")),
+                    "MAX",
+                    "updated_at",
+                ),
+            ),
+            document_count=aggregate(documents, "COUNT", "id", output_field=IntegerField()),
+        )
+
+    def with_projected_numbers(self):
+        return annotate_projected_numbers(self, draft_status=InvoiceStatus.DRAFT, numbered_at="opened_at")
+
+    def recalculate_paid(self) -> int:
+        """Recompute the paid and outstanding amounts of the invoices with a single UPDATE.
+
+        The set-based counterpart of ``Invoice.recalculate_paid()``: open invoices left with nothing outstanding are
+        marked as paid in the same statement. Returns the number of updated invoices.
+        """
+        Payment = apps.get_model("payments.Payment")  # noqa: N806
+        PaymentInvoice = Payment.invoices.through  # noqa: N806
+
+        amount: DecimalField = DecimalField(max_digits=19, decimal_places=2)
+        paid = Coalesce(
+            Subquery(
+                PaymentInvoice.objects.filter(invoice_id=OuterRef("pk"), payment__status=PaymentStatus.SUCCEEDED)
+                .order_by()
+                .values("invoice_id")
+                .annotate(total=Sum("payment__amount"))
+                .values("total"),
+                output_field=amount,
+            ),
+            Value(Decimal(0)),
+            output_field=amount,
+        )
+        outstanding = Greatest(
+            F("total_amount") - paid - F("total_credit_amount"), Value(Decimal(0)), output_field=amount
+        )
+        settled = Q(status=InvoiceStatus.OPEN, total_amount__lte=paid + F("total_credit_amount"))
+        now = timezone.now()
+        return self.update(
+            total_paid_amount=paid,
+            outstanding_amount=outstanding,
+            status=Case(When(settled, then=Value(InvoiceStatus.PAID)), default=F("status")),
+            paid_at=Case(When(settled, then=Value(now)), default=F("paid_at")),
+            updated_at=now,
+        )
+
+    def for_calculation(self):
+        """Prefetch the calculation inputs of every invoice in one round of queries.
+
+        The inputs land in ``calculation_*`` attributes read by :meth:`Invoice.calculate`, so instances
+        are meant for a single recalculation and must be reloaded after their lines or rates change.
+        """
+        InvoiceLine = apps.get_model("invoices.InvoiceLine")  # noqa: N806
+        Coupon = apps.get_model("coupons.Coupon")  # noqa: N806
+        TaxRate = apps.get_model("tax_rates.TaxRate")  # noqa: N806
+
+        return self.select_related("shipping").prefetch_related(
+            Prefetch(
+                "lines",
+                queryset=InvoiceLine.objects.for_calculation().order_by("created_at"),
+                to_attr="calculation_lines",
+            ),
+            Prefetch(
+                "coupons",
+                queryset=Coupon.objects.order_by("invoice_coupons__position"),
+                to_attr="calculation_coupons",
+            ),
+            Prefetch(
+                "tax_rates",
+                queryset=TaxRate.objects.order_by("invoice_tax_rates__position"),
+                to_attr="calculation_tax_rates",
+            ),
+            Prefetch(
+                "shipping__tax_rates",
+                queryset=TaxRate.objects.order_by("invoice_shipping_tax_rates__position"),
+                to_attr="calculation_tax_rates",
+            ),
         )
 
     def revisions(self, head_id: UUID):
@@ -97,78 +294,61 @@ class InvoiceLineQuerySet(models.QuerySet):
             Prefetch("tax_rates", queryset=TaxRate.objects.order_by("invoice_line_tax_rates__position")),
             Prefetch("invoice__coupons", queryset=Coupon.objects.order_by("invoice_coupons__position")),
             Prefetch("invoice__tax_rates", queryset=TaxRate.objects.order_by("invoice_tax_rates__position")),
-            Prefetch("discount_allocations", queryset=InvoiceDiscountAllocation.objects.annotate_position()),
-            Prefetch("tax_allocations", queryset=InvoiceTaxAllocation.objects.annotate_position()),
+            Prefetch("discount_allocations", queryset=InvoiceDiscountAllocation.objects.select_related("coupon")),
+            Prefetch("tax_allocations", queryset=InvoiceTaxAllocation.objects.select_related("tax_rate")),
         )
 
+    def for_calculation(self):
+        Coupon = apps.get_model("coupons.Coupon")  # noqa: N806
+        TaxRate = apps.get_model("tax_rates.TaxRate")  # noqa: N806
 
-class InvoiceDiscountAllocationQuerySet(models.QuerySet):
-    def annotate_position(self):
-        InvoiceLineCoupon = apps.get_model("invoices.InvoiceLineCoupon")  # noqa: N806
-        InvoiceCoupon = apps.get_model("invoices.InvoiceCoupon")  # noqa: N806
-
-        line_position = Subquery(
-            InvoiceLineCoupon.objects.filter(
-                invoice_line_id=OuterRef("invoice_line_id"),
-                coupon_id=OuterRef("coupon_id"),
-            )
-            .values("position")
-            .order_by("position")[:1]
-        )
-        invoice_position = Subquery(
-            InvoiceCoupon.objects.filter(
-                invoice_id=OuterRef("invoice_id"),
-                coupon_id=OuterRef("coupon_id"),
-            )
-            .values("position")
-            .order_by("position")[:1]
+        return self.select_related("price").prefetch_related(
+            "price__tiers",
+            Prefetch("coupons", queryset=Coupon.objects.order_by("invoice_line_coupons__position")),
+            Prefetch("tax_rates", queryset=TaxRate.objects.order_by("invoice_line_tax_rates__position")),
         )
 
-        return self.select_related("coupon").annotate(
-            position=Case(
-                When(source=InvoiceDiscountSource.LINE, then=line_position),
-                default=invoice_position,
-                output_field=IntegerField(),
-            )
-        )
 
+class AllocationQuerySet(models.QuerySet, ABC):
+    @abstractmethod
+    def allocation_key(self, allocation) -> tuple: ...
 
-class InvoiceTaxAllocationQuerySet(models.QuerySet):
-    def annotate_position(self):
-        InvoiceLineTaxRate = apps.get_model("invoices.InvoiceLineTaxRate")  # noqa: N806
-        InvoiceTaxRate = apps.get_model("invoices.InvoiceTaxRate")  # noqa: N806
-        InvoiceShippingTaxRate = apps.get_model("invoices.InvoiceShippingTaxRate")  # noqa: N806
+    def sync(self, allocations: Iterable[InvoiceDiscountAllocation | InvoiceTaxAllocation]) -> None:
+        """Make the allocations in this queryset match ``allocations`` with a minimal set of writes.
 
-        line_position = Subquery(
-            InvoiceLineTaxRate.objects.filter(
-                invoice_line_id=OuterRef("invoice_line_id"),
-                tax_rate_id=OuterRef("tax_rate_id"),
-            )
-            .values("position")
-            .order_by("position")[:1]
-        )
-        shipping_position = Subquery(
-            InvoiceShippingTaxRate.objects.filter(
-                invoice_shipping_id=OuterRef("invoice_shipping_id"),
-                tax_rate_id=OuterRef("tax_rate_id"),
-            )
-            .values("position")
-            .order_by("position")[:1]
-        )
-        invoice_position = Subquery(
-            InvoiceTaxRate.objects.filter(
-                invoice_id=OuterRef("invoice_id"),
-                tax_rate_id=OuterRef("tax_rate_id"),
-            )
-            .values("position")
-            .order_by("position")[:1]
-        )
+        Rows are matched by :meth:`allocation_key`: changed amounts and positions are updated, missing rows
+        inserted and rows without a counterpart deleted. Amounts are compared as stored, i.e. rounded to
+        cents, so unchanged rows are left untouched.
+        """
+        existing = {self.allocation_key(allocation): allocation for allocation in self}
+        to_create = []
+        to_update = []
 
-        return self.select_related("tax_rate").annotate(
-            position=Case(
-                When(source=InvoiceTaxSource.LINE, then=line_position),
-                When(source=InvoiceTaxSource.SHIPPING, then=shipping_position),
-                default=invoice_position,
-                output_field=IntegerField(),
-            )
-        )
+        for allocation in allocations:
+            current = existing.pop(self.allocation_key(allocation), None)
+            if current is None:
+                to_create.append(allocation)
+            elif (
+                current.amount.amount != allocation.amount.amount.quantize(CENT, rounding=ROUND_HALF_UP)
+                or current.position != allocation.position
+            ):
+                current.amount = allocation.amount
+                current.position = allocation.position
+                to_update.append(current)
+
+        if existing:
+            self.model.objects.filter(id__in=[allocation.id for allocation in existing.values()]).delete()
+        if to_update:
+            self.model.objects.bulk_update(to_update, fields=["currency", "amount", "position"])
+        if to_create:
+            self.model.objects.bulk_create(to_create)
+
+
+class InvoiceDiscountAllocationQuerySet(AllocationQuerySet):
+    def allocation_key(self, allocation) -> tuple:
+        return allocation.invoice_line_id, allocation.coupon_id, allocation.source
+
+
+class InvoiceTaxAllocationQuerySet(AllocationQuerySet):
+    def allocation_key(self, allocation) -> tuple:
+        return allocation.invoice_line_id, allocation.invoice_shipping_id, allocation.tax_rate_id, allocation.source
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import multiprocessing
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import batched, chain
+from uuid import UUID
+
+import structlog
+from django.db import connections, transaction
+from django.db.models import QuerySet
+
+from .choices import InvoiceStatus
+from .models import Invoice, InvoiceDiscountAllocation, InvoiceLine, InvoiceShipping, InvoiceTaxAllocation
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass(slots=True)
+class RecalculationProgress:
+    total: int
+    processed: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Invoices recalculated per second."""
+        return self.processed / self.elapsed if self.elapsed else 0.0
+
+
+def recalculate_chunk(invoice_ids: Iterable[UUID]) -> int:
+    """Recalculate a chunk of draft invoices in a single transaction and return how many were recalculated.
+
+    Inputs are prefetched for the whole chunk and the results are written with one bulk statement per
+    table, so the number of queries doesn't grow with the chunk size.
+    """
+    with transaction.atomic():
+        invoices = list(
+            Invoice.objects.filter(id__in=list(invoice_ids), status=InvoiceStatus.DRAFT)
+            .select_for_update(of=("self",))
+            .for_calculation()
+        )
+
+        changed_lines: list[InvoiceLine] = []
+        shippings = []
+        discount_allocations = []
+        tax_allocations = []
+
+        for invoice in invoices:
+            lines, calculation = invoice.calculate()
+            lines_by_id = {line.id: line for line in lines}
+
+            changed_lines.extend(
+                lines_by_id[result.id]
+                for result in calculation.lines
+                if lines_by_id[result.id].apply_calculation(result)
+            )
+            discount_allocations.extend(
+                invoice.build_discount_allocations(calculation.discount_allocations, lines_by_id)
+            )
+            tax_allocations.extend(
+                invoice.build_tax_allocations(
+                    chain(
+                        calculation.tax_allocations,
+                        calculation.shipping.tax_allocations if calculation.shipping else [],
+                    ),
+                    lines_by_id,
+                )
+            )
+
+            if invoice.shipping and calculation.shipping:
+                invoice.shipping.apply_calculation(calculation.shipping)
+                shippings.append(invoice.shipping)
+
+            invoice.apply_calculation(calculation)
+
+        # Allocation keys include the line or shipping id, so one sync covers the whole chunk
+        InvoiceDiscountAllocation.objects.filter(invoice__in=invoices).sync(discount_allocations)
+        InvoiceTaxAllocation.objects.filter(invoice__in=invoices).sync(tax_allocations)
+        InvoiceLine.objects.bulk_update(changed_lines, fields=InvoiceLine.CALCULATED_FIELDS)
+        InvoiceShipping.objects.bulk_update(shippings, fields=InvoiceShipping.CALCULATED_FIELDS)
+        Invoice.objects.bulk_update(invoices, fields=Invoice.CALCULATED_FIELDS)
+
+    return len(invoices)
+
+
+def recalculate_invoices(
+    invoices: QuerySet[Invoice],
+    chunk_size: int = 100,
+    workers: int = 1,
+    on_progress: Callable[[RecalculationProgress], None] | None = None,
+) -> RecalculationProgress:
+    """Recalculate the draft invoices of ``invoices`` in chunks of ``chunk_size``.
+
+    Each chunk is committed on its own, so a failure only rolls back the chunk it happened in. With
+    ``workers`` above one, chunks are spread over a process pool, each worker with its own connection.
+    """
+    invoice_ids = list(
+        invoices.filter(status=InvoiceStatus.DRAFT).order_by("created_at", "id").values_list("id", flat=True).distinct()
+    )
+    chunks = list(batched(invoice_ids, chunk_size))
+    progress = RecalculationProgress(total=len(invoice_ids))
+    started_at = time.perf_counter()
+
+    def report(count: int) -> None:
+        progress.processed += count
+        progress.elapsed = time.perf_counter() - started_at
+        if on_progress is not None:
+            on_progress(progress)
+
+    if workers > 1 and len(chunks) > 1:
+        # Forked workers inherit the loaded apps and open their own connections, the parent's are closed
+        # first so that no connection is shared between processes
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork")) as executor:
+            for count in executor.map(recalculate_chunk, chunks):
+                report(count)
+    else:
+        for chunk in chunks:
+            report(recalculate_chunk(chunk))
+
+    progress.elapsed = time.perf_counter() - started_at
+    logger.info(
+        "Invoices recalculated",
+        total=progress.total,
+        processed=progress.processed,
+        elapsed=round(progress.elapsed, 3),
+    )
+    return progress
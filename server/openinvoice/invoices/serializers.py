@@ -5,6 +5,7 @@ from rest_framework import serializers
 from openinvoice.accounts.fields import BusinessProfileRelatedField
 from openinvoice.accounts.serializers import BusinessProfileSerializer
 from openinvoice.core.fields import CurrencyField, LanguageField, MetadataField
+from openinvoice.core.serializers import SelectableFieldsMixin
 from openinvoice.core.validators import AllOrNoneValidator, AtMostOneValidator
 from openinvoice.coupons.fields import CouponRelatedField
 from openinvoice.coupons.serializers import CouponSerializer
@@ -16,6 +17,7 @@ from openinvoice.numbering_systems.choices import NumberingSystemAppliesTo
 from openinvoice.numbering_systems.fields import NumberingSystemRelatedField
 from openinvoice.prices.fields import PriceRelatedField
 from openinvoice.prices.validators import PriceIsActive, PriceProductIsActive
+from openinvoice.rendering.choices import RenderStatus
 from openinvoice.shipping_rates.fields import ShippingRateRelatedField
 from openinvoice.tax_rates.fields import TaxRateRelatedField
 from openinvoice.tax_rates.serializers import TaxRateSerializer
@@ -89,11 +91,12 @@ class InvoiceDocumentSerializer(serializers.Serializer):
     memo = serializers.CharField(allow_null=True)
     custom_fields = MetadataField()
     url = serializers.URLField(source="file.data.url", allow_null=True, read_only=True)
+    status = serializers.ChoiceField(choices=RenderStatus.choices, allow_null=True, read_only=True)
     created_at = serializers.DateTimeField()
     updated_at = serializers.DateTimeField(allow_null=True)
 
 
-class InvoiceSerializer(serializers.Serializer):
+class InvoiceSerializer(SelectableFieldsMixin, serializers.Serializer):
     id = serializers.UUIDField()
     customer_id = serializers.UUIDField()
     status = serializers.ChoiceField(choices=InvoiceStatus.choices)
@@ -12,11 +12,9 @@ class AutomaticDeliveryMethodValidator:
     requires_context = True
 
     def __call__(self, value, serializer):
-        account = serializer.context["request"].account
+        plan = serializer.context["request"].plan
 
-        if value == InvoiceDeliveryMethod.AUTOMATIC and not has_feature(
-            account, FeatureCode.AUTOMATIC_INVOICE_DELIVERY
-        ):
+        if value == InvoiceDeliveryMethod.AUTOMATIC and not has_feature(plan, FeatureCode.AUTOMATIC_INVOICE_DELIVERY):
             raise serializers.ValidationError(self.message)
 
         return value
@@ -1,5 +1,10 @@
+import hashlib
+
 import structlog
 from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
 from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
 from rest_framework import generics, status
 from rest_framework.exceptions import NotFound, ValidationError
@@ -13,11 +18,9 @@ from openinvoice.comments.models import Comment
 from openinvoice.comments.serializers import CommentCreateSerializer, CommentSerializer
 from openinvoice.core.utils import numeric_overflow
 
-from .choices import InvoiceDeliveryMethod, InvoicePreviewFormat, InvoiceStatus
+from .choices import InvoicePreviewFormat, InvoiceStatus
 from .filtersets import InvoiceFilterSet
-from .mail import send_invoice
 from .models import Invoice, InvoiceDocument, InvoiceLine
-from .pdf import render_invoice_documents
 from .permissions import MaxInvoicesLimit
 from .serializers import (
     InvoiceCreateSerializer,
@@ -35,7 +38,18 @@ from .serializers import (
 logger = structlog.get_logger(__name__)
 
 
-@extend_schema_view(list=extend_schema(operation_id="list_invoices"))
+@extend_schema_view(
+    list=extend_schema(
+        operation_id="list_invoices",
+        parameters=[
+            OpenApiParameter(
+                name="fields",
+                type=str,
+                description="Comma separated invoice fields to return instead of the full invoice",
+            ),
+        ],
+    )
+)
 class InvoiceListCreateAPIView(generics.ListAPIView):
     queryset = Invoice.objects.none()
     serializer_class = InvoiceSerializer
@@ -50,7 +64,20 @@ class InvoiceListCreateAPIView(generics.ListAPIView):
     permission_classes = [IsAuthenticated, IsAccountMember, MaxInvoicesLimit]
 
     def get_queryset(self):
-        return Invoice.objects.for_account(self.request.account).eager_load()
+        return (
+            Invoice.objects.for_account(self.request.account)
+            .with_projected_numbers()
+            .eager_load(fields=self.get_requested_fields())
+        )
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.request.method == "GET":
+            context["fields"] = self.get_requested_fields()
+        return context
+
+    def get_requested_fields(self) -> list[str] | None:
+        return InvoiceSerializer.parse_fields(self.request.query_params.get("fields"))
 
     @extend_schema(
         operation_id="create_invoice",
@@ -118,6 +145,36 @@ class InvoiceRetrieveUpdateDestroyAPIView(generics.RetrieveAPIView):
     def get_queryset(self):
         return Invoice.objects.for_account(self.request.account).eager_load()
 
+    def retrieve(self, request, *args, **kwargs):
+        # Drafts render live profiles, rates and projected numbers, so only finalized invoices are versioned
+        version = (
+            Invoice.objects.for_account(request.account)
+            .exclude(status=InvoiceStatus.DRAFT)
+            .filter(id=kwargs["pk"])
+            .with_version()
+            .values("version", "document_count")
+            .first()
+        )
+        if version is None or version["version"] is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        digest = hashlib.sha256(f"{kwargs['pk']}:{version['version'].isoformat()}:{version['document_count']}".encode())
+        etag = quote_etag(digest.hexdigest()[:32])
+        last_modified = int(version["version"].timestamp())
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            cache_key = f"invoices:{kwargs['pk']}:{etag}"
+            data = cache.get(cache_key)
+            if data is None:
+                data = self.get_serializer(self.get_object()).data
+                cache.set(cache_key, data, timeout=settings.INVOICE_CACHE_TIMEOUT)
+            response = Response(data)
+
+        response.headers["ETag"] = etag
+        response.headers["Last-Modified"] = http_date(last_modified)
+        return response
+
     @extend_schema(
         operation_id="update_invoice",
         request=InvoiceUpdateSerializer,
@@ -382,15 +439,6 @@ class InvoiceFinalizeAPIView(generics.GenericAPIView):
             raise ValidationError("Invoice number or numbering system is missing")
 
         invoice.finalize()
-        render_invoice_documents(invoice)
-
-        if invoice.delivery_method == InvoiceDeliveryMethod.AUTOMATIC and len(invoice.recipients) > 0:
-            send_invoice(invoice=invoice)
-            logger.info(
-                "Invoice delivered automatically",
-                invoice_id=invoice.id,
-                recipients=invoice.recipients,
-            )
 
         logger.info("Invoice finalized", invoice_id=invoice.id)
         invoice = self.get_object()
@@ -632,7 +680,7 @@ class InvoiceLineCreateAPIView(generics.GenericAPIView):
             invoice_line.set_tax_rates(data["tax_rates"])
 
         with numeric_overflow():
-            invoice.recalculate()
+            invoice.recalculate_line(invoice_line.id)
 
         invoice_line.refresh_from_db()
 
@@ -684,7 +732,7 @@ class InvoiceLineUpdateDestroyAPIView(generics.GenericAPIView):
             invoice_line.set_tax_rates(data["tax_rates"])
 
         with numeric_overflow():
-            invoice.recalculate()
+            invoice.recalculate_line(invoice_line.id)
 
         logger.info(
             "Invoice line updated",
@@ -710,7 +758,7 @@ class InvoiceLineUpdateDestroyAPIView(generics.GenericAPIView):
         invoice_line.delete()
 
         with numeric_overflow():
-            invoice.recalculate()
+            invoice.recalculate_line(pk)
 
         logger.info("Invoice line deleted", invoice_line_id=pk, invoice_id=invoice.id)
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -1,10 +1,17 @@
+from __future__ import annotations
+
 import uuid
+from datetime import datetime
+from typing import TYPE_CHECKING
 
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
 
 from .choices import NumberingSystemAppliesTo, NumberingSystemResetInterval, NumberingSystemStatus
 
+if TYPE_CHECKING:
+    from .models import NumberingSequence, NumberingSystem
+
 
 class NumberingSystemManager(models.Manager):
     def create_numbering_system(
@@ -41,3 +48,37 @@ class NumberingSystemManager(models.Manager):
             applies_to=NumberingSystemAppliesTo.CREDIT_NOTE,
             reset_interval=NumberingSystemResetInterval.NEVER,
         )
+
+
+class NumberingSequenceManager(models.Manager["NumberingSequence"]):
+    def allocate(self, numbering_system: NumberingSystem, effective_at: datetime) -> int:
+        """Reserve the next number of the period containing ``effective_at`` and return how many came before it.
+
+        The sequence row is locked until the surrounding transaction ends, so concurrent allocations queue up
+        instead of handing out the same number. A period's sequence is seeded from its numbered documents the
+        first time it's used.
+        """
+        start_at, end_at = numbering_system.calculate_bounds(effective_at=effective_at)
+        sequence: NumberingSequence
+        with transaction.atomic():
+            sequence, _ = self.select_for_update().get_or_create(
+                numbering_system=numbering_system,
+                period_start=start_at,
+                defaults={"last_value": lambda: numbering_system.count_numbered_documents(start_at, end_at)},
+            )
+            count = sequence.last_value
+            sequence.last_value += 1
+            sequence.save(update_fields=["last_value", "updated_at"])
+        return count
+
+    def peek(self, numbering_system: NumberingSystem, effective_at: datetime) -> int:
+        """Return how many numbers the period containing ``effective_at`` has used, without reserving one."""
+        start_at, end_at = numbering_system.calculate_bounds(effective_at=effective_at)
+        last_value = (
+            self.filter(numbering_system=numbering_system, period_start=start_at)
+            .values_list("last_value", flat=True)
+            .first()
+        )
+        if last_value is None:
+            return numbering_system.count_numbered_documents(start_at, end_at)
+        return last_value
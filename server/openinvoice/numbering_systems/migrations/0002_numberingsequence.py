@@ -0,0 +1,42 @@
+# Generated by Django 5.2 on 2026-10-17 05:52
+
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("numbering_systems", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NumberingSequence",
+            fields=[
+                ("id", models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ("period_start", models.DateTimeField(null=True)),
+                ("last_value", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "numbering_system",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="sequences",
+                        to="numbering_systems.numberingsystem",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("numbering_system", "period_start"),
+                        name="unique_numbering_sequence_period",
+                        nulls_distinct=False,
+                    )
+                ],
+            },
+        ),
+    ]
@@ -1,14 +1,19 @@
 from __future__ import annotations
 
 import uuid
-from datetime import datetime, time, timedelta
+from datetime import datetime
 
 from django.db import models
 from django.utils import timezone
 
+from openinvoice.credit_notes.choices import CreditNoteStatus
+from openinvoice.invoices.choices import InvoiceStatus
+from openinvoice.quotes.choices import QuoteStatus
+
 from .choices import NumberingSystemAppliesTo, NumberingSystemResetInterval, NumberingSystemStatus
 from .formatting import render_template
-from .managers import NumberingSystemManager
+from .managers import NumberingSequenceManager, NumberingSystemManager
+from .periods import calculate_period_bounds
 from .querysets import NumberingSystemQuerySet
 
 # TODO: implement uniqueness maintenance
@@ -64,6 +69,40 @@ class NumberingSystem(models.Model):
     def render_number(self, count: int, effective_at: datetime) -> str:
         return render_template(template=self.template, count=count, effective_at=effective_at)
 
+    def allocate_number(self, effective_at: datetime) -> str:
+        count = NumberingSequence.objects.allocate(self, effective_at=effective_at)
+        return self.render_number(count=count, effective_at=effective_at)
+
+    def project_number(self, effective_at: datetime, offset: int = 0, count: int | None = None) -> str:
+        """Render the number the ``offset``-th next document would get, without reserving it.
+
+        ``count`` is the count of the current period's sequence when it's already known.
+        """
+        if count is None:
+            count = NumberingSequence.objects.peek(self, effective_at=effective_at)
+        return self.render_number(count=count + offset, effective_at=effective_at)
+
+    def count_numbered_documents(self, start_at: datetime | None, end_at: datetime | None) -> int:
+        documents: models.QuerySet
+        match self.applies_to:
+            case NumberingSystemAppliesTo.INVOICE:
+                documents = self.invoices.exclude(status=InvoiceStatus.DRAFT)
+                date_field = "opened_at"
+            case NumberingSystemAppliesTo.CREDIT_NOTE:
+                documents = self.credit_notes.exclude(status=CreditNoteStatus.DRAFT)
+                date_field = "issued_at"
+            case NumberingSystemAppliesTo.QUOTE:
+                documents = self.quotes.exclude(status=QuoteStatus.DRAFT)
+                date_field = "opened_at"
+            case _:
+                return 0
+
+        if start_at:
+            documents = documents.filter(**{f"{date_field}__gte": start_at})
+        if end_at:
+            documents = documents.filter(**{f"{date_field}__lt": end_at})
+        return documents.count()
+
     def archive(self) -> None:
         if self.status == NumberingSystemStatus.ARCHIVED:
             return
@@ -81,37 +120,26 @@ class NumberingSystem(models.Model):
         self.save()
 
     def calculate_bounds(self, effective_at: datetime) -> tuple[datetime | None, datetime | None]:
-        now = timezone.localtime(effective_at)
-        tz = now.tzinfo
-
-        match self.reset_interval:
-            case NumberingSystemResetInterval.NEVER:
-                return None, None
-            case NumberingSystemResetInterval.WEEKLY:
-                delta_days = now.weekday() % 7
-                start_date = now.date() - timedelta(days=delta_days)
-                start = datetime.combine(start_date, time.min, tzinfo=tz)
-                end = start + timedelta(days=7)
-                return start, end
-            case NumberingSystemResetInterval.MONTHLY:
-                start = datetime(now.year, now.month, 1, tzinfo=tz)
-                if now.month == 12:
-                    end = datetime(now.year + 1, 1, 1, tzinfo=tz)
-                else:
-                    end = datetime(now.year, now.month + 1, 1, tzinfo=tz)
-                return start, end
-            case NumberingSystemResetInterval.QUARTERLY:
-                quarter = (now.month - 1) // 3 + 1
-                start_month = 3 * (quarter - 1) + 1
-                start = datetime(now.year, start_month, 1, tzinfo=tz)
-                if start_month == 10:
-                    end = datetime(now.year + 1, 1, 1, tzinfo=tz)
-                else:
-                    end = datetime(now.year, start_month + 3, 1, tzinfo=tz)
-                return start, end
-            case NumberingSystemResetInterval.YEARLY:
-                start = datetime(now.year, 1, 1, tzinfo=tz)
-                end = datetime(now.year + 1, 1, 1, tzinfo=tz)
-                return start, end
-            case _:
-                return None, None
+        return calculate_period_bounds(self.reset_interval, effective_at=effective_at)
+
+
+class NumberingSequence(models.Model):
+    """Numbers used by a numbering system in one reset period, ``period_start`` is null if it never resets."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    numbering_system = models.ForeignKey(NumberingSystem, on_delete=models.CASCADE, related_name="sequences")
+    period_start = models.DateTimeField(null=True)
+    last_value = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = NumberingSequenceManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["numbering_system", "period_start"],
+                nulls_distinct=False,
+                name="unique_numbering_sequence_period",
+            )
+        ]
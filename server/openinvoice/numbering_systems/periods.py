@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+
+from .choices import NumberingSystemResetInterval
+
+
+def calculate_period_bounds(
+    reset_interval: NumberingSystemResetInterval | str,
+    effective_at: datetime,
+) -> tuple[datetime | None, datetime | None]:
+    """Return the start and end of the reset period containing ``effective_at``, None if it never resets."""
+    now = timezone.localtime(effective_at)
+    tz = now.tzinfo
+
+    match reset_interval:
+        case NumberingSystemResetInterval.NEVER:
+            return None, None
+        case NumberingSystemResetInterval.WEEKLY:
+            delta_days = now.weekday() % 7
+            start_date = now.date() - timedelta(days=delta_days)
+            start = datetime.combine(start_date, time.min, tzinfo=tz)
+            end = start + timedelta(days=7)
+            return start, end
+        case NumberingSystemResetInterval.MONTHLY:
+            start = datetime(now.year, now.month, 1, tzinfo=tz)
+            if now.month == 12:
+                end = datetime(now.year + 1, 1, 1, tzinfo=tz)
+            else:
+                end = datetime(now.year, now.month + 1, 1, tzinfo=tz)
+            return start, end
+        case NumberingSystemResetInterval.QUARTERLY:
+            quarter = (now.month - 1) // 3 + 1
+            start_month = 3 * (quarter - 1) + 1
+            start = datetime(now.year, start_month, 1, tzinfo=tz)
+            if start_month == 10:
+                end = datetime(now.year + 1, 1, 1, tzinfo=tz)
+            else:
+                end = datetime(now.year, start_month + 3, 1, tzinfo=tz)
+            return start, end
+        case NumberingSystemResetInterval.YEARLY:
+            start = datetime(now.year, 1, 1, tzinfo=tz)
+            end = datetime(now.year + 1, 1, 1, tzinfo=tz)
+            return start, end
+        case _:
+            return None, None
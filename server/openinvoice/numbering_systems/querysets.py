@@ -2,12 +2,19 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from django.apps import apps
 from django.db import models
+from django.db.models import Count, F, OuterRef, Q, Subquery, Value, Window
+from django.db.models.functions import Coalesce, RowNumber
+from django.db.models.sql.constants import LOUTER
+from django.utils import timezone
+from django_cte import CTE, with_cte
 
 if TYPE_CHECKING:
     from openinvoice.accounts.models import Account
 
-from .choices import NumberingSystemAppliesTo
+from .choices import NumberingSystemAppliesTo, NumberingSystemResetInterval
+from .periods import calculate_period_bounds
 
 
 class NumberingSystemQuerySet(models.QuerySet):
@@ -16,3 +23,82 @@ class NumberingSystemQuerySet(models.QuerySet):
 
     def for_applies_to(self, applies_to: NumberingSystemAppliesTo):
         return self.filter(applies_to=applies_to)
+
+
+def annotate_projected_numbers(queryset: models.QuerySet, draft_status: str, numbered_at: str) -> models.QuerySet:
+    """Annotate documents with what their draft number projection needs, for the whole queryset at once.
+
+    ``projected_draft_offset`` ranks each draft among the drafts of its numbering system created in the current
+    reset period with ``ROW_NUMBER``, and ``projected_sequence_count`` is the count of that period's sequence.
+    Periods without a sequence yet fall back to the count of documents numbered in them (by their
+    ``numbered_at`` field), like ``NumberingSequence.objects.peek``, counted once per numbering system.
+    """
+    NumberingSequence = apps.get_model("numbering_systems", "NumberingSequence")
+
+    def period_filter(field: str, start_at, end_at) -> Q:
+        condition = Q()
+        if start_at:
+            condition &= Q(**{f"{field}__gte": start_at})
+        if end_at:
+            condition &= Q(**{f"{field}__lt": end_at})
+        return condition
+
+    effective_at = timezone.now()
+    in_period = Q()
+    numbered_in_period = Q()
+    current_sequence = Q()
+    for reset_interval in NumberingSystemResetInterval:
+        start_at, end_at = calculate_period_bounds(reset_interval, effective_at=effective_at)
+        condition = Q(numbering_system__reset_interval=reset_interval)
+        in_period |= condition & period_filter("created_at", start_at, end_at)
+        numbered_in_period |= condition & period_filter(numbered_at, start_at, end_at)
+        current_sequence |= Q(numbering_system__reset_interval=reset_interval, period_start=start_at)
+
+    drafts = CTE(
+        queryset.model.objects.filter(
+            in_period,
+            status=draft_status,
+            numbering_system__in=queryset.values("numbering_system_id"),
+        )
+        .annotate(
+            draft_offset=Window(
+                RowNumber(),
+                partition_by=F("numbering_system_id"),
+                order_by=[F("created_at").asc(), F("id").asc()],
+            )
+            - 1
+        )
+        .values("id", "draft_offset"),
+        name="projected_drafts",
+    )
+    numbered = CTE(
+        queryset.model.objects.filter(
+            numbered_in_period,
+            numbering_system__in=queryset.values("numbering_system_id"),
+        )
+        .exclude(status=draft_status)
+        .order_by()
+        .values("numbering_system_id")
+        .annotate(numbered_count=Count("id")),
+        name="projected_numbered",
+    )
+    sequence_count = NumberingSequence.objects.filter(
+        current_sequence,
+        numbering_system_id=OuterRef("numbering_system_id"),
+    ).values("last_value")[:1]
+
+    numbered_count = (
+        numbered.queryset()
+        .filter(numbering_system_id=OuterRef("numbering_system_id"))
+        .order_by()
+        .values("numbered_count")[:1]
+    )
+
+    return with_cte(
+        drafts,
+        numbered,
+        select=drafts.join(queryset, id=drafts.col.id, _join_type=LOUTER).annotate(
+            projected_draft_offset=drafts.col.draft_offset,
+            projected_sequence_count=Coalesce(Subquery(sequence_count), Subquery(numbered_count), Value(0)),
+        ),
+    )
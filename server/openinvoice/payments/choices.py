@@ -4,5 +4,12 @@ from django.db import models
 class PaymentStatus(models.TextChoices):
     SUCCEEDED = "succeeded", "Succeeded"
     PENDING = "pending", "Pending"
+    PENDING_CHECKOUT = "pending_checkout", "Pending checkout"
     FAILED = "failed", "Failed"
     REJECTED = "rejected", "Rejected"
+
+
+class ReconciliationStatus(models.TextChoices):
+    RECORDED = "recorded", "Recorded"
+    DUPLICATE = "duplicate", "Duplicate"
+    REJECTED = "rejected", "Rejected"
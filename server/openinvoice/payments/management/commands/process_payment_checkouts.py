@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from openinvoice.payments.choices import PaymentStatus
+from openinvoice.payments.models import Payment
+
+
+class Command(BaseCommand):
+    help = "Create the provider checkout sessions of queued payments."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Exit once no payment is due instead of polling")
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds to wait when idle")
+
+    def handle(self, *_, **options):
+        while True:
+            payment = Payment.objects.process_next_checkout()
+
+            if payment is None:
+                if options["once"]:
+                    return
+                # Drop connections that went stale while idle, like a request boundary would
+                close_old_connections()
+                time.sleep(options["poll_interval"])
+                continue
+
+            if payment.status == PaymentStatus.PENDING:
+                self.stdout.write(f"Created checkout {payment.transaction_id} for payment {payment.id}")
+            else:
+                self.stderr.write(
+                    f"Failed to create checkout for payment {payment.id} "
+                    f"(attempt {payment.checkout_attempts}): {payment.message}"
+                )
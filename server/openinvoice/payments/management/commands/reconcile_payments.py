@@ -0,0 +1,73 @@
+import csv
+from collections import Counter
+from decimal import Decimal, InvalidOperation
+from itertools import batched
+from pathlib import Path
+from uuid import UUID
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from openinvoice.accounts.models import Account
+from openinvoice.payments.choices import ReconciliationStatus
+from openinvoice.payments.reconciliation import PaymentRow, reconcile_payments
+
+
+class Command(BaseCommand):
+    help = (
+        "Record the payments of a CSV bank statement with invoice_id, amount, transaction_id and received_at columns."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("account", help="ID of the account the invoices belong to")
+        parser.add_argument("path", help="Path to the CSV file")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows per transaction")
+
+    def handle(self, *_, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive")
+
+        try:
+            account = Account.objects.get(id=options["account"])
+        except (Account.DoesNotExist, ValueError) as e:
+            raise CommandError(f"Account {options['account']} not found") from e
+
+        with Path(options["path"]).open(newline="") as file:
+            rows = [self.parse_row(line, record) for line, record in enumerate(csv.DictReader(file), start=2)]
+
+        totals: Counter[str] = Counter()
+        offset = 0
+        for batch in batched(rows, options["batch_size"]):
+            for result in reconcile_payments(account, batch):
+                totals[result.status] += 1
+                if result.status == ReconciliationStatus.REJECTED:
+                    # Line numbers count the header, like the ones reported for invalid rows
+                    self.stderr.write(f"Line {offset + result.index + 2}: {result.error}")
+            offset += len(batch)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Recorded {totals[ReconciliationStatus.RECORDED]} payments, "
+                f"skipped {totals[ReconciliationStatus.DUPLICATE]} duplicates and "
+                f"rejected {totals[ReconciliationStatus.REJECTED]} rows"
+            )
+        )
+
+    def parse_row(self, line: int, record: dict[str, str]) -> PaymentRow:
+        try:
+            received_at = None
+            if record.get("received_at"):
+                received_at = parse_datetime(record["received_at"])
+                if received_at is None:
+                    raise ValueError(f"Invalid received_at: {record['received_at']}")
+                if timezone.is_naive(received_at):
+                    received_at = timezone.make_aware(received_at)
+            return PaymentRow(
+                invoice_id=UUID(record["invoice_id"]),
+                amount=Decimal(record["amount"]),
+                transaction_id=record["transaction_id"],
+                received_at=received_at,
+            )
+        except (KeyError, ValueError, InvalidOperation) as e:
+            raise CommandError(f"Line {line}: invalid row ({e!r})") from e
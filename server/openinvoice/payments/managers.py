@@ -1,19 +1,22 @@
 from datetime import datetime
 from typing import TYPE_CHECKING, cast
 
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
 from django.utils import timezone
+from django.utils.module_loading import import_string
 from djmoney.money import Money
 
-from openinvoice.integrations.base import get_payment_integration
-from openinvoice.integrations.exceptions import IntegrationError
-
 from .choices import PaymentStatus
 
 if TYPE_CHECKING:
     from openinvoice.invoices.models import Invoice
 
     from .models import Payment
+    from .querysets import PaymentQuerySet
+
+# Called with the id of each invoice of a payment whose queued checkout succeeded or failed for good
+CHECKOUT_SETTLED_HANDLER = "openinvoice.invoices.pdf.deliver_checked_out_invoice"
 
 
 class PaymentManager(models.Manager):
@@ -41,28 +44,51 @@ class PaymentManager(models.Manager):
         return payment
 
     def checkout_invoice(self, invoice: "Invoice") -> "Payment":
-        backend = get_payment_integration(cast(str, invoice.payment_provider))
-        payment = self.create(
-            account=invoice.account,
-            status=PaymentStatus.PENDING,
-            amount=invoice.total_amount,
-            currency=invoice.currency,
-            description=invoice.number,
-            provider=invoice.payment_provider,
-            connection_id=invoice.payment_connection_id,
-        )
-
-        try:
-            transaction_id, checkout_url = backend.checkout(invoice=invoice, payment_id=payment.id)
-        except IntegrationError as e:
-            payment.fail(message=str(e), extra_data={}, received_at=timezone.now())
-            payment.invoices.add(invoice)
-            # TODO: refine this behavior, do we actually want to silently fail?
-            return payment
+        """Queue a payment of ``invoice`` through its payment provider.
 
-        payment.transaction_id = transaction_id
-        payment.url = checkout_url
-        payment.save(update_fields=["transaction_id", "url"])
+        The payment waits in ``pending_checkout`` until a worker creates the provider's checkout session, which only
+        happens once the caller's transaction commits. With ``PAYMENT_CHECKOUT_ASYNC`` disabled the session is
+        created right away instead.
+        """
+        payment = cast(
+            "Payment",
+            self.create(
+                account=invoice.account,
+                status=PaymentStatus.PENDING_CHECKOUT,
+                amount=invoice.total_amount,
+                currency=invoice.currency,
+                description=invoice.number,
+                provider=invoice.payment_provider,
+                connection_id=invoice.payment_connection_id,
+                checkout_after=timezone.now(),
+            ),
+        )
         payment.invoices.add(invoice)
 
+        if not settings.PAYMENT_CHECKOUT_ASYNC:
+            payment.process_checkout()
         return payment
+
+    def process_next_checkout(self) -> "Payment | None":
+        """Claim the next payment due for checkout and create its session, return ``None`` when there is none.
+
+        The payment stays locked during the provider call, so concurrent workers skip it. Automatic delivery of the
+        invoice waits for the checkout link, so it's sent from here once the checkout is settled either way.
+        """
+
+        with transaction.atomic():
+            payment = (
+                cast("PaymentQuerySet", self.get_queryset())
+                .checkout_due()
+                .select_for_update(skip_locked=True)
+                .order_by("checkout_after")
+                .first()
+            )
+            if payment is None:
+                return None
+
+            payment.process_checkout()
+            if payment.status != PaymentStatus.PENDING_CHECKOUT:
+                for invoice_id in payment.invoices.values_list("id", flat=True):
+                    import_string(CHECKOUT_SETTLED_HANDLER)(invoice_id)
+            return payment
@@ -0,0 +1,46 @@
+# Generated by Django 5.2 on 2026-10-17 07:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0004_account_tax_ids"),
+        ("invoices", "0005_allocation_position"),
+        ("payments", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="payment",
+            name="checkout_after",
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AddField(
+            model_name="payment",
+            name="checkout_attempts",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name="payment",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("succeeded", "Succeeded"),
+                    ("pending", "Pending"),
+                    ("pending_checkout", "Pending checkout"),
+                    ("failed", "Failed"),
+                    ("rejected", "Rejected"),
+                ],
+                max_length=50,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="payment",
+            index=models.Index(
+                condition=models.Q(("status", "pending_checkout")),
+                fields=["checkout_after"],
+                name="payment_pending_checkout_idx",
+            ),
+        ),
+    ]
@@ -1,19 +1,33 @@
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import cast
 
-from django.db import models
+import structlog
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Q
 from django.utils import timezone
 from djmoney import settings as djmoney_settings
 from djmoney.models.fields import MoneyField
 
+from openinvoice.integrations.base import get_payment_integration
 from openinvoice.integrations.choices import PaymentProvider
+from openinvoice.integrations.exceptions import IntegrationConnectionError
 
 from .choices import PaymentStatus
 from .managers import PaymentManager
 from .querysets import PaymentQuerySet
 
+logger = structlog.get_logger(__name__)
+
 
 class Payment(models.Model):
+    # Statuses a payment may move to from its current one, anything else is a stale or repeated update
+    TRANSITIONS = {
+        PaymentStatus.PENDING_CHECKOUT: {PaymentStatus.PENDING, PaymentStatus.FAILED},
+        PaymentStatus.PENDING: {PaymentStatus.SUCCEEDED, PaymentStatus.FAILED, PaymentStatus.REJECTED},
+    }
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     account = models.ForeignKey("accounts.Account", related_name="payments", on_delete=models.CASCADE)
     status = models.CharField(max_length=50, choices=PaymentStatus.choices)
@@ -28,14 +42,68 @@ class Payment(models.Model):
     connection_id = models.UUIDField(null=True)
     invoices = models.ManyToManyField("invoices.Invoice", related_name="payments")
     received_at = models.DateTimeField(default=timezone.now)
+    checkout_attempts = models.PositiveIntegerField(default=0)
+    checkout_after = models.DateTimeField(null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     objects = PaymentManager.from_queryset(PaymentQuerySet)()
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["checkout_after"],
+                name="payment_pending_checkout_idx",
+                condition=Q(status=PaymentStatus.PENDING_CHECKOUT),
+            ),
+        ]
+
+    def can_transition(self, status: PaymentStatus) -> bool:
+        return status in self.TRANSITIONS.get(PaymentStatus(self.status), set())
+
+    def create_checkout(self) -> None:
+        """Create the provider's checkout session and make the payment pending on the customer."""
+        backend = get_payment_integration(cast(str, self.provider))
+        transaction_id, checkout_url = backend.checkout(invoice=self.invoices.get(), payment_id=self.id)
+
+        self.status = PaymentStatus.PENDING
+        self.transaction_id = transaction_id
+        self.url = checkout_url
+        self.message = None
+        self.checkout_attempts += 1
+        self.save(update_fields=["status", "transaction_id", "url", "message", "checkout_attempts"])
+
+    def process_checkout(self) -> None:
+        """Create the checkout session, scheduling a retry with exponential backoff when it fails."""
+        try:
+            with transaction.atomic():
+                self.create_checkout()
+        except Exception as exc:
+            logger.exception("Payment checkout failed", payment_id=str(self.id), attempt=self.checkout_attempts + 1)
+            self.fail_checkout(exc)
+        else:
+            logger.info("Payment checkout created", payment_id=str(self.id), transaction_id=self.transaction_id)
+
+    def fail_checkout(self, exc: Exception) -> None:
+        self.checkout_attempts += 1
+
+        # A missing connection won't come back by retrying
+        if (
+            isinstance(exc, IntegrationConnectionError)
+            or self.checkout_attempts >= settings.PAYMENT_CHECKOUT_MAX_ATTEMPTS
+        ):
+            self.fail(message=str(exc), extra_data={}, received_at=timezone.now())
+            return
+
+        delay = settings.PAYMENT_CHECKOUT_RETRY_DELAY * 2 ** (self.checkout_attempts - 1)
+        self.message = str(exc)
+        self.checkout_after = timezone.now() + timedelta(seconds=delay)
+        self.save(update_fields=["message", "checkout_attempts", "checkout_after"])
+
+    def complete(self, extra_data: dict, received_at: datetime) -> bool:
+        if not self.can_transition(PaymentStatus.SUCCEEDED):
+            return False
 
-    def complete(self, extra_data: dict, received_at: datetime) -> None:
         self.status = PaymentStatus.SUCCEEDED
         self.message = None
         self.extra_data = extra_data
@@ -46,18 +114,28 @@ class Payment(models.Model):
         for invoice in self.invoices.all():
             invoice.recalculate_paid()
 
-    def fail(self, message: str, extra_data: dict, received_at: datetime) -> None:
+        return True
+
+    def fail(self, message: str, extra_data: dict, received_at: datetime) -> bool:
+        if not self.can_transition(PaymentStatus.FAILED):
+            return False
+
         self.status = PaymentStatus.FAILED
         self.message = message
         self.extra_data = extra_data
         self.received_at = received_at
 
         self.save()
+        return True
+
+    def reject(self, message: str, extra_data: dict, received_at: datetime) -> bool:
+        if not self.can_transition(PaymentStatus.REJECTED):
+            return False
 
-    def reject(self, message: str, extra_data: dict, received_at: datetime) -> None:
         self.status = PaymentStatus.REJECTED
         self.message = message
         self.extra_data = extra_data
         self.received_at = received_at
 
         self.save()
+        return True
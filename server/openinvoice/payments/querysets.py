@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from django.db import models
+from django.utils import timezone
 
 from .choices import PaymentStatus
 
@@ -16,3 +17,6 @@ class PaymentQuerySet(models.QuerySet):
 
     def succeeded(self):
         return self.filter(status=PaymentStatus.SUCCEEDED)
+
+    def checkout_due(self):
+        return self.filter(status=PaymentStatus.PENDING_CHECKOUT, checkout_after__lte=timezone.now())
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from django.db import transaction
+from django.utils import timezone
+
+from openinvoice.invoices.choices import InvoiceStatus
+from openinvoice.invoices.models import Invoice
+
+from .choices import PaymentStatus, ReconciliationStatus
+from .models import Payment
+
+if TYPE_CHECKING:
+    from openinvoice.accounts.models import Account
+
+
+@dataclass(frozen=True)
+class PaymentRow:
+    invoice_id: UUID
+    amount: Decimal
+    transaction_id: str
+    received_at: datetime | None = None
+
+
+@dataclass(frozen=True)
+class ReconciliationResult:
+    index: int
+    status: ReconciliationStatus
+    payment_id: UUID | None = None
+    error: str | None = None
+
+
+def get_row_error(row: PaymentRow, invoice: Invoice | None, outstanding: dict[UUID, Decimal]) -> str | None:
+    if invoice is None:
+        return "Invoice not found"
+    if invoice.status != InvoiceStatus.OPEN:
+        return f"Cannot record payment for invoice in status {invoice.status}"
+    if row.amount <= 0:
+        return "Payment amount must be positive"
+    if row.amount > outstanding[invoice.id]:
+        return "Payment amount exceeds outstanding amount"
+    return None
+
+
+def reconcile_payments(account: Account, rows: Sequence[PaymentRow]) -> list[ReconciliationResult]:
+    """Record a batch of received payments against the account's invoices and return one result per row.
+
+    Rows are checked like a single recorded payment, against what's left outstanding after the rows before them, and
+    rows whose transaction was already recorded for the invoice are reported as duplicates. Accepted rows are
+    inserted with one bulk statement per table and the affected invoices are updated with one set-based UPDATE, so
+    the number of queries doesn't grow with the batch.
+    """
+    with transaction.atomic():
+        invoices = (
+            Invoice.objects.for_account(account)
+            .filter(id__in={row.invoice_id for row in rows})
+            .select_for_update()
+            .in_bulk()
+        )
+        recorded = set(
+            Payment.invoices.through.objects.filter(
+                invoice_id__in=invoices,
+                payment__transaction_id__in={row.transaction_id for row in rows},
+            ).values_list("invoice_id", "payment__transaction_id")
+        )
+        outstanding = {invoice.id: invoice.outstanding_amount.amount for invoice in invoices.values()}
+
+        results = []
+        payments = []
+        links = []
+        for index, row in enumerate(rows):
+            key = (row.invoice_id, row.transaction_id)
+            if key in recorded:
+                results.append(ReconciliationResult(index=index, status=ReconciliationStatus.DUPLICATE))
+                continue
+
+            invoice = invoices.get(row.invoice_id)
+            error = get_row_error(row, invoice, outstanding)
+            if invoice is None or error is not None:
+                results.append(ReconciliationResult(index=index, status=ReconciliationStatus.REJECTED, error=error))
+                continue
+
+            payment = Payment(
+                account=account,
+                status=PaymentStatus.SUCCEEDED,
+                amount=row.amount,
+                currency=invoice.currency,
+                transaction_id=row.transaction_id,
+                received_at=row.received_at or timezone.now(),
+            )
+            payments.append(payment)
+            links.append(Payment.invoices.through(payment_id=payment.id, invoice_id=invoice.id))
+            outstanding[invoice.id] -= row.amount
+            recorded.add(key)
+            results.append(
+                ReconciliationResult(index=index, status=ReconciliationStatus.RECORDED, payment_id=payment.id)
+            )
+
+        if payments:
+            Payment.objects.bulk_create(payments)
+            Payment.invoices.through.objects.bulk_create(links)
+            Invoice.objects.filter(id__in={link.invoice_id for link in links}).recalculate_paid()
+
+    return results
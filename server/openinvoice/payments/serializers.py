@@ -1,3 +1,4 @@
+from django.conf import settings
 from djmoney.contrib.django_rest_framework import MoneyField
 from djmoney.money import Money
 from rest_framework import serializers
@@ -7,7 +8,7 @@ from openinvoice.integrations.choices import PaymentProvider
 from openinvoice.invoices.choices import InvoiceStatus
 from openinvoice.invoices.fields import InvoiceRelatedField
 
-from .choices import PaymentStatus
+from .choices import PaymentStatus, ReconciliationStatus
 from .models import Payment
 
 
@@ -53,3 +54,29 @@ class PaymentRecordSerializer(serializers.Serializer):
             raise serializers.ValidationError({"amount": "Payment amount exceeds outstanding amount"})
 
         return data
+
+
+class PaymentReconciliationRowSerializer(serializers.Serializer):
+    invoice_id = serializers.UUIDField()
+    amount = serializers.DecimalField(max_digits=19, decimal_places=2)
+    transaction_id = serializers.CharField(max_length=255)
+    received_at = serializers.DateTimeField(required=False, allow_null=True)
+
+
+class PaymentReconciliationSerializer(serializers.Serializer):
+    payments: serializers.ListSerializer = serializers.ListSerializer(
+        child=PaymentReconciliationRowSerializer(),
+        allow_empty=False,
+        max_length=settings.MAX_PAYMENT_RECONCILIATION_ROWS,
+    )
+
+
+class PaymentReconciliationResultSerializer(serializers.Serializer):
+    index = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=ReconciliationStatus.choices)
+    payment_id = serializers.UUIDField(allow_null=True)
+    error = serializers.CharField(allow_null=True)
+
+
+class PaymentReconciliationResponseSerializer(serializers.Serializer):
+    results = PaymentReconciliationResultSerializer(many=True)
@@ -1,8 +1,9 @@
 from django.urls import path
 
-from .views import PaymentListCreateAPIView, PaymentRetrieveAPIView
+from .views import PaymentListCreateAPIView, PaymentReconciliationAPIView, PaymentRetrieveAPIView
 
 urlpatterns = [
     path("payments", PaymentListCreateAPIView.as_view()),
+    path("payments/reconcile", PaymentReconciliationAPIView.as_view()),
     path("payments/<uuid:pk>", PaymentRetrieveAPIView.as_view()),
 ]
@@ -8,7 +8,13 @@ from openinvoice.accounts.permissions import IsAccountMember
 
 from .filtersets import PaymentFilterSet
 from .models import Payment
-from .serializers import PaymentRecordSerializer, PaymentSerializer
+from .reconciliation import PaymentRow, reconcile_payments
+from .serializers import (
+    PaymentReconciliationResponseSerializer,
+    PaymentReconciliationSerializer,
+    PaymentRecordSerializer,
+    PaymentSerializer,
+)
 
 logger = structlog.get_logger(__name__)
 
@@ -58,3 +64,32 @@ class PaymentRetrieveAPIView(generics.RetrieveAPIView):
 
     def get_queryset(self):
         return Payment.objects.for_account(self.request.account)
+
+
+class PaymentReconciliationAPIView(generics.GenericAPIView):
+    serializer_class = PaymentReconciliationSerializer
+    permission_classes = [IsAuthenticated, IsAccountMember]
+
+    @extend_schema(
+        operation_id="reconcile_payments",
+        request=PaymentReconciliationSerializer,
+        responses={200: PaymentReconciliationResponseSerializer},
+    )
+    def post(self, request):
+        serializer = PaymentReconciliationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        results = reconcile_payments(
+            request.account,
+            [PaymentRow(**row) for row in serializer.validated_data["payments"]],
+        )
+
+        logger.info(
+            "Payments reconciled",
+            account_id=str(request.account.id),
+            rows=len(results),
+            recorded=sum(1 for result in results if result.payment_id is not None),
+        )
+
+        serializer = PaymentReconciliationResponseSerializer({"results": results})
+        return Response(serializer.data, status=status.HTTP_200_OK)
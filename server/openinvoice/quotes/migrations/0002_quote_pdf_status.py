@@ -0,0 +1,25 @@
+# Generated by Django 5.2 on 2026-10-17 05:23
+
+from django.db import migrations, models
+
+
+def mark_rendered_quotes_ready(apps, _):
+    Quote = apps.get_model("quotes", "Quote")
+    Quote.objects.filter(pdf__isnull=False).update(pdf_status="ready")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("quotes", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="quote",
+            name="pdf_status",
+            field=models.CharField(
+                choices=[("pending", "Pending"), ("ready", "Ready"), ("failed", "Failed")], max_length=50, null=True
+            ),
+        ),
+        migrations.RunPython(mark_rendered_quotes_ready, migrations.RunPython.noop),
+    ]
@@ -4,6 +4,7 @@ import uuid
 from datetime import date
 from decimal import Decimal
 
+from django.conf import settings
 from django.contrib.postgres.fields import ArrayField
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.db import models
@@ -25,6 +26,8 @@ from openinvoice.files.models import File
 from openinvoice.invoices.models import Invoice, InvoiceLine
 from openinvoice.numbering_systems.models import NumberingSystem
 from openinvoice.prices.models import Price
+from openinvoice.rendering.choices import RenderJobKind, RenderStatus
+from openinvoice.rendering.models import RenderJob
 from openinvoice.tax_rates.models import TaxRate
 
 from .choices import QuoteDeliveryMethod, QuoteStatus
@@ -81,6 +84,7 @@ class Quote(models.Model):
     accepted_at = models.DateTimeField(null=True)
     canceled_at = models.DateTimeField(null=True)
     pdf = models.OneToOneField("files.File", on_delete=models.SET_NULL, null=True, related_name="quotes_pdf")
+    pdf_status = models.CharField(max_length=50, choices=RenderStatus.choices, null=True)
     invoice = models.OneToOneField(
         "invoices.Invoice",
         on_delete=models.SET_NULL,
@@ -111,18 +115,16 @@ class Quote(models.Model):
             return None
 
         timestamp = timezone.now()
-        start_at, end_at = self.numbering_system.calculate_bounds(effective_at=timestamp)
-
-        query = Q(numbering_system=self.numbering_system) & ~Q(status=QuoteStatus.DRAFT)
-        if start_at:
-            query &= Q(opened_at__gte=start_at)
-        if end_at:
-            query &= Q(opened_at__lt=end_at)
-
-        issued_count = Quote.objects.filter(query).count()
+        if hasattr(self, "projected_draft_offset"):
+            return self.numbering_system.project_number(
+                effective_at=timestamp,
+                offset=self.projected_draft_offset or 0,
+                count=getattr(self, "projected_sequence_count", None),
+            )
 
         draft_offset = 0
         if self.status == QuoteStatus.DRAFT:
+            start_at, end_at = self.numbering_system.calculate_bounds(effective_at=timestamp)
             draft_query = Q(numbering_system=self.numbering_system, status=QuoteStatus.DRAFT)
             if start_at:
                 draft_query &= Q(created_at__gte=start_at)
@@ -133,7 +135,7 @@ class Quote(models.Model):
             earlier_condition = Q(created_at__lt=self.created_at) | (Q(created_at=self.created_at) & Q(pk__lt=self.pk))
             draft_offset = drafts.filter(earlier_condition).count()
 
-        return self.numbering_system.render_number(count=issued_count + draft_offset, effective_at=timestamp)
+        return self.numbering_system.project_number(effective_at=timestamp, offset=draft_offset)
 
     def recalculate(self) -> None:
         subtotal = zero(self.currency)
@@ -227,17 +229,19 @@ class Quote(models.Model):
         return discount
 
     def finalize(self):
-        if not self.number:
-            self.number = self.generate_number()
+        self.opened_at = timezone.now()
+        if not self.number and self.numbering_system is not None:
+            self.number = self.numbering_system.allocate_number(effective_at=self.opened_at)
 
         self.billing_profile = self.billing_profile.clone()
         self.business_profile = self.business_profile.clone()
 
         self.status = QuoteStatus.OPEN
-        self.opened_at = timezone.now()
+        if settings.PDF_RENDER_ASYNC:
+            self.pdf_status = RenderStatus.PENDING
         self.save()
 
-        self.generate_pdf()
+        RenderJob.objects.enqueue(RenderJobKind.QUOTE, self.id)
 
     def cancel(self):
         if self.status in {QuoteStatus.CANCELED, QuoteStatus.ACCEPTED}:
@@ -359,7 +363,8 @@ class Quote(models.Model):
             content_type="application/pdf",
         )
         self.pdf = file
-        self.save(update_fields=["pdf", "updated_at"])
+        self.pdf_status = RenderStatus.READY
+        self.save(update_fields=["pdf", "pdf_status", "updated_at"])
         return file
 
 
@@ -0,0 +1,30 @@
+from uuid import UUID
+
+import structlog
+from django.db import transaction
+
+from openinvoice.rendering.choices import RenderStatus
+
+from .choices import QuoteDeliveryMethod
+from .mail import send_quote
+from .models import Quote
+
+logger = structlog.get_logger(__name__)
+
+
+def render_quote(quote_id: UUID) -> None:
+    quote = Quote.objects.get(id=quote_id)
+    quote.generate_pdf()
+
+    if quote.delivery_method == QuoteDeliveryMethod.AUTOMATIC and len(quote.recipients) > 0:
+        # Deliver only once the rendered PDF is committed, a rolled back render must not send anything
+        transaction.on_commit(lambda: deliver_quote(quote), robust=True)
+
+
+def deliver_quote(quote: Quote) -> None:
+    send_quote(quote)
+    logger.info("Quote delivered automatically", quote_id=quote.id, recipients=quote.recipients)
+
+
+def fail_quote_rendering(quote_id: UUID) -> None:
+    Quote.objects.filter(id=quote_id, pdf_status=RenderStatus.PENDING).update(pdf_status=RenderStatus.FAILED)
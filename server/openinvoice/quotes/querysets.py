@@ -9,6 +9,9 @@ from django.db.models import Prefetch
 from djmoney.money import Money
 
 from openinvoice.core.calculations import zero
+from openinvoice.numbering_systems.querysets import annotate_projected_numbers
+
+from .choices import QuoteStatus
 
 if TYPE_CHECKING:
     from openinvoice.accounts.models import Account
@@ -18,6 +21,9 @@ class QuoteQuerySet(models.QuerySet):
     def for_account(self, account: Account):
         return self.filter(account=account)
 
+    def with_projected_numbers(self):
+        return annotate_projected_numbers(self, draft_status=QuoteStatus.DRAFT, numbered_at="opened_at")
+
     def for_recalculation(self):
         QuoteLine = apps.get_model("quotes.QuoteLine")  # noqa: N806
         QuoteDiscount = apps.get_model("quotes.QuoteDiscount")  # noqa: N806
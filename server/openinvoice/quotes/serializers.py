@@ -16,6 +16,7 @@ from openinvoice.numbering_systems.choices import NumberingSystemAppliesTo
 from openinvoice.numbering_systems.fields import NumberingSystemRelatedField
 from openinvoice.prices.fields import PriceRelatedField
 from openinvoice.prices.validators import PriceIsActive, PriceProductIsActive
+from openinvoice.rendering.choices import RenderStatus
 from openinvoice.tax_rates.fields import TaxRateRelatedField
 
 from .choices import QuoteDeliveryMethod, QuotePreviewFormat, QuoteStatus
@@ -94,6 +95,7 @@ class QuoteSerializer(serializers.Serializer):
     accepted_at = serializers.DateTimeField(allow_null=True)
     canceled_at = serializers.DateTimeField(allow_null=True)
     pdf_id = serializers.UUIDField(allow_null=True)
+    pdf_status = serializers.ChoiceField(choices=RenderStatus.choices, allow_null=True)
     invoice_id = serializers.UUIDField(allow_null=True)
     lines = QuoteLineSerializer(many=True)
     discounts = QuoteDiscountSerializer(many=True, source="discounts.for_quote", read_only=True)
@@ -117,9 +119,9 @@ class QuoteCreateSerializer(serializers.Serializer):
     recipients = serializers.ListField(child=serializers.EmailField(), required=False, allow_empty=True)
 
     def validate_delivery_method(self, value):
-        account = self.context["request"].account
+        plan = self.context["request"].plan
 
-        if value == QuoteDeliveryMethod.AUTOMATIC and not has_feature(account, FeatureCode.AUTOMATIC_QUOTE_DELIVERY):
+        if value == QuoteDeliveryMethod.AUTOMATIC and not has_feature(plan, FeatureCode.AUTOMATIC_QUOTE_DELIVERY):
             raise serializers.ValidationError("Automatic delivery is forbidden for your account.")
 
         return value
@@ -142,9 +144,9 @@ class QuoteUpdateSerializer(serializers.Serializer):
     recipients = serializers.ListField(child=serializers.EmailField(), required=False, allow_empty=True)
 
     def validate_delivery_method(self, value):
-        account = self.context["request"].account
+        plan = self.context["request"].plan
 
-        if value == QuoteDeliveryMethod.AUTOMATIC and not has_feature(account, FeatureCode.AUTOMATIC_QUOTE_DELIVERY):
+        if value == QuoteDeliveryMethod.AUTOMATIC and not has_feature(plan, FeatureCode.AUTOMATIC_QUOTE_DELIVERY):
             raise serializers.ValidationError("Automatic delivery is forbidden for your account.")
 
         return value
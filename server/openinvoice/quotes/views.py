@@ -13,9 +13,8 @@ from openinvoice.comments.models import Comment
 from openinvoice.comments.serializers import CommentCreateSerializer, CommentSerializer
 from openinvoice.core.utils import numeric_overflow
 
-from .choices import QuoteDeliveryMethod, QuotePreviewFormat, QuoteStatus
+from .choices import QuotePreviewFormat, QuoteStatus
 from .filtersets import QuoteFilterSet
-from .mail import send_quote
 from .models import Quote, QuoteDiscount, QuoteLine, QuoteTax
 from .permissions import MaxQuotesLimit
 from .serializers import (
@@ -56,6 +55,7 @@ class QuoteListCreateAPIView(generics.ListAPIView):
     def get_queryset(self):
         return (
             Quote.objects.for_account(self.request.account)
+            .with_projected_numbers()
             .prefetch_related(
                 Prefetch(
                     "lines",
@@ -182,10 +182,8 @@ class QuoteFinalizeAPIView(generics.GenericAPIView):
 
         quote.finalize()
 
-        if quote.delivery_method == QuoteDeliveryMethod.AUTOMATIC and len(quote.recipients) > 0:
-            send_quote(quote)
-
         logger.info("Quote finalized", quote_id=quote.id, customer_id=quote.customer_id)
+        quote = get_object_or_404(self.get_queryset(), pk=quote_id)
         serializer = QuoteSerializer(quote)
         return Response(serializer.data)
 
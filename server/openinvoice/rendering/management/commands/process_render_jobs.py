@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from openinvoice.rendering.choices import RenderJobStatus
+from openinvoice.rendering.models import RenderJob
+
+
+class Command(BaseCommand):
+    help = "Render queued invoice, credit note and quote PDFs."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Exit once no job is due instead of polling")
+        parser.add_argument("--poll-interval", type=float, default=2.0, help="Seconds to wait when idle")
+
+    def handle(self, *_, **options):
+        while True:
+            job = RenderJob.objects.process_next()
+
+            if job is None:
+                if options["once"]:
+                    return
+                # Drop connections that went stale while idle, like a request boundary would
+                close_old_connections()
+                time.sleep(options["poll_interval"])
+                continue
+
+            if job.status == RenderJobStatus.COMPLETED:
+                self.stdout.write(f"Rendered {job.kind} {job.object_id}")
+            else:
+                self.stderr.write(
+                    f"Failed to render {job.kind} {job.object_id} (attempt {job.attempts}): {job.last_error}"
+                )
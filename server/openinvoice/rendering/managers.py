@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, cast
+from uuid import UUID
+
+from django.conf import settings
+from django.db import models, transaction
+from django.utils.module_loading import import_string
+
+from .choices import RenderJobKind
+
+if TYPE_CHECKING:
+    from .models import RenderJob
+    from .querysets import RenderJobQuerySet
+
+
+class RenderJobManager(models.Manager["RenderJob"]):
+    def enqueue(self, kind: RenderJobKind, object_id: UUID) -> RenderJob | None:
+        """Queue rendering of the documents of ``object_id``.
+
+        The job row is part of the caller's transaction, so workers only pick it up once that transaction
+        commits. With ``PDF_RENDER_ASYNC`` disabled the documents are rendered right away and no job is stored.
+        """
+        if not settings.PDF_RENDER_ASYNC:
+            render, _ = self.model.HANDLERS[kind]
+            import_string(render)(object_id)
+            return None
+
+        return self.create(kind=kind, object_id=object_id)
+
+    def process_next(self) -> RenderJob | None:
+        """Claim and process the next due job, return ``None`` when there is nothing to do.
+
+        The job is claimed in a short transaction that marks it running, so the render, uploads and emails
+        happen outside of any row lock. A worker that dies mid-render leaves the job running until its lease
+        expires, after which another worker picks it up again.
+        """
+        with transaction.atomic():
+            job = (
+                cast("RenderJobQuerySet", self.get_queryset())
+                .due()
+                .select_for_update(skip_locked=True)
+                .order_by("run_after")
+                .first()
+            )
+            if job is None:
+                return None
+
+            job.claim()
+
+        job.process()
+        return job
@@ -0,0 +1,38 @@
+# Generated by Django 5.2 on 2026-10-17 07:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("rendering", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="renderjob",
+            name="render_job_pending_idx",
+        ),
+        migrations.AlterField(
+            model_name="renderjob",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("running", "Running"),
+                    ("completed", "Completed"),
+                    ("failed", "Failed"),
+                ],
+                default="pending",
+                max_length=50,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="renderjob",
+            index=models.Index(
+                condition=models.Q(("status__in", ["pending", "running"])),
+                fields=["run_after"],
+                name="render_job_due_idx",
+            ),
+        ),
+    ]
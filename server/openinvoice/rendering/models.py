@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import uuid
+from datetime import timedelta
+
+import structlog
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .choices import RenderJobKind, RenderJobStatus
+from .managers import RenderJobManager
+from .querysets import RenderJobQuerySet
+
+logger = structlog.get_logger(__name__)
+
+
+class RenderJob(models.Model):
+    # Render and failure handlers per kind, both called with the id of the rendered object
+    HANDLERS = {
+        RenderJobKind.INVOICE: (
+            "openinvoice.invoices.pdf.render_invoice",
+            "openinvoice.invoices.pdf.fail_invoice_rendering",
+        ),
+        RenderJobKind.CREDIT_NOTE: (
+            "openinvoice.credit_notes.pdf.render_credit_note",
+            "openinvoice.credit_notes.pdf.fail_credit_note_rendering",
+        ),
+        RenderJobKind.QUOTE: (
+            "openinvoice.quotes.pdf.render_quote",
+            "openinvoice.quotes.pdf.fail_quote_rendering",
+        ),
+    }
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    kind = models.CharField(max_length=50, choices=RenderJobKind.choices)
+    object_id = models.UUIDField()
+    status = models.CharField(max_length=50, choices=RenderJobStatus.choices, default=RenderJobStatus.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(null=True, blank=True)
+    run_after = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True)
+
+    objects = RenderJobManager.from_queryset(RenderJobQuerySet)()
+
+    class Meta:
+        ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["kind", "object_id"]),
+            models.Index(
+                fields=["run_after"],
+                name="render_job_due_idx",
+                condition=Q(status__in=[RenderJobStatus.PENDING, RenderJobStatus.RUNNING]),
+            ),
+        ]
+
+    def claim(self) -> None:
+        self.status = RenderJobStatus.RUNNING
+        self.run_after = timezone.now() + timedelta(seconds=settings.PDF_RENDER_LEASE_TIMEOUT)
+        self.save(update_fields=["status", "run_after", "updated_at"])
+
+    def run(self) -> None:
+        render, _ = self.HANDLERS[RenderJobKind(self.kind)]
+        import_string(render)(self.object_id)
+
+        self.attempts += 1
+        self.status = RenderJobStatus.COMPLETED
+        self.completed_at = timezone.now()
+        self.last_error = None
+        self.save(update_fields=["attempts", "status", "completed_at", "last_error", "updated_at"])
+
+    def process(self) -> None:
+        """Run the job, scheduling a retry with exponential backoff when it fails.
+
+        The render and the completion of the job commit together; handlers send emails on commit, so a
+        failed commit never leads to a second delivery on retry.
+        """
+        try:
+            with transaction.atomic():
+                self.run()
+        except Exception as exc:
+            logger.exception("Render job failed", job_id=self.id, kind=self.kind, object_id=self.object_id)
+            with transaction.atomic():
+                self.fail(exc)
+        else:
+            logger.info("Render job completed", job_id=self.id, kind=self.kind, object_id=self.object_id)
+
+    def fail(self, exc: Exception) -> None:
+        self.attempts += 1
+        self.last_error = repr(exc)
+
+        if self.attempts >= settings.PDF_RENDER_MAX_ATTEMPTS:
+            self.status = RenderJobStatus.FAILED
+            _, fail = self.HANDLERS[RenderJobKind(self.kind)]
+            import_string(fail)(self.object_id)
+        else:
+            self.status = RenderJobStatus.PENDING
+            delay = settings.PDF_RENDER_RETRY_DELAY * 2 ** (self.attempts - 1)
+            self.run_after = timezone.now() + timedelta(seconds=delay)
+
+        self.save(update_fields=["attempts", "last_error", "status", "run_after", "updated_at"])
@@ -0,0 +1,14 @@
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+from .choices import RenderJobStatus
+
+
+class RenderJobQuerySet(models.QuerySet):
+    def due(self):
+        # Running jobs whose lease expired belong to a worker that died mid-render
+        return self.filter(
+            Q(status=RenderJobStatus.PENDING) | Q(status=RenderJobStatus.RUNNING),
+            run_after__lte=timezone.now(),
+        )
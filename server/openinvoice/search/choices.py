@@ -0,0 +1,7 @@
+from django.db import models
+
+
+class SearchDocumentKind(models.TextChoices):
+    INVOICE = "invoice", "Invoice"
+    CUSTOMER = "customer", "Customer"
+    PRODUCT = "product", "Product"
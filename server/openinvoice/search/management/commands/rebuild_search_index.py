@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from openinvoice.accounts.models import Account
+from openinvoice.search.models import SearchDocument
+
+
+class Command(BaseCommand):
+    help = "Rebuild the search documents of invoices, customers and products, e.g. after deploying search."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--account", help="Only rebuild the documents of this account ID")
+        parser.add_argument("--all", action="store_true", help="Rebuild the documents of every account")
+
+    def handle(self, *_, **options):
+        if not options["all"] and not options["account"]:
+            raise CommandError("Pass --all or --account")
+
+        if options["account"]:
+            account_ids = [options["account"]]
+        else:
+            account_ids = Account.objects.order_by("created_at").values_list("id", flat=True)
+
+        total = 0
+        for account_id in account_ids:
+            documents = SearchDocument.objects.rebuild(account_id)
+            total += documents
+            self.stdout.write(f"Indexed {documents} documents for account {account_id}")
+
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} search documents"))
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from django.apps import apps
+from django.db import connection, models, transaction
+
+from .choices import SearchDocumentKind
+
+UPSERT_SEARCH_DOCUMENTS_SQL = """
+INSERT INTO search_searchdocument (account_id, kind, object_id, text, created_at)
+{select}
+ON CONFLICT (kind, object_id) DO UPDATE
+SET
+  account_id = EXCLUDED.account_id,
+  text = EXCLUDED.text,
+  created_at = EXCLUDED.created_at
+WHERE search_searchdocument.text IS DISTINCT FROM EXCLUDED.text
+  OR search_searchdocument.account_id IS DISTINCT FROM EXCLUDED.account_id;
+"""
+
+# Searchable text of each kind, selected for the objects whose ids are returned by the ``{ids}`` subquery
+SEARCH_DOCUMENT_SELECT_SQL = {
+    SearchDocumentKind.INVOICE: """
+SELECT i.account_id, 'invoice', i.id, concat_ws(' ', i.id::text, i.number, c.name, b.email), i.created_at
+FROM invoices_invoice i
+JOIN customers_customer c ON c.id = i.customer_id
+JOIN customers_billingprofile b ON b.id = i.billing_profile_id
+WHERE i.id IN ({ids})
+""",
+    SearchDocumentKind.CUSTOMER: """
+SELECT c.account_id, 'customer', c.id, concat_ws(' ', c.id::text, c.name, b.email, b.phone, c.description), c.created_at
+FROM customers_customer c
+JOIN customers_billingprofile b ON b.id = c.default_billing_profile_id
+WHERE c.id IN ({ids})
+""",
+    SearchDocumentKind.PRODUCT: """
+SELECT p.account_id, 'product', p.id, concat_ws(' ', p.id::text, p.name, p.description), p.created_at
+FROM products_product p
+WHERE p.id IN ({ids})
+""",
+}
+
+SEARCH_DOCUMENT_MODELS = {
+    SearchDocumentKind.INVOICE: "invoices.Invoice",
+    SearchDocumentKind.CUSTOMER: "customers.Customer",
+    SearchDocumentKind.PRODUCT: "products.Product",
+}
+
+
+class SearchDocumentManager(models.Manager):
+    def index(self, kind: SearchDocumentKind, queryset: models.QuerySet) -> int:
+        """(Re)index the objects of ``queryset`` in a single statement and return the number of changed documents."""
+        ids, params = queryset.values("pk").query.sql_with_params()
+        select = SEARCH_DOCUMENT_SELECT_SQL[kind].format(ids=ids)
+
+        with connection.cursor() as cursor:
+            cursor.execute(UPSERT_SEARCH_DOCUMENTS_SQL.format(select=select), params)
+            return cursor.rowcount
+
+    def remove(self, kind: SearchDocumentKind, object_id: UUID) -> None:
+        self.filter(kind=kind, object_id=object_id).delete()
+
+    def rebuild(self, account_id: UUID) -> int:
+        with transaction.atomic():
+            self.filter(account_id=account_id).delete()
+            return sum(
+                self.index(kind, apps.get_model(model).objects.filter(account_id=account_id))
+                for kind, model in SEARCH_DOCUMENT_MODELS.items()
+            )
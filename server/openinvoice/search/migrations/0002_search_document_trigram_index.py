@@ -0,0 +1,27 @@
+from django.db import migrations
+
+# Substring matches use a trigram index where the pg_trgm extension is available. Without it they fall back to
+# scanning the account's documents, which keeps the schema installable on servers that don't ship the extension.
+CREATE_TRIGRAM_INDEX_SQL = """
+DO $$
+BEGIN
+  IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+    CREATE EXTENSION IF NOT EXISTS pg_trgm;
+    CREATE INDEX IF NOT EXISTS search_document_text_trgm_idx
+      ON search_searchdocument USING gin (text gin_trgm_ops);
+  END IF;
+END
+$$;
+"""
+
+DROP_TRIGRAM_INDEX_SQL = "DROP INDEX IF EXISTS search_document_text_trgm_idx;"
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("search", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_TRIGRAM_INDEX_SQL, DROP_TRIGRAM_INDEX_SQL),
+    ]
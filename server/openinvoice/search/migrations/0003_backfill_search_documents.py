@@ -0,0 +1,36 @@
+from django.db import migrations
+
+# Objects that existed before search was deployed only reach the index through this backfill, later saves keep their
+# documents up to date. Mirrors SEARCH_DOCUMENT_SELECT_SQL in search/managers.py at the time of writing.
+BACKFILL_SQL = """
+INSERT INTO search_searchdocument (account_id, kind, object_id, text, created_at)
+SELECT i.account_id, 'invoice', i.id, concat_ws(' ', i.id::text, i.number, c.name, b.email), i.created_at
+FROM invoices_invoice i
+JOIN customers_customer c ON c.id = i.customer_id
+JOIN customers_billingprofile b ON b.id = i.billing_profile_id
+ON CONFLICT (kind, object_id) DO NOTHING;
+
+INSERT INTO search_searchdocument (account_id, kind, object_id, text, created_at)
+SELECT c.account_id, 'customer', c.id, concat_ws(' ', c.id::text, c.name, b.email, b.phone, c.description), c.created_at
+FROM customers_customer c
+JOIN customers_billingprofile b ON b.id = c.default_billing_profile_id
+ON CONFLICT (kind, object_id) DO NOTHING;
+
+INSERT INTO search_searchdocument (account_id, kind, object_id, text, created_at)
+SELECT p.account_id, 'product', p.id, concat_ws(' ', p.id::text, p.name, p.description), p.created_at
+FROM products_product p
+ON CONFLICT (kind, object_id) DO NOTHING;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("search", "0002_search_document_trigram_index"),
+        ("customers", "0003_customer_name"),
+        ("invoices", "0002_initial"),
+        ("products", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+    ]
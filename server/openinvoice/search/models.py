@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db import models
+
+from .choices import SearchDocumentKind
+from .managers import SearchDocumentManager
+
+
+class SearchDocument(models.Model):
+    """Denormalized searchable text of an invoice, customer or product.
+
+    Documents are kept up to date by the receivers in ``signals`` and can be rebuilt with ``rebuild_search_index``.
+    """
+
+    account = models.ForeignKey("accounts.Account", on_delete=models.CASCADE, related_name="search_documents")
+    kind = models.CharField(max_length=50, choices=SearchDocumentKind.choices)
+    object_id = models.UUIDField()
+    text = models.TextField()
+    vector = models.GeneratedField(
+        expression=SearchVector("text", config="simple"),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+    # Creation time of the indexed object, to list the newest first among equally ranked results
+    created_at = models.DateTimeField()
+
+    objects = SearchDocumentManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "object_id"], name="unique_search_document_object"),
+        ]
+        indexes = [
+            models.Index(fields=["account", "kind", "-created_at"], name="search_document_account_idx"),
+            GinIndex(fields=["vector"], name="search_document_vector_idx"),
+        ]
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from functools import cache
+from uuid import UUID
+
+from django.db import connection
+
+SEARCH_SQL = """
+SELECT ranked.kind, ranked.object_id
+FROM (
+  SELECT
+    d.kind,
+    d.object_id,
+    ROW_NUMBER() OVER (
+      PARTITION BY d.kind
+      ORDER BY ts_rank(d.vector, to_tsquery('simple', %(query)s)) DESC, d.created_at DESC
+    ) AS position
+  FROM search_searchdocument d
+  WHERE
+    d.account_id = %(account_id)s
+    AND {match}
+) ranked
+WHERE ranked.position <= %(limit)s
+ORDER BY ranked.kind, ranked.position;
+"""
+
+# Trigrams can't narrow down shorter terms, substring matches on those would still scan the account's documents
+MIN_SUBSTRING_LENGTH = 3
+
+
+def escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def prefix_query(terms: list[str]) -> str:
+    """Return a ``to_tsquery`` expression matching documents with a word starting with each of ``terms``."""
+    return " & ".join("'" + term.replace("\\", "\\\\").replace("'", "''") + "':*" for term in terms)
+
+
+@cache
+def has_trigram_index() -> bool:
+    """Whether the optional trigram index of migration 0002 exists, without it substring matches scan every document."""
+    with connection.cursor() as cur:
+        cur.execute("SELECT to_regclass('search_document_text_trgm_idx') IS NOT NULL")
+        return cur.fetchone()[0]
+
+
+def search_documents(*, account_id: UUID, terms: list[str], limit: int) -> dict[str, list[UUID]]:
+    """Return the ids of the best matching objects of each kind, at most ``limit`` per kind.
+
+    A document matches when it has a word starting with each term. Where the trigram index exists, documents that
+    contain every term of at least three characters anywhere in their text match as well. Prefix matches rank first,
+    ties are broken by recency.
+    """
+    params: dict[str, str | int | UUID] = {"account_id": account_id, "query": prefix_query(terms), "limit": limit}
+    if terms:
+        match = "d.vector @@ to_tsquery('simple', %(query)s)"
+        if has_trigram_index() and all(len(term) >= MIN_SUBSTRING_LENGTH for term in terms):
+            substrings = []
+            for index, term in enumerate(terms):
+                params[f"term_{index}"] = f"%{escape_like(term)}%"
+                substrings.append(f"d.text ILIKE %(term_{index})s")
+            match = f"({match} OR ({' AND '.join(substrings)}))"
+    else:
+        match = "TRUE"
+
+    results = defaultdict(list)
+    with connection.cursor() as cur:
+        cur.execute(SEARCH_SQL.format(match=match), params)
+        for kind, object_id in cur.fetchall():
+            results[kind].append(object_id)
+    return results
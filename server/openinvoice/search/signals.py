@@ -0,0 +1,80 @@
+from typing import Any
+from weakref import WeakKeyDictionary
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from openinvoice.customers.models import BillingProfile, Customer
+from openinvoice.invoices.models import Invoice
+from openinvoice.products.models import Product
+
+from .choices import SearchDocumentKind
+from .models import SearchDocument
+
+# Fields that make up the searchable text, saves that touch none of them don't need reindexing
+INVOICE_FIELDS = {"number", "customer", "billing_profile"}
+CUSTOMER_FIELDS = {"name", "description", "default_billing_profile"}
+BILLING_PROFILE_FIELDS = {"email", "phone"}
+PRODUCT_FIELDS = {"name", "description"}
+
+# Names of customers being saved as stored before the save, their invoices only need reindexing when it changes
+previous_customer_names: WeakKeyDictionary[Customer, str | None] = WeakKeyDictionary()
+
+
+def is_indexed_change(update_fields: frozenset[str] | None, fields: set[str]) -> bool:
+    return update_fields is None or not fields.isdisjoint(update_fields)
+
+
+@receiver(post_save, sender=Invoice)
+def index_invoice(instance: Invoice, update_fields: frozenset[str] | None, **_: Any) -> None:
+    if is_indexed_change(update_fields, INVOICE_FIELDS):
+        SearchDocument.objects.index(SearchDocumentKind.INVOICE, Invoice.objects.filter(pk=instance.pk))
+
+
+@receiver(pre_save, sender=Customer)
+def remember_customer_name(instance: Customer, update_fields: frozenset[str] | None, **_: Any) -> None:
+    if is_indexed_change(update_fields, {"name"}):
+        previous_customer_names[instance] = (
+            Customer.objects.filter(pk=instance.pk).values_list("name", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Customer)
+def index_customer(instance: Customer, created: bool, update_fields: frozenset[str] | None, **_: Any) -> None:
+    previous_name = previous_customer_names.pop(instance, instance.name)
+    if is_indexed_change(update_fields, CUSTOMER_FIELDS):
+        SearchDocument.objects.index(SearchDocumentKind.CUSTOMER, Customer.objects.filter(pk=instance.pk))
+    # Invoices are searchable by their customer's name
+    if not created and previous_name != instance.name:
+        SearchDocument.objects.index(SearchDocumentKind.INVOICE, Invoice.objects.filter(customer=instance))
+
+
+@receiver(post_save, sender=BillingProfile)
+def index_billing_profile(instance: BillingProfile, update_fields: frozenset[str] | None, **_: Any) -> None:
+    if is_indexed_change(update_fields, BILLING_PROFILE_FIELDS):
+        SearchDocument.objects.index(
+            SearchDocumentKind.CUSTOMER,
+            Customer.objects.filter(default_billing_profile=instance),
+        )
+        SearchDocument.objects.index(SearchDocumentKind.INVOICE, Invoice.objects.filter(billing_profile=instance))
+
+
+@receiver(post_save, sender=Product)
+def index_product(instance: Product, update_fields: frozenset[str] | None, **_: Any) -> None:
+    if is_indexed_change(update_fields, PRODUCT_FIELDS):
+        SearchDocument.objects.index(SearchDocumentKind.PRODUCT, Product.objects.filter(pk=instance.pk))
+
+
+@receiver(post_delete, sender=Invoice)
+def remove_invoice(instance: Invoice, **_: Any) -> None:
+    SearchDocument.objects.remove(SearchDocumentKind.INVOICE, instance.pk)
+
+
+@receiver(post_delete, sender=Customer)
+def remove_customer(instance: Customer, **_: Any) -> None:
+    SearchDocument.objects.remove(SearchDocumentKind.CUSTOMER, instance.pk)
+
+
+@receiver(post_delete, sender=Product)
+def remove_product(instance: Product, **_: Any) -> None:
+    SearchDocument.objects.remove(SearchDocumentKind.PRODUCT, instance.pk)
@@ -10,38 +10,19 @@ from openinvoice.customers.models import Customer
 from openinvoice.invoices.models import Invoice
 from openinvoice.products.models import Product
 
+from .choices import SearchDocumentKind
+from .queries import search_documents
 from .serializers import SearchSerializer
 
 
 class SearchAPIView(generics.GenericAPIView):
     serializer_class = SearchSerializer
     permission_classes = [IsAuthenticated, IsAccountMember]
+    limit = 5
 
-    def apply_search_filter(self, qs, search_fields):
-        dummy_view = type("DummyView", (), {"search_fields": search_fields})()
-        search_filter = SearchFilter()
-        return search_filter.filter_queryset(self.request, qs, dummy_view)
-
-    def get_queryset_products(self):
-        qs = Product.objects.for_account(self.request.account).eager_load()
-        return self.apply_search_filter(qs, ["id", "name", "description"])[:5]
-
-    def get_queryset_invoices(self):
-        qs = Invoice.objects.for_account(self.request.account).eager_load()
-        return self.apply_search_filter(qs, ["id", "number", "customer__name", "billing_profile__email"])[:5]
-
-    def get_queryset_customers(self):
-        qs = Customer.objects.for_account(self.request.account).eager_load()
-        return self.apply_search_filter(
-            qs,
-            [
-                "id",
-                "name",
-                "default_billing_profile__email",
-                "default_billing_profile__phone",
-                "description",
-            ],
-        )[:5]
+    def load(self, queryset, ids):
+        objects = queryset.in_bulk(ids)
+        return [objects[pk] for pk in ids if pk in objects]
 
     @extend_schema(
         operation_id="search",
@@ -56,16 +37,28 @@ class SearchAPIView(generics.GenericAPIView):
         ],
         responses=SearchSerializer,
     )
-    def get(self, _):
-        products = self.get_queryset_products()
-        invoices = self.get_queryset_invoices()
-        customers = self.get_queryset_customers()
+    def get(self, request):
+        account = request.account
+        matches = search_documents(
+            account_id=account.id,
+            terms=SearchFilter().get_search_terms(request),
+            limit=self.limit,
+        )
 
         serializer = self.get_serializer(
             {
-                "products": products,
-                "invoices": invoices,
-                "customers": customers,
+                "products": self.load(
+                    Product.objects.for_account(account).eager_load(),
+                    matches[SearchDocumentKind.PRODUCT],
+                ),
+                "invoices": self.load(
+                    Invoice.objects.for_account(account).eager_load(),
+                    matches[SearchDocumentKind.INVOICE],
+                ),
+                "customers": self.load(
+                    Customer.objects.for_account(account).eager_load(),
+                    matches[SearchDocumentKind.CUSTOMER],
+                ),
             }
         )
         return Response(serializer.data)
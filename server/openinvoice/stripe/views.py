@@ -9,6 +9,8 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
 from openinvoice.accounts.permissions import IsAccountMember
+from openinvoice.webhooks.choices import WebhookSource
+from openinvoice.webhooks.models import WebhookEvent
 
 from .models import StripeCustomer
 from .serializers import (
@@ -16,11 +18,6 @@ from .serializers import (
     StripeCheckoutSerializer,
     StripeCheckoutSessionSerializer,
 )
-from .tasks import (
-    handle_subscription_created_event,
-    handle_subscription_deleted_event,
-    handle_subscription_updated_event,
-)
 
 logger = structlog.get_logger(__name__)
 
@@ -44,19 +41,8 @@ class StripeWebhookAPIView(GenericAPIView):
         except stripe.SignatureVerificationError:
             return Response(status=status.HTTP_400_BAD_REQUEST)
 
-        try:
-            match event["type"]:
-                case "customer.subscription.created":
-                    handle_subscription_created_event(event)
-                case "customer.subscription.updated":
-                    handle_subscription_updated_event(event)
-                case "customer.subscription.deleted":
-                    handle_subscription_deleted_event(event)
-                case _:
-                    logger.info("Stripe event ignored", event_type=event.get("type"))
-        except Exception as e:
-            logger.error("Failed to handle Stripe webhook event", data=event, error=str(e))
-            raise APIException("Failed to handle Stripe webhook event") from e
+        # Handled by the webhook worker, Stripe only waits for the event to be stored
+        WebhookEvent.objects.receive(WebhookSource.STRIPE, event)
 
         return Response(status=status.HTTP_200_OK)
 
@@ -0,0 +1,12 @@
+from django.db import models
+
+
+class WebhookSource(models.TextChoices):
+    STRIPE = "stripe", "Stripe"
+    STRIPE_CONNECTION = "stripe_connection", "Stripe connection"
+
+
+class WebhookEventStatus(models.TextChoices):
+    PENDING = "pending", "Pending"
+    PROCESSED = "processed", "Processed"
+    FAILED = "failed", "Failed"
@@ -0,0 +1,40 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from openinvoice.webhooks.choices import WebhookEventStatus
+from openinvoice.webhooks.models import WebhookEvent
+
+
+class Command(BaseCommand):
+    help = "Process received Stripe webhook events."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Exit once no event is due instead of polling")
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds to wait when idle")
+        parser.add_argument(
+            "--batch-size", type=int, default=settings.WEBHOOK_BATCH_SIZE, help="Events processed per batch"
+        )
+
+    def handle(self, *_, **options):
+        while True:
+            events = WebhookEvent.objects.process_batch(limit=options["batch_size"])
+
+            if not events:
+                if options["once"]:
+                    return
+                # Drop connections that went stale while idle, like a request boundary would
+                close_old_connections()
+                time.sleep(options["poll_interval"])
+                continue
+
+            for event in events:
+                if event.status == WebhookEventStatus.PROCESSED:
+                    self.stdout.write(f"Processed {event.event_type} {event.event_id}")
+                else:
+                    self.stderr.write(
+                        f"Failed to process {event.event_type} {event.event_id} "
+                        f"(attempt {event.attempts}): {event.last_error}"
+                    )
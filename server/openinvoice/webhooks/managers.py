@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import json
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any, cast
+from uuid import UUID
+
+import structlog
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import F
+
+from .choices import WebhookSource
+
+if TYPE_CHECKING:
+    from .models import WebhookEvent
+    from .querysets import WebhookEventQuerySet
+
+logger = structlog.get_logger(__name__)
+
+
+class WebhookEventManager(models.Manager["WebhookEvent"]):
+    def receive(
+        self,
+        source: WebhookSource,
+        event: dict[str, Any],
+        connection_id: UUID | None = None,
+    ) -> WebhookEvent | None:
+        """Store a verified event in the inbox, once per event id, and return it.
+
+        Redeliveries of a stored event only bump its ``duplicates`` counter and return the existing row, events
+        without a handler are dropped and ``None`` is returned. With ``WEBHOOK_PROCESS_ASYNC`` disabled the event is
+        processed right away.
+        """
+        event_type = event.get("type")
+        if event_type not in self.model.HANDLERS[source]:
+            logger.info("Webhook event ignored", source=source, event_type=event_type)
+            return None
+
+        data = event["data"]["object"]
+        webhook_event, created = self.get_or_create(
+            source=source,
+            event_id=event["id"],
+            defaults={
+                "event_type": event_type,
+                "connection_id": connection_id,
+                # Checkout sessions carry the payment id, other objects are ordered by their own id
+                "ordering_key": data.get("client_reference_id") or data.get("id") or "",
+                "occurred_at": datetime.fromtimestamp(event.get("created") or datetime.now(UTC).timestamp(), tz=UTC),
+                # Plain JSON, events verified by the Stripe library are nested StripeObjects
+                "payload": json.loads(json.dumps(event)),
+            },
+        )
+        if not created:
+            self.filter(pk=webhook_event.pk).update(duplicates=F("duplicates") + 1)
+            logger.info("Webhook event already received", source=source, event_id=webhook_event.event_id)
+            return webhook_event
+
+        if not settings.WEBHOOK_PROCESS_ASYNC:
+            webhook_event.process()
+        return webhook_event
+
+    def process_batch(self, limit: int) -> list[WebhookEvent]:
+        """Process up to ``limit`` due events, one at a time and in order for each ordering key.
+
+        Every event is claimed and processed in its own transaction, so its changes commit as soon as its handler
+        returns. The claimed row stays locked meanwhile, concurrent workers skip it and the events queued behind it.
+        A failure only schedules that event for a retry.
+        """
+        events: list[WebhookEvent] = []
+        while len(events) < limit:
+            with transaction.atomic():
+                event = (
+                    cast("WebhookEventQuerySet", self.get_queryset())
+                    .due()
+                    .heads()
+                    .select_for_update(skip_locked=True)
+                    .order_by("occurred_at", "created_at")
+                    .first()
+                )
+                if event is None:
+                    break
+
+                event.process()
+            events.append(event)
+        return events
@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-17 07:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("webhooks", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="webhookevent",
+            name="duplicates",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
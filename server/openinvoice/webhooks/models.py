@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import uuid
+from datetime import timedelta
+
+import stripe
+import structlog
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .choices import WebhookEventStatus, WebhookSource
+from .managers import WebhookEventManager
+from .querysets import WebhookEventQuerySet
+
+logger = structlog.get_logger(__name__)
+
+
+class WebhookEvent(models.Model):
+    # Handlers per source and event type, called with the event rebuilt from its payload
+    HANDLERS = {
+        WebhookSource.STRIPE: {
+            "customer.subscription.created": "openinvoice.stripe.tasks.handle_subscription_created_event",
+            "customer.subscription.updated": "openinvoice.stripe.tasks.handle_subscription_updated_event",
+            "customer.subscription.deleted": "openinvoice.stripe.tasks.handle_subscription_deleted_event",
+        },
+        WebhookSource.STRIPE_CONNECTION: {
+            "checkout.session.completed": (
+                "openinvoice.integrations.stripe.tasks.handle_checkout_session_completed_event"
+            ),
+            "checkout.session.async_payment_succeeded": (
+                "openinvoice.integrations.stripe.tasks.handle_checkout_async_payment_succeeded_event"
+            ),
+            "checkout.session.async_payment_failed": (
+                "openinvoice.integrations.stripe.tasks.handle_checkout_async_payment_failed_event"
+            ),
+            "checkout.session.expired": "openinvoice.integrations.stripe.tasks.handle_checkout_session_expired_event",
+        },
+    }
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    source = models.CharField(max_length=50, choices=WebhookSource.choices)
+    event_id = models.CharField(max_length=255)
+    event_type = models.CharField(max_length=255)
+    connection_id = models.UUIDField(null=True)
+    ordering_key = models.CharField(max_length=255)
+    occurred_at = models.DateTimeField()
+    payload = models.JSONField()
+    status = models.CharField(max_length=50, choices=WebhookEventStatus.choices, default=WebhookEventStatus.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    duplicates = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(null=True, blank=True)
+    run_after = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    processed_at = models.DateTimeField(null=True)
+
+    objects = WebhookEventManager.from_queryset(WebhookEventQuerySet)()
+
+    class Meta:
+        ordering = ["created_at"]
+        constraints = [
+            models.UniqueConstraint(fields=["source", "event_id"], name="unique_webhook_event"),
+        ]
+        indexes = [
+            models.Index(
+                fields=["run_after"],
+                name="webhook_event_pending_idx",
+                condition=Q(status=WebhookEventStatus.PENDING),
+            ),
+            models.Index(
+                fields=["ordering_key", "occurred_at"],
+                name="webhook_event_pending_key_idx",
+                condition=Q(status=WebhookEventStatus.PENDING),
+            ),
+        ]
+
+    def run(self) -> None:
+        handler = import_string(self.HANDLERS[WebhookSource(self.source)][self.event_type])
+        handler(stripe.Event.construct_from(self.payload, None))
+
+        self.attempts += 1
+        self.status = WebhookEventStatus.PROCESSED
+        self.processed_at = timezone.now()
+        self.last_error = None
+        self.save(update_fields=["attempts", "status", "processed_at", "last_error", "updated_at"])
+
+    def process(self) -> None:
+        """Run the handler, scheduling a retry with exponential backoff when it fails."""
+        try:
+            with transaction.atomic():
+                self.run()
+        except Exception as exc:
+            logger.exception("Webhook event failed", event_id=self.event_id, event_type=self.event_type)
+            self.fail(exc)
+        else:
+            logger.info("Webhook event processed", event_id=self.event_id, event_type=self.event_type)
+
+    def fail(self, exc: Exception) -> None:
+        self.attempts += 1
+        self.last_error = repr(exc)
+
+        if self.attempts >= settings.WEBHOOK_MAX_ATTEMPTS:
+            # Dead-lettered: kept for inspection and no longer holding back later events of its key
+            self.status = WebhookEventStatus.FAILED
+            logger.error("Webhook event dead-lettered", event_id=self.event_id, event_type=self.event_type)
+        else:
+            delay = settings.WEBHOOK_RETRY_DELAY * 2 ** (self.attempts - 1)
+            self.run_after = timezone.now() + timedelta(seconds=delay)
+
+        self.save(update_fields=["attempts", "last_error", "status", "run_after", "updated_at"])
@@ -0,0 +1,24 @@
+from django.db import models
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from .choices import WebhookEventStatus
+
+
+class WebhookEventQuerySet(models.QuerySet):
+    def due(self):
+        return self.filter(status=WebhookEventStatus.PENDING, run_after__lte=timezone.now())
+
+    def heads(self):
+        """Keep the events without an earlier pending event for the same ordering key.
+
+        Events of a key are processed one at a time in the order they occurred, so a retried event holds back the
+        ones after it until it succeeds or is dead-lettered.
+        """
+        earlier = self.model.objects.filter(
+            Q(occurred_at__lt=OuterRef("occurred_at"))
+            | Q(occurred_at=OuterRef("occurred_at"), created_at__lt=OuterRef("created_at")),
+            ordering_key=OuterRef("ordering_key"),
+            status=WebhookEventStatus.PENDING,
+        )
+        return self.exclude(Exists(earlier))
@@ -0,0 +1,182 @@
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from openinvoice.analytics.models import InvoiceRollup
+from openinvoice.invoices.choices import InvoiceStatus
+from openinvoice.invoices.models import Invoice, InvoiceHead
+from tests.factories import CustomerFactory, InvoiceFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def rollups(account):
+    return sorted(
+        (
+            rollup.customer_id,
+            rollup.status,
+            rollup.issue_month,
+            rollup.due_month,
+            rollup.total_amount,
+            rollup.invoice_count,
+            sorted(rollup.invoice_ids),
+        )
+        for rollup in InvoiceRollup.objects.filter(account=account)
+    )
+
+
+def test_invoice_rollup_tracks_inserts(account):
+    customer = CustomerFactory(account=account)
+    first = InvoiceFactory(
+        account=account,
+        customer=customer,
+        status=InvoiceStatus.PAID,
+        issue_date=date(2024, 1, 5),
+        due_date=date(2024, 1, 19),
+        total_amount=Decimal("100"),
+    )
+    second = InvoiceFactory(
+        account=account,
+        customer=customer,
+        status=InvoiceStatus.PAID,
+        issue_date=date(2024, 1, 20),
+        due_date=date(2024, 1, 31),
+        total_amount=Decimal("50"),
+    )
+
+    assert rollups(account) == [
+        (
+            customer.id,
+            InvoiceStatus.PAID,
+            date(2024, 1, 1),
+            date(2024, 1, 1),
+            Decimal("150.00"),
+            2,
+            sorted([first.id, second.id]),
+        )
+    ]
+
+
+def test_invoice_rollup_moves_invoice_on_status_change(account):
+    customer = CustomerFactory(account=account)
+    invoice = InvoiceFactory(
+        account=account,
+        customer=customer,
+        status=InvoiceStatus.OPEN,
+        issue_date=date(2024, 1, 5),
+        due_date=date(2024, 2, 4),
+        total_amount=Decimal("100"),
+    )
+
+    invoice.status = InvoiceStatus.PAID
+    invoice.save()
+
+    assert rollups(account) == [
+        (
+            customer.id,
+            InvoiceStatus.PAID,
+            date(2024, 1, 1),
+            date(2024, 2, 1),
+            Decimal("100.00"),
+            1,
+            [invoice.id],
+        )
+    ]
+
+
+def test_invoice_rollup_tracks_bulk_updates(account):
+    customer = CustomerFactory(account=account)
+    invoice = InvoiceFactory(
+        account=account,
+        customer=customer,
+        status=InvoiceStatus.OPEN,
+        issue_date=date(2024, 1, 5),
+        due_date=date(2024, 2, 4),
+        total_amount=Decimal("100"),
+    )
+    other = InvoiceFactory(
+        account=account,
+        customer=customer,
+        status=InvoiceStatus.OPEN,
+        issue_date=date(2024, 1, 5),
+        due_date=date(2024, 2, 4),
+        total_amount=Decimal("20"),
+    )
+
+    Invoice.objects.filter(id=invoice.id).update(total_amount=Decimal("80"))
+
+    assert rollups(account) == [
+        (
+            customer.id,
+            InvoiceStatus.OPEN,
+            date(2024, 1, 1),
+            date(2024, 2, 1),
+            Decimal("100.00"),
+            2,
+            sorted([invoice.id, other.id]),
+        ),
+    ]
+
+
+def test_invoice_rollup_ignores_drafts(account):
+    customer = CustomerFactory(account=account)
+    invoice = InvoiceFactory(
+        account=account,
+        customer=customer,
+        status=InvoiceStatus.DRAFT,
+        issue_date=None,
+        due_date=None,
+        total_amount=Decimal("100"),
+    )
+
+    Invoice.objects.filter(id=invoice.id).update(total_amount=Decimal("80"))
+
+    assert rollups(account) == []
+
+
+def test_invoice_rollup_drops_deleted_invoices(account):
+    invoice = InvoiceFactory(account=account, status=InvoiceStatus.OPEN, total_amount=Decimal("10"))
+    InvoiceHead.objects.filter(id=invoice.head_id).update(root=None, current=None)
+
+    invoice.delete()
+
+    assert rollups(account) == []
+
+
+def test_rebuild_invoice_rollups(account):
+    customer = CustomerFactory(account=account)
+    invoices = InvoiceFactory.create_batch(
+        3,
+        account=account,
+        customer=customer,
+        status=InvoiceStatus.OPEN,
+        issue_date=date(2024, 3, 1),
+        due_date=date(2024, 3, 15),
+        total_amount=Decimal("10"),
+    )
+    expected = rollups(account)
+    InvoiceRollup.objects.filter(account=account).update(total_amount=Decimal("0"), invoice_count=0, invoice_ids=[])
+    InvoiceFactory(status=InvoiceStatus.OPEN)  # other account
+
+    assert InvoiceRollup.objects.rebuild(account.id) == 1
+    assert rollups(account) == expected
+    assert expected[0][-1] == sorted(invoice.id for invoice in invoices)
+
+
+def test_rebuild_invoice_rollups_command(account):
+    InvoiceFactory(account=account, status=InvoiceStatus.PAID, total_amount=Decimal("10"))
+    InvoiceRollup.objects.all().delete()
+
+    out = StringIO()
+    call_command("rebuild_invoice_rollups", "--account", str(account.id), stdout=out)
+
+    assert InvoiceRollup.objects.filter(account=account).count() == 1
+    assert "Rebuilt 1 invoice rollups" in out.getvalue()
+
+
+def test_rebuild_invoice_rollups_command_requires_scope():
+    with pytest.raises(CommandError):
+        call_command("rebuild_invoice_rollups")
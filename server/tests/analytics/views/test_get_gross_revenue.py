@@ -237,3 +237,21 @@ def test_get_gross_revenue_rejects_foreign_account(api_client, user, account):
     assert response.status_code == 200
     assert all(Decimal(item["total_amount"]) == Decimal("0") for item in response.data)
     assert all(item["invoice_count"] == 0 for item in response.data)
+
+
+@freeze_time("2025-01-20")
+def test_get_gross_revenue_includes_whole_current_month(api_client, user, account):
+    InvoiceFactory(
+        account=account,
+        status=InvoiceStatus.PAID,
+        currency="PLN",
+        issue_date=date(2025, 1, 15),
+        total_amount=Decimal("25"),
+    )
+
+    api_client.force_login(user)
+    api_client.force_account(account)
+    response = api_client.get("/api/v1/analytics/gross-revenue")
+
+    assert response.status_code == 200
+    assert response.data[-1] == {"date": "2025-01-01", "currency": "PLN", "total_amount": "25.00", "invoice_count": 1}
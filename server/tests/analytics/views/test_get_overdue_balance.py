@@ -244,3 +244,38 @@ def test_get_overdue_balance_rejects_foreign_account(api_client, user, account):
     assert response.status_code == 200
     assert all(item["invoice_ids"] == [] for item in response.data)
     assert all(Decimal(item["total_amount"]) == Decimal("0") for item in response.data)
+
+
+@freeze_time("2025-01-20")
+def test_get_overdue_balance_current_month_up_to_today(api_client, user, account):
+    overdue = InvoiceFactory(
+        account=account,
+        status=InvoiceStatus.OPEN,
+        currency="PLN",
+        due_date=date(2025, 1, 10),
+        total_amount=Decimal("10"),
+    )
+    InvoiceFactory(
+        account=account,
+        status=InvoiceStatus.OPEN,
+        currency="PLN",
+        due_date=date(2025, 1, 25),
+        total_amount=Decimal("20"),
+    )
+    previous = InvoiceFactory(
+        account=account,
+        status=InvoiceStatus.OPEN,
+        currency="PLN",
+        due_date=date(2024, 12, 28),
+        total_amount=Decimal("30"),
+    )
+
+    api_client.force_login(user)
+    api_client.force_account(account)
+    response = api_client.get("/api/v1/analytics/overdue-balance")
+
+    assert response.status_code == 200
+    assert response.data[-2:] == [
+        {"date": "2024-12-01", "currency": "PLN", "total_amount": "30.00", "invoice_ids": [str(previous.id)]},
+        {"date": "2025-01-01", "currency": "PLN", "total_amount": "10.00", "invoice_ids": [str(overdue.id)]},
+    ]
@@ -1,4 +1,5 @@
 import pytest
+from django.core.cache import cache
 from factory.django import FileField
 
 from openinvoice.core.pdf import get_generator
@@ -50,6 +51,15 @@ def subscribed_account(account):
     return account
 
 
+@pytest.fixture
+def locmem_cache(settings):
+    """Replace the dummy test cache with a local memory one, emptied around the test."""
+    settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    cache.clear()
+    yield cache
+    cache.clear()
+
+
 @pytest.fixture
 def pdf_generator():
     generator = get_generator()
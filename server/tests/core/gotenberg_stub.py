@@ -0,0 +1,64 @@
+"""Local stand-in for a Gotenberg server, to test the backend and measure its throughput."""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class GotenbergStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "GotenbergStub"
+
+    def do_POST(self):  # noqa: N802
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        stub = self.server
+        with stub.lock:
+            stub.requests += 1
+            stub.connections.add(self.client_address)
+            stub.in_flight += 1
+            stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+            status = stub.statuses.pop(0) if stub.statuses else 200
+
+        time.sleep(stub.latency)
+        body = b"%PDF-1.7 stub" if status == 200 else b"Service Unavailable"
+
+        with stub.lock:
+            stub.in_flight -= 1
+        self.send_response(status)
+        self.send_header("Content-Type", "application/pdf" if status == 200 else "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_):
+        pass
+
+
+class GotenbergStub(ThreadingHTTPServer):
+    """Answers every conversion with a small PDF after ``latency`` seconds, or with the queued ``statuses``."""
+
+    daemon_threads = True
+
+    def __init__(self, latency: float = 0.0):
+        super().__init__(("127.0.0.1", 0), GotenbergStubHandler)
+        self.latency = latency
+        self.statuses: list[int] = []
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.connections: set[tuple[str, int]] = set()
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *_):
+        self.shutdown()
+        self.server_close()
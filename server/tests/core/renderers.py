@@ -0,0 +1,19 @@
+"""Renderer factories for the PDF worker pool tests, importable by spawned workers without Django."""
+
+import os
+import time
+
+
+def load_echo_renderer(options):
+    prefix = options["prefix"]
+
+    def render(html):
+        if html == "sleep":
+            time.sleep(60)
+        if html == "crash":
+            os._exit(1)
+        if html == "fail":
+            raise ValueError("Invalid document")
+        return f"{prefix}:{html}:{os.getpid()}".encode()
+
+    return render
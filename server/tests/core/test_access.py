@@ -0,0 +1,27 @@
+import pytest
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.test import RequestFactory
+
+from openinvoice.accounts.middlewares import AccountMiddleware
+from tests.factories import StripeCustomerFactory, StripeSubscriptionFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def plans(settings):
+    settings.STRIPE_API_KEY = "sk_test_api_key"
+    settings.PLANS = {**settings.PLANS, "pro": {"name": "Pro", "features": {}, "limits": {}, "price_id": "price_pro"}}
+
+
+@pytest.mark.usefixtures("plans")
+def test_request_plan_is_resolved_once_per_request(user, account, django_assert_num_queries):
+    StripeSubscriptionFactory(stripe_customer=StripeCustomerFactory(account=account), price_id="price_pro")
+    request = RequestFactory().get("/")
+    request.user = user
+    SessionMiddleware(lambda _: None).process_request(request)
+    AccountMiddleware(lambda _: None).process_request(request)
+
+    with django_assert_num_queries(1):
+        assert request.plan == "pro"
+        assert request.plan == "pro"
@@ -0,0 +1,96 @@
+import asyncio
+import time
+
+import pytest
+
+from openinvoice.core.pdf.backends.gotenberg import GotenbergBackend
+from openinvoice.core.pdf.exceptions import PdfError, PdfGenerationError
+from tests.core.gotenberg_stub import GotenbergStub
+
+
+@pytest.fixture
+def stub():
+    with GotenbergStub(latency=0.05) as stub:
+        yield stub
+
+
+@pytest.fixture
+def backend(settings, stub):
+    settings.GOTENBERG_URL = stub.url
+    settings.GOTENBERG_TIMEOUT = 5
+    settings.GOTENBERG_MAX_IN_FLIGHT = 4
+    settings.GOTENBERG_MAX_RETRIES = 2
+    settings.GOTENBERG_RETRY_DELAY = 0.01
+    settings.GOTENBERG_FAILURE_THRESHOLD = 2
+    settings.GOTENBERG_RESET_TIMEOUT = 0.2
+    settings.PDF_RENDER_THREADS = 8
+    return GotenbergBackend()
+
+
+def test_generate_returns_pdf(backend, stub):
+    assert backend.generate("<p>Invoice</p>") == b"%PDF-1.7 stub"
+    assert stub.requests == 1
+
+
+def test_generate_many_limits_requests_in_flight_and_reuses_connections(backend, stub):
+    started_at = time.perf_counter()
+    contents = backend.generate_many([f"<p>{i}</p>" for i in range(16)])
+    elapsed = time.perf_counter() - started_at
+
+    assert contents == [b"%PDF-1.7 stub"] * 16
+    assert stub.max_in_flight == 4
+    assert len(stub.connections) <= 4
+    # 16 documents at 50ms each take 800ms one by one and 200ms four at a time
+    assert elapsed < 0.6
+
+
+def test_agenerate_many_limits_requests_in_flight(backend, stub):
+    async def generate():
+        try:
+            return await backend.agenerate_many([f"<p>{i}</p>" for i in range(16)])
+        finally:
+            await backend.aclose()
+
+    assert asyncio.run(generate()) == [b"%PDF-1.7 stub"] * 16
+    assert stub.max_in_flight == 4
+    assert len(stub.connections) <= 4
+
+
+def test_generate_retries_busy_responses(backend, stub):
+    stub.statuses = [503, 503]
+
+    assert backend.generate("<p>Invoice</p>") == b"%PDF-1.7 stub"
+    assert stub.requests == 3
+
+
+def test_generate_does_not_retry_rejected_documents(backend, stub):
+    stub.statuses = [400]
+
+    with pytest.raises(PdfGenerationError, match="rejected"):
+        backend.generate("<p>Invoice</p>")
+    assert stub.requests == 1
+
+
+def test_circuit_opens_after_consecutive_failures(backend, stub):
+    stub.statuses = [503] * 6
+
+    for _ in range(2):
+        with pytest.raises(PdfGenerationError, match="status 503"):
+            backend.generate("<p>Invoice</p>")
+    with pytest.raises(PdfGenerationError, match="unavailable"):
+        backend.generate("<p>Invoice</p>")
+    assert stub.requests == 6
+
+    time.sleep(0.2)
+    assert backend.generate("<p>Invoice</p>") == b"%PDF-1.7 stub"
+    assert backend.generate("<p>Invoice</p>") == b"%PDF-1.7 stub"
+
+
+@pytest.mark.usefixtures("backend")
+def test_generate_raises_when_gotenberg_is_unreachable(settings, stub):
+    stub.shutdown()
+    stub.server_close()
+    settings.GOTENBERG_MAX_RETRIES = 0
+
+    with pytest.raises(PdfError, match="unreachable"):
+        GotenbergBackend().generate("<p>Invoice</p>")
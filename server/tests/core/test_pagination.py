@@ -0,0 +1,105 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from openinvoice.payments.models import Payment
+from tests.factories import PaymentFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def payments(account):
+    payments = PaymentFactory.create_batch(5, account=account)
+    now = timezone.now()
+    # Two payments share a timestamp so pages have to be split on the id as well
+    for index, payment in enumerate(payments):
+        Payment.objects.filter(id=payment.id).update(created_at=now - timedelta(minutes=min(index, 3)))
+    return sorted(
+        Payment.objects.filter(account=account),
+        key=lambda payment: (payment.created_at, payment.id),
+        reverse=True,
+    )
+
+
+def ids(response):
+    return [result["id"] for result in response.data["results"]]
+
+
+def test_page_number_pagination_is_the_default(api_client, user, account, payments):
+    api_client.force_login(user)
+    api_client.force_account(account)
+    response = api_client.get("/api/v1/payments", {"page_size": 2})
+
+    assert response.status_code == 200
+    assert response.data["count"] == 5
+    assert ids(response) == [str(payment.id) for payment in payments[:2]]
+
+
+def test_cursor_pagination_walks_all_pages(api_client, user, account, payments):
+    api_client.force_login(user)
+    api_client.force_account(account)
+    response = api_client.get("/api/v1/payments", {"pagination": "cursor", "page_size": 2})
+
+    pages = [ids(response)]
+    assert "count" not in response.data
+    assert response.data["previous"] is None
+    while response.data["next"]:
+        response = api_client.get(response.data["next"])
+        assert response.status_code == 200
+        pages.append(ids(response))
+
+    assert pages == [[str(payment.id) for payment in payments[i : i + 2]] for i in range(0, 5, 2)]
+
+
+@pytest.mark.usefixtures("payments")
+def test_cursor_pagination_previous_link(api_client, user, account):
+    api_client.force_login(user)
+    api_client.force_account(account)
+    first = api_client.get("/api/v1/payments", {"pagination": "cursor", "page_size": 2})
+    second = api_client.get(first.data["next"])
+    third = api_client.get(second.data["next"])
+
+    previous = api_client.get(third.data["previous"])
+
+    assert third.data["next"] is None
+    assert ids(previous) == ids(second)
+    assert ids(api_client.get(previous.data["previous"])) == ids(first)
+    assert api_client.get(previous.data["previous"]).data["previous"] is None
+
+
+def test_cursor_pagination_ascending_ordering(api_client, user, account, payments):
+    api_client.force_login(user)
+    api_client.force_account(account)
+    first = api_client.get("/api/v1/payments", {"pagination": "cursor", "page_size": 3, "ordering": "created_at"})
+    second = api_client.get(first.data["next"])
+
+    assert ids(first) + ids(second) == [str(payment.id) for payment in reversed(payments)]
+
+
+@pytest.mark.usefixtures("payments")
+def test_cursor_pagination_estimated_count(api_client, user, account):
+    api_client.force_login(user)
+    api_client.force_account(account)
+    response = api_client.get("/api/v1/payments", {"pagination": "cursor", "estimate_count": "true"})
+
+    assert response.status_code == 200
+    assert isinstance(response.data["estimated_count"], int)
+    assert response.data["next"] is None
+
+
+def test_cursor_pagination_rejects_invalid_cursor(api_client, user, account):
+    api_client.force_login(user)
+    api_client.force_account(account)
+    response = api_client.get("/api/v1/payments", {"cursor": "not-a-cursor"})
+
+    assert response.status_code == 404
+
+
+def test_cursor_pagination_requires_created_at_ordering(api_client, user, account):
+    api_client.force_login(user)
+    api_client.force_account(account)
+    response = api_client.get("/api/v1/invoices", {"pagination": "cursor", "ordering": "due_date"})
+
+    assert response.status_code == 400
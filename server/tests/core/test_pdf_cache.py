@@ -0,0 +1,130 @@
+import os
+import time
+from unittest.mock import patch
+
+from openinvoice.core import pdf
+from openinvoice.core.pdf import generate_pdf
+from openinvoice.core.pdf.backends.dummy import DummyBackend
+from openinvoice.core.pdf.cache import PdfCache
+from openinvoice.core.pdf.stores.base import PdfStore
+from openinvoice.core.pdf.stores.filesystem import FileSystemStore
+from openinvoice.core.pdf.stores.storage import StorageStore
+
+
+class ZoomedBackend(DummyBackend):
+    @property
+    def options(self):
+        return {"zoom": 2}
+
+
+class BrokenStore(PdfStore):
+    def get(self, _key):
+        raise OSError("Store unavailable")
+
+    def set(self, _key, _content):
+        raise OSError("Store unavailable")
+
+
+def test_pdf_cache_skips_generation_for_cached_html(tmp_path):
+    cache = PdfCache(FileSystemStore(location=tmp_path, max_size=1024))
+    backend = DummyBackend()
+
+    assert cache.generate(backend, ["<p>1</p>", "<p>2</p>"]) == [b"PDF content", b"PDF content"]
+    assert cache.generate(backend, ["<p>2</p>", "<p>3</p>"]) == [b"PDF content", b"PDF content"]
+
+    assert backend.requests == ["<p>1</p>", "<p>2</p>", "<p>3</p>"]
+    assert cache.stats() == {"hits": 1, "misses": 3, "hit_rate": 0.25}
+
+
+def test_pdf_cache_generates_identical_html_once(tmp_path):
+    cache = PdfCache(FileSystemStore(location=tmp_path, max_size=1024))
+    backend = DummyBackend()
+
+    assert cache.generate(backend, ["<p>1</p>", "<p>1</p>"]) == [b"PDF content", b"PDF content"]
+    assert backend.requests == ["<p>1</p>"]
+
+
+def test_pdf_cache_key_includes_backend_options():
+    cache = PdfCache(BrokenStore())
+
+    assert cache.key(DummyBackend(), "<p>1</p>") != cache.key(ZoomedBackend(), "<p>1</p>")
+    assert cache.key(DummyBackend(), "<p>1</p>") == cache.key(DummyBackend(), "<p>1</p>")
+
+
+def test_pdf_cache_key_includes_asset_content(tmp_path, settings):
+    stylesheet = tmp_path / "css" / "pdf.css"
+    stylesheet.parent.mkdir()
+    stylesheet.write_text("body { color: black; }")
+    settings.STATICFILES_DIRS = [str(tmp_path)]
+    key = PdfCache(BrokenStore(), assets=["css/pdf.css"]).key(DummyBackend(), "<p>1</p>")
+
+    stylesheet.write_text("body { color: red; }")
+
+    assert PdfCache(BrokenStore(), assets=["css/pdf.css"]).key(DummyBackend(), "<p>1</p>") != key
+
+
+def test_pdf_cache_key_ignores_link_query_strings():
+    cache = PdfCache(BrokenStore())
+
+    assert cache.key(DummyBackend(), '<link href="https://s3/static/pdf.css?Signature=a&amp;Expires=1">') == cache.key(
+        DummyBackend(), '<link href="https://s3/static/pdf.css?Signature=b&amp;Expires=2">'
+    )
+
+
+def test_pdf_cache_treats_store_failures_as_misses():
+    cache = PdfCache(BrokenStore())
+    backend = DummyBackend()
+
+    assert cache.generate(backend, ["<p>1</p>"]) == [b"PDF content"]
+    assert cache.generate(backend, ["<p>1</p>"]) == [b"PDF content"]
+    assert cache.stats()["misses"] == 2
+
+
+def test_filesystem_store_evicts_least_recently_used(tmp_path):
+    store = FileSystemStore(location=tmp_path, max_size=25)
+    store.set("aa1", b"0123456789")
+    store.set("bb2", b"0123456789")
+    old = time.time() - 60
+    os.utime(store.path("aa1"), (old, old))
+    os.utime(store.path("bb2"), (old - 60, old - 60))
+    store.get("bb2")
+
+    store.set("cc3", b"0123456789")
+
+    assert store.get("aa1") is None
+    assert store.get("bb2") == b"0123456789"
+    assert store.get("cc3") == b"0123456789"
+
+
+def test_storage_store_evicts_oldest_entries():
+    store = StorageStore(max_size=25, location="pdf-cache-test")
+    store.set("aa1", b"0123456789")
+    store.set("bb2", b"0123456789")
+    store.set("cc3", b"0123456789")
+
+    assert store.get("aa1") is None
+    assert store.get("bb2") == b"0123456789"
+    assert store.get("cc3") == b"0123456789"
+
+
+def test_storage_store_only_lists_entries_when_full():
+    store = StorageStore(max_size=25, location="pdf-cache-listing-test")
+
+    with patch.object(store, "evict", wraps=store.evict) as evict:
+        store.set("aa1", b"0123456789")
+        store.set("bb2", b"0123456789")
+        assert evict.call_count == 1
+
+        store.set("cc3", b"0123456789")
+        assert evict.call_count == 2
+
+    assert store.size == 20
+
+
+def test_generate_pdf_uses_configured_cache(tmp_path, monkeypatch, pdf_generator):
+    monkeypatch.setattr(pdf, "_CACHE", PdfCache(FileSystemStore(location=tmp_path, max_size=1024)))
+
+    assert generate_pdf("<p>1</p>") == b"PDF content"
+    assert generate_pdf("<p>1</p>") == b"PDF content"
+
+    assert pdf_generator.requests == ["<p>1</p>"]
@@ -0,0 +1,70 @@
+import pytest
+
+from openinvoice.core.pdf.exceptions import PdfError, PdfGenerationError
+from openinvoice.core.pdf.workers import WorkerPool
+from tests.core.renderers import load_echo_renderer
+
+
+@pytest.fixture
+def make_pool():
+    pools = []
+
+    def make(**kwargs):
+        options = {"size": 1, "timeout": 5, "max_memory": 1024**4} | kwargs
+        pool = WorkerPool(factory=load_echo_renderer, options={"prefix": "pdf"}, **options)
+        pools.append(pool)
+        return pool
+
+    yield make
+
+    for pool in pools:
+        pool.close()
+
+
+def render(pool, html):
+    prefix, content, pid = pool.render(html).decode().split(":")
+    assert (prefix, content) == ("pdf", html)
+    return int(pid)
+
+
+def test_worker_pool_reuses_warm_workers(make_pool):
+    pool = make_pool()
+
+    assert render(pool, "first") == render(pool, "second")
+
+
+def test_worker_pool_reports_render_errors_and_keeps_worker(make_pool):
+    pool = make_pool()
+    pid = render(pool, "first")
+
+    with pytest.raises(PdfGenerationError, match="Invalid document"):
+        pool.render("fail")
+
+    assert render(pool, "second") == pid
+
+
+def test_worker_pool_replaces_timed_out_worker(make_pool):
+    pool = make_pool(timeout=0.5)
+    pid = render(pool, "first")
+
+    with pytest.raises(PdfGenerationError, match="timed out"):
+        pool.render("sleep")
+
+    assert render(pool, "second") != pid
+
+
+def test_worker_pool_replaces_crashed_worker(make_pool):
+    pool = make_pool()
+    pid = render(pool, "first")
+
+    with pytest.raises(PdfError, match="exited unexpectedly"):
+        pool.render("crash")
+
+    assert render(pool, "second") != pid
+
+
+def test_worker_pool_recycles_worker_over_memory_threshold(make_pool):
+    pool = make_pool(max_memory=1)
+    pid = render(pool, "first")
+
+    assert render(pool, "second") != pid
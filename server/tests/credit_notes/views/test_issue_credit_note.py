@@ -2,10 +2,12 @@ import uuid
 from decimal import Decimal
 
 import pytest
+from django.core.management import call_command
 from django.utils import timezone
 
 from openinvoice.credit_notes.choices import CreditNoteDeliveryMethod, CreditNoteStatus
 from openinvoice.invoices.choices import InvoiceStatus
+from openinvoice.rendering.choices import RenderStatus
 from tests.factories import (
     CreditNoteFactory,
     CreditNoteLineFactory,
@@ -42,7 +44,9 @@ def test_issue_credit_note(api_client, user, account):
     assert response.data["pdf_id"] == str(credit_note.pdf_id)
 
 
-def test_issue_credit_note_with_automatic_delivery_method(api_client, user, account, mailoutbox):
+def test_issue_credit_note_with_automatic_delivery_method(
+    api_client, user, account, mailoutbox, django_capture_on_commit_callbacks
+):
     StripeSubscriptionFactory(stripe_customer__account=account)
     invoice = InvoiceFactory(account=account, status=InvoiceStatus.OPEN)
     credit_note = CreditNoteFactory(
@@ -52,7 +56,8 @@ def test_issue_credit_note_with_automatic_delivery_method(api_client, user, acco
 
     api_client.force_login(user)
     api_client.force_account(account)
-    response = api_client.post(f"/api/v1/credit-notes/{credit_note.id}/issue")
+    with django_capture_on_commit_callbacks(execute=True):
+        response = api_client.post(f"/api/v1/credit-notes/{credit_note.id}/issue")
 
     assert response.status_code == 200
     assert len(mailoutbox) == 1
@@ -61,6 +66,37 @@ def test_issue_credit_note_with_automatic_delivery_method(api_client, user, acco
     assert email.attachments[0][0] == f"{credit_note.effective_number}.pdf"
 
 
+def test_issue_credit_note_renders_pdf_asynchronously(
+    api_client, user, account, settings, mailoutbox, django_capture_on_commit_callbacks
+):
+    settings.PDF_RENDER_ASYNC = True
+    StripeSubscriptionFactory(stripe_customer__account=account)
+    invoice = InvoiceFactory(account=account, status=InvoiceStatus.OPEN)
+    credit_note = CreditNoteFactory(
+        invoice=invoice, number="CN-1", delivery_method=CreditNoteDeliveryMethod.AUTOMATIC, recipients=["a@example.com"]
+    )
+    CreditNoteLineFactory(credit_note=credit_note, invoice_line=None, amount=Decimal("10.00"))
+
+    api_client.force_login(user)
+    api_client.force_account(account)
+    response = api_client.post(f"/api/v1/credit-notes/{credit_note.id}/issue")
+
+    assert response.status_code == 200
+    assert response.data["status"] == CreditNoteStatus.ISSUED
+    assert response.data["pdf_id"] is None
+    assert response.data["pdf_status"] == RenderStatus.PENDING
+    assert len(mailoutbox) == 0
+
+    with django_capture_on_commit_callbacks(execute=True):
+        call_command("process_render_jobs", "--once")
+
+    credit_note.refresh_from_db()
+    assert credit_note.pdf_id is not None
+    assert credit_note.pdf_status == RenderStatus.READY
+    assert len(mailoutbox) == 1
+    assert mailoutbox[0].attachments[0][0] == f"{credit_note.effective_number}.pdf"
+
+
 def test_issue_credit_note_automatic_without_recipients(api_client, user, account, mailoutbox):
     StripeSubscriptionFactory(stripe_customer__account=account)
     invoice = InvoiceFactory(account=account, status=InvoiceStatus.OPEN)
@@ -61,6 +61,7 @@ def test_update_credit_note(api_client, user, account):
         "issued_at": None,
         "voided_at": None,
         "pdf_id": None,
+        "pdf_status": None,
         "billing_profile": {
             "id": str(invoice.billing_profile.id),
             "legal_name": invoice.billing_profile.legal_name,
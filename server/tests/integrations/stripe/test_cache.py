@@ -0,0 +1,54 @@
+import pytest
+
+from openinvoice.integrations.stripe.cache import connection_cache
+from openinvoice.integrations.stripe.models import StripeConnection
+from tests.factories import StripeConnectionFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_connection_cache():
+    connection_cache.clear()
+    yield
+    connection_cache.clear()
+
+
+def test_get_caches_connection_and_client(django_assert_num_queries):
+    connection = StripeConnectionFactory(webhook_secret="whsec_123")  # noqa: S106
+
+    first = connection_cache.get(connection.id)
+    with django_assert_num_queries(0):
+        second = connection_cache.get(connection.id)
+
+    assert second is first
+    assert first.account_id == connection.account_id
+    assert first.webhook_secret == "whsec_123"  # noqa: S105
+    assert first.client is second.client
+
+
+def test_get_reloads_expired_connection(settings):
+    settings.STRIPE_CONNECTION_CACHE_TIMEOUT = 0
+    connection = StripeConnectionFactory()
+
+    assert connection_cache.get(connection.id) is not connection_cache.get(connection.id)
+
+
+def test_update_invalidates_connection():
+    connection = StripeConnectionFactory(redirect_url=None)
+    connection_cache.get(connection.id)
+
+    connection.update(name="Renamed", redirect_url="https://example.com/paid")
+
+    assert connection_cache.get(connection.id).redirect_url == "https://example.com/paid"
+
+
+def test_delete_invalidates_connection():
+    connection = StripeConnectionFactory()
+    connection_id = connection.id
+    connection_cache.get(connection_id)
+
+    connection.delete()
+
+    with pytest.raises(StripeConnection.DoesNotExist):
+        connection_cache.get(connection_id)
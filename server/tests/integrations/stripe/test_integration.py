@@ -0,0 +1,45 @@
+import uuid
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from openinvoice.integrations.choices import PaymentProvider
+from openinvoice.integrations.exceptions import IntegrationConnectionError
+from openinvoice.integrations.stripe.cache import connection_cache
+from openinvoice.integrations.stripe.integration import StripeIntegration
+from tests.factories import AccountFactory, InvoiceFactory, StripeConnectionFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_connection_cache():
+    connection_cache.clear()
+    yield
+    connection_cache.clear()
+
+
+def test_checkout_reuses_connection_client(account):
+    connection = StripeConnectionFactory(account=account)
+    invoices = InvoiceFactory.create_batch(
+        2, account=account, payment_provider=PaymentProvider.STRIPE, payment_connection_id=connection.id
+    )
+    client = connection_cache.get(connection.id).client
+
+    with patch.object(client.checkout.sessions, "create") as create:
+        create.return_value = SimpleNamespace(id="cs_123", url="https://checkout.stripe.com/c/cs_123")
+        results = [StripeIntegration().checkout(invoice, uuid.uuid4()) for invoice in invoices]
+
+    assert results == [("cs_123", "https://checkout.stripe.com/c/cs_123")] * 2
+    assert create.call_count == 2
+
+
+def test_checkout_rejects_connection_of_another_account(account):
+    connection = StripeConnectionFactory(account=AccountFactory())
+    invoice = InvoiceFactory(
+        account=account, payment_provider=PaymentProvider.STRIPE, payment_connection_id=connection.id
+    )
+
+    with pytest.raises(IntegrationConnectionError):
+        StripeIntegration().checkout(invoice, uuid.uuid4())
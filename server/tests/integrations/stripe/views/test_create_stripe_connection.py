@@ -42,14 +42,16 @@ def test_create_stripe_connection(api_client, user, account, settings, webhook_e
     assert connection.webhook_endpoint_id == "we_1234567890"
     assert connection.webhook_secret == "whsec_1234567890"  # noqa: S105
     webhook_endpoint_mock.assert_called_once_with(
-        url=f"{settings.BASE_URL}/api/v1/integrations/stripe/connections/{connection.id}/webhook",
-        description="OpenInvoice connection - test_code",
-        enabled_events=[
-            "checkout.session.completed",
-            "checkout.session.async_payment_succeeded",
-            "checkout.session.async_payment_failed",
-            "checkout.session.expired",
-        ],
+        params={
+            "url": f"{settings.BASE_URL}/api/v1/integrations/stripe/connections/{connection.id}/webhook",
+            "description": "OpenInvoice connection - test_code",
+            "enabled_events": [
+                "checkout.session.completed",
+                "checkout.session.async_payment_succeeded",
+                "checkout.session.async_payment_failed",
+                "checkout.session.expired",
+            ],
+        }
     )
 
 
@@ -9,6 +9,8 @@ import pytest
 from openinvoice.integrations.choices import PaymentProvider
 from openinvoice.invoices.choices import InvoiceStatus
 from openinvoice.payments.choices import PaymentStatus
+from openinvoice.webhooks.choices import WebhookEventStatus
+from openinvoice.webhooks.models import WebhookEvent
 from tests.factories import (
     InvoiceFactory,
     PaymentFactory,
@@ -47,11 +49,13 @@ def test_process_stripe_checkout_completed_webhook(api_client, account, construc
 
     received_at = datetime.now(UTC)
     event = {
+        "id": "evt_123",
         "type": event_type,
         "data": {
             "object": {
                 "client_reference_id": str(payment.id),
                 "created": received_at.timestamp(),
+                "payment_status": "paid",
             }
         },
     }
@@ -82,6 +86,7 @@ def test_process_stripe_checkout_completed_webhook_payment_not_found(api_client,
 
     received_at = datetime.now(UTC)
     event = {
+        "id": "evt_123",
         "type": "checkout.session.completed",
         "data": {
             "object": {
@@ -100,8 +105,11 @@ def test_process_stripe_checkout_completed_webhook_payment_not_found(api_client,
         HTTP_STRIPE_SIGNATURE="t=1,v1=abc",
     )
 
-    assert response.status_code == 400
-    assert response.content == b""
+    assert response.status_code == 200
+    webhook_event = WebhookEvent.objects.get(event_id="evt_123")
+    assert webhook_event.status == WebhookEventStatus.PENDING
+    assert webhook_event.attempts == 1
+    assert "DoesNotExist" in webhook_event.last_error
 
 
 def test_process_stripe_checkout_payment_failed_webhook(api_client, account, construct_event_mock):
@@ -126,6 +134,7 @@ def test_process_stripe_checkout_payment_failed_webhook(api_client, account, con
 
     received_at = datetime.now(UTC)
     event = {
+        "id": "evt_123",
         "type": "checkout.session.async_payment_failed",
         "data": {
             "object": {
@@ -160,6 +169,7 @@ def test_process_stripe_checkout_payment_failed_webhook_payment_not_found(api_cl
 
     received_at = datetime.now(UTC)
     event = {
+        "id": "evt_123",
         "type": "checkout.session.async_payment_failed",
         "data": {
             "object": {
@@ -178,8 +188,11 @@ def test_process_stripe_checkout_payment_failed_webhook_payment_not_found(api_cl
         HTTP_STRIPE_SIGNATURE="t=1,v1=abc",
     )
 
-    assert response.status_code == 400
-    assert response.content == b""
+    assert response.status_code == 200
+    webhook_event = WebhookEvent.objects.get(event_id="evt_123")
+    assert webhook_event.status == WebhookEventStatus.PENDING
+    assert webhook_event.attempts == 1
+    assert "DoesNotExist" in webhook_event.last_error
 
 
 def test_process_stripe_checkout_expired_webhook(api_client, account, construct_event_mock):
@@ -204,6 +217,7 @@ def test_process_stripe_checkout_expired_webhook(api_client, account, construct_
 
     received_at = datetime.now(UTC)
     event = {
+        "id": "evt_123",
         "type": "checkout.session.expired",
         "data": {
             "object": {
@@ -237,6 +251,7 @@ def test_process_stripe_checkout_expired_webhook_payment_not_found(api_client, a
 
     received_at = datetime.now(UTC)
     event = {
+        "id": "evt_123",
         "type": "checkout.session.expired",
         "data": {
             "object": {
@@ -255,5 +270,61 @@ def test_process_stripe_checkout_expired_webhook_payment_not_found(api_client, a
         HTTP_STRIPE_SIGNATURE="t=1,v1=abc",
     )
 
-    assert response.status_code == 400
-    assert response.content == b""
+    assert response.status_code == 200
+    webhook_event = WebhookEvent.objects.get(event_id="evt_123")
+    assert webhook_event.status == WebhookEventStatus.PENDING
+    assert webhook_event.attempts == 1
+    assert "DoesNotExist" in webhook_event.last_error
+
+
+@pytest.mark.parametrize(
+    ("event_type", "payment_status"),
+    [
+        ("checkout.session.completed", PaymentStatus.SUCCEEDED),
+        ("checkout.session.async_payment_succeeded", PaymentStatus.SUCCEEDED),
+        ("checkout.session.async_payment_failed", PaymentStatus.SUCCEEDED),
+        ("checkout.session.expired", PaymentStatus.SUCCEEDED),
+        ("checkout.session.completed", PaymentStatus.REJECTED),
+    ],
+)
+def test_process_stripe_checkout_webhook_for_settled_payment(
+    api_client, account, construct_event_mock, event_type, payment_status
+):
+    connection = StripeConnectionFactory(account=account)
+    invoice = InvoiceFactory(account=account, status=InvoiceStatus.OPEN, payment_connection_id=connection.id)
+    payment = PaymentFactory(
+        account=account,
+        status=payment_status,
+        provider=PaymentProvider.STRIPE,
+        connection_id=connection.id,
+        extra_data={"id": "evt_0"},
+    )
+    payment.invoices.add(invoice)
+
+    event = {
+        "id": "evt_123",
+        "type": event_type,
+        "data": {
+            "object": {
+                "client_reference_id": str(payment.id),
+                "created": datetime.now(UTC).timestamp(),
+                "payment_status": "paid",
+            }
+        },
+    }
+    construct_event_mock.side_effect = lambda **_: event
+
+    with patch("openinvoice.invoices.models.Invoice.recalculate_paid") as recalculate_paid:
+        response = api_client.post(
+            f"/api/v1/integrations/stripe/connections/{connection.id}/webhook",
+            data=json.dumps(event),
+            content_type="application/json",
+            HTTP_STRIPE_SIGNATURE="t=1,v1=abc",
+        )
+
+    assert response.status_code == 200
+    payment.refresh_from_db()
+    assert payment.status == payment_status
+    assert payment.extra_data == {"id": "evt_0"}
+    recalculate_paid.assert_not_called()
+    assert WebhookEvent.objects.get(event_id="evt_123").status == WebhookEventStatus.PROCESSED
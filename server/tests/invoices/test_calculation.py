@@ -1307,3 +1307,226 @@ def test_shipping_tax_allocations_do_not_mix_with_line_tax_allocations():
 
     assert line.tax_allocations.get(tax_rate=line_tax_rate).source == InvoiceTaxSource.LINE
     assert shipping.tax_allocations.get(tax_rate=shipping_tax_rate).source == InvoiceTaxSource.SHIPPING
+
+
+def test_recalculate_invoice_query_count_does_not_scale_with_lines(django_assert_num_queries):
+    invoice = InvoiceFactory(currency="EUR", tax_behavior=InvoiceTaxBehavior.EXCLUSIVE)
+    invoice_coupon = CouponFactory(account=invoice.account, currency="EUR", percentage=Decimal("5"), amount=None)
+    invoice_tax_rate = TaxRateFactory(account=invoice.account, percentage=Decimal("20"))
+    invoice.set_coupons([invoice_coupon])
+    invoice.set_tax_rates([invoice_tax_rate])
+
+    for idx in range(10):
+        line = InvoiceLineFactory(invoice=invoice, unit_amount=Decimal("10"), quantity=idx + 1, amount=Decimal("0"))
+        if idx % 2:
+            line.set_coupons([CouponFactory(account=invoice.account, currency="EUR", percentage=Decimal("10"))])
+            line.set_tax_rates([TaxRateFactory(account=invoice.account, percentage=Decimal("7"))])
+
+    # 2 deletes, lines, line coupons, line tax rates, invoice coupons, invoice tax rates,
+    # 2 allocation inserts, line update and invoice update
+    with django_assert_num_queries(11):
+        invoice.recalculate()
+
+    invoice.refresh_from_db()
+    assert invoice.discount_allocations.count() == 10
+    assert invoice.tax_allocations.count() == 10
+
+
+def snapshot_invoice_calculation(invoice):
+    invoice.refresh_from_db()
+    return (
+        [
+            (line.id, line.subtotal_amount, line.total_excluding_tax_amount, line.total_tax_amount, line.total_amount)
+            for line in invoice.lines.order_by("id")
+        ],
+        sorted(
+            (allocation.invoice_line_id, allocation.coupon_id, allocation.source, allocation.amount)
+            for allocation in invoice.discount_allocations.all()
+        ),
+        sorted(
+            (str(allocation.invoice_line_id), allocation.tax_rate_id, allocation.source, allocation.amount)
+            for allocation in invoice.tax_allocations.all()
+        ),
+        (
+            invoice.subtotal_amount,
+            invoice.total_discount_amount,
+            invoice.total_excluding_tax_amount,
+            invoice.shipping_amount,
+            invoice.total_tax_amount,
+            invoice.total_amount,
+            invoice.outstanding_amount,
+        ),
+    )
+
+
+def test_recalculate_line_matches_full_recalculation():
+    invoice = InvoiceFactory(currency="EUR", tax_behavior=InvoiceTaxBehavior.INCLUSIVE)
+    invoice_tax_rate = TaxRateFactory(account=invoice.account, percentage=Decimal("20"))
+    invoice.set_tax_rates([invoice_tax_rate])
+    shipping_rate = ShippingRateFactory(account=invoice.account, currency=invoice.currency, amount=Decimal("9.99"))
+    invoice.add_shipping(shipping_rate, tax_rates=[invoice_tax_rate])
+    lines = [
+        InvoiceLineFactory(invoice=invoice, unit_amount=Decimal("33.33"), quantity=1, amount=Decimal("0"))
+        for _ in range(3)
+    ]
+    lines[0].set_coupons([CouponFactory(account=invoice.account, currency="EUR", percentage=Decimal("15"))])
+    lines[1].set_tax_rates([TaxRateFactory(account=invoice.account, percentage=Decimal("7"))])
+    invoice.recalculate()
+
+    lines[2].update(description="Changed", quantity=7, unit_amount=Decimal("12.34"), price=None)
+    invoice.recalculate_line(lines[2].id)
+    incremental = snapshot_invoice_calculation(invoice)
+
+    invoice.recalculate()
+    assert snapshot_invoice_calculation(invoice) == incremental
+
+
+def test_recalculate_line_after_line_deletion():
+    invoice = InvoiceFactory(currency="EUR", tax_behavior=InvoiceTaxBehavior.EXCLUSIVE)
+    invoice.set_tax_rates([TaxRateFactory(account=invoice.account, percentage=Decimal("10"))])
+    kept_line = InvoiceLineFactory(invoice=invoice, unit_amount=Decimal("10"), quantity=1, amount=Decimal("0"))
+    deleted_line = InvoiceLineFactory(invoice=invoice, unit_amount=Decimal("20"), quantity=1, amount=Decimal("0"))
+    invoice.recalculate()
+
+    deleted_line_id = deleted_line.id
+    deleted_line.delete()
+    invoice.recalculate_line(deleted_line_id)
+
+    invoice.refresh_from_db()
+    assert invoice.total_amount == Money("11.00", "EUR")
+    assert [allocation.invoice_line_id for allocation in invoice.tax_allocations.all()] == [kept_line.id]
+
+
+def test_recalculate_line_writes_only_changed_line(django_assert_num_queries):
+    invoice = InvoiceFactory(currency="EUR", tax_behavior=InvoiceTaxBehavior.EXCLUSIVE)
+    invoice.set_tax_rates([TaxRateFactory(account=invoice.account, percentage=Decimal("20"))])
+    lines = [
+        InvoiceLineFactory(invoice=invoice, unit_amount=Decimal("10"), quantity=1, amount=Decimal("0"))
+        for _ in range(10)
+    ]
+    invoice.recalculate()
+    lines[0].update(description="Changed", quantity=2, unit_amount=Decimal("10"), price=None)
+
+    # coupon check, lines, line coupons, line tax rates, invoice coupons, invoice tax rates,
+    # 2 allocation deletes, line update, tax allocation insert and invoice update
+    with django_assert_num_queries(11):
+        invoice.recalculate_line(lines[0].id)
+
+    invoice.refresh_from_db()
+    assert invoice.total_amount == Money("132.00", "EUR")
+
+
+def test_recalculate_line_with_invoice_coupons_falls_back_to_full_recalculation():
+    invoice = InvoiceFactory(currency="EUR", tax_behavior=InvoiceTaxBehavior.EXCLUSIVE)
+    invoice.set_coupons([CouponFactory(account=invoice.account, currency="EUR", amount=Decimal("10"), percentage=None)])
+    first_line = InvoiceLineFactory(invoice=invoice, unit_amount=Decimal("50"), quantity=1, amount=Decimal("0"))
+    second_line = InvoiceLineFactory(invoice=invoice, unit_amount=Decimal("50"), quantity=1, amount=Decimal("0"))
+    invoice.recalculate()
+
+    second_line.update(description="Changed", quantity=3, unit_amount=Decimal("50"), price=None)
+    invoice.recalculate_line(second_line.id)
+
+    first_line.refresh_from_db()
+    second_line.refresh_from_db()
+    assert first_line.total_discount_amount == Money("2.50", "EUR")
+    assert second_line.total_discount_amount == Money("7.50", "EUR")
+
+
+def test_recalculate_keeps_unchanged_allocations(django_assert_num_queries):
+    invoice = InvoiceFactory(currency="EUR", tax_behavior=InvoiceTaxBehavior.EXCLUSIVE)
+    invoice.set_coupons([CouponFactory(account=invoice.account, currency="EUR", percentage=Decimal("10"))])
+    invoice.set_tax_rates([TaxRateFactory(account=invoice.account, percentage=Decimal("20"))])
+    lines = [
+        InvoiceLineFactory(invoice=invoice, unit_amount=Decimal("10"), quantity=1, amount=Decimal("0"))
+        for _ in range(3)
+    ]
+    lines[2].set_coupons([CouponFactory(account=invoice.account, currency="EUR", percentage=Decimal("50"))])
+    invoice.recalculate()
+    discount_allocations = {allocation.invoice_line_id: allocation for allocation in invoice.discount_allocations.all()}
+    tax_allocations = {allocation.invoice_line_id: allocation for allocation in invoice.tax_allocations.all()}
+
+    # lines, line coupons, line tax rates, invoice coupons, invoice tax rates,
+    # existing discount allocations, existing tax allocations and invoice update
+    with django_assert_num_queries(8):
+        invoice.recalculate()
+
+    lines[0].update(description="Changed", quantity=3, unit_amount=Decimal("10"), price=None)
+    invoice.recalculate()
+
+    assert {allocation.id for allocation in invoice.discount_allocations.all()} == {
+        allocation.id for allocation in discount_allocations.values()
+    }
+    assert {allocation.id for allocation in invoice.tax_allocations.all()} == {
+        allocation.id for allocation in tax_allocations.values()
+    }
+    unchanged_allocation = invoice.tax_allocations.get(invoice_line=lines[2])
+    assert unchanged_allocation.amount == tax_allocations[lines[2].id].amount
+    changed_allocation = invoice.tax_allocations.get(invoice_line=lines[0])
+    assert changed_allocation.amount == Money("5.40", "EUR")
+
+
+def test_recalculate_keeps_allocations_with_unrounded_discount_amounts(django_assert_num_queries):
+    invoice = InvoiceFactory(currency="EUR", tax_behavior=InvoiceTaxBehavior.EXCLUSIVE)
+    invoice.set_coupons([CouponFactory(account=invoice.account, currency="EUR", percentage=Decimal("10"))])
+    line = InvoiceLineFactory(invoice=invoice, unit_amount=Decimal("33.33"), quantity=1, amount=Decimal("0"))
+    line.set_coupons([CouponFactory(account=invoice.account, currency="EUR", percentage=Decimal("10"))])
+    invoice.recalculate()
+
+    # lines, line coupons, line tax rates, invoice coupons, invoice tax rates,
+    # existing discount allocations, existing tax allocations and invoice update
+    with django_assert_num_queries(8):
+        invoice.recalculate()
+
+    assert invoice.discount_allocations.get().amount == Money("3.33", "EUR")
+
+
+def test_recalculate_removes_obsolete_allocations():
+    invoice = InvoiceFactory(currency="EUR", tax_behavior=InvoiceTaxBehavior.EXCLUSIVE)
+    line = InvoiceLineFactory(invoice=invoice, unit_amount=Decimal("10"), quantity=1, amount=Decimal("0"))
+    line.set_coupons([CouponFactory(account=invoice.account, currency="EUR", percentage=Decimal("10"))])
+    line.set_tax_rates([TaxRateFactory(account=invoice.account, percentage=Decimal("20"))])
+    invoice.recalculate()
+
+    line.set_coupons([])
+    line.set_tax_rates([])
+    invoice.recalculate()
+
+    assert not invoice.discount_allocations.exists()
+    assert not invoice.tax_allocations.exists()
+    invoice.refresh_from_db()
+    assert invoice.total_amount == Money("10.00", "EUR")
+
+
+def test_recalculate_stores_allocation_positions():
+    invoice = InvoiceFactory(currency="EUR", tax_behavior=InvoiceTaxBehavior.EXCLUSIVE)
+    line = InvoiceLineFactory(invoice=invoice, unit_amount=Decimal("100"), quantity=1, amount=Decimal("0"))
+    first_coupon = CouponFactory(account=invoice.account, currency="EUR", amount=None, percentage=Decimal("10"))
+    second_coupon = CouponFactory(account=invoice.account, currency="EUR", amount=None, percentage=Decimal("5"))
+    first_tax_rate = TaxRateFactory(account=invoice.account, percentage=Decimal("20"))
+    second_tax_rate = TaxRateFactory(account=invoice.account, percentage=Decimal("5"))
+    line.set_coupons([first_coupon, second_coupon])
+    invoice.set_tax_rates([first_tax_rate, second_tax_rate])
+    invoice.recalculate()
+
+    assert {a.coupon_id: a.position for a in invoice.discount_allocations.all()} == {
+        first_coupon.id: 0,
+        second_coupon.id: 1,
+    }
+    assert {a.tax_rate_id: a.position for a in invoice.tax_allocations.all()} == {
+        first_tax_rate.id: 0,
+        second_tax_rate.id: 1,
+    }
+
+    line.set_coupons([second_coupon, first_coupon])
+    invoice.set_tax_rates([second_tax_rate, first_tax_rate])
+    invoice.recalculate()
+
+    assert {a.coupon_id: a.position for a in invoice.discount_allocations.all()} == {
+        first_coupon.id: 1,
+        second_coupon.id: 0,
+    }
+    assert {a.tax_rate_id: a.position for a in invoice.tax_allocations.all()} == {
+        first_tax_rate.id: 1,
+        second_tax_rate.id: 0,
+    }
+    assert [discount["coupon_id"] for discount in line.total_discounts] == [second_coupon.id, first_coupon.id]
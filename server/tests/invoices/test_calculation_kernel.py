@@ -0,0 +1,154 @@
+import uuid
+from decimal import Decimal
+
+from openinvoice.invoices.calculations import (
+    CouponInput,
+    InvoiceInput,
+    LineInput,
+    ShippingInput,
+    TaxRateInput,
+    calculate_discount_amount,
+    calculate_invoice,
+    calculate_shipping,
+)
+from openinvoice.invoices.choices import InvoiceDiscountSource, InvoiceTaxSource
+
+
+def make_line(unit_amount: str, quantity: int = 1, **kwargs) -> LineInput:
+    return LineInput(
+        id=uuid.uuid4(),
+        quantity=quantity,
+        unit_amount=Decimal(unit_amount),
+        amount=Decimal(unit_amount) * quantity,
+        **kwargs,
+    )
+
+
+def make_coupon(amount: str | None = None, percentage: str | None = None) -> CouponInput:
+    return CouponInput(
+        id=uuid.uuid4(),
+        amount=Decimal(amount) if amount is not None else None,
+        percentage=Decimal(percentage) if percentage is not None else None,
+    )
+
+
+def make_tax_rate(percentage: str) -> TaxRateInput:
+    return TaxRateInput(id=uuid.uuid4(), percentage=Decimal(percentage))
+
+
+def test_calculate_discount_amount():
+    assert calculate_discount_amount(make_coupon(amount="10"), Decimal("50")) == Decimal("10")
+    assert calculate_discount_amount(make_coupon(amount="80"), Decimal("50")) == Decimal("50")
+    assert calculate_discount_amount(make_coupon(percentage="10"), Decimal("50")) == Decimal("5")
+    assert calculate_discount_amount(make_coupon(percentage="150"), Decimal("50")) == Decimal("50")
+    assert calculate_discount_amount(make_coupon(amount="0"), Decimal("50")) == Decimal("0")
+    assert calculate_discount_amount(make_coupon(percentage="-10"), Decimal("50")) == Decimal("0")
+    assert calculate_discount_amount(make_coupon(), Decimal("50")) == Decimal("0")
+
+
+def test_calculate_invoice_exclusive_with_line_discount_and_tax():
+    tax_rate = make_tax_rate("10")
+    coupon = make_coupon(percentage="10")
+    line = make_line("50", quantity=2, coupons=[coupon], tax_rates=[tax_rate])
+
+    result = calculate_invoice(InvoiceInput(tax_inclusive=False, lines=[line]))
+
+    [line_result] = result.lines
+    assert line_result.subtotal_amount == Decimal("90")
+    assert line_result.total_discount_amount == Decimal("10")
+    assert line_result.total_tax_amount == Decimal("9.00")
+    assert line_result.total_amount == Decimal("99.00")
+    assert [(a.line_id, a.coupon_id, a.source, a.amount) for a in result.discount_allocations] == [
+        (line.id, coupon.id, InvoiceDiscountSource.LINE, Decimal("10")),
+    ]
+    assert [(a.line_id, a.tax_rate_id, a.source, a.amount) for a in result.tax_allocations] == [
+        (line.id, tax_rate.id, InvoiceTaxSource.LINE, Decimal("9.00")),
+    ]
+    assert result.total_amount == Decimal("99.00")
+
+
+def test_calculate_invoice_inclusive_with_multiple_tax_rates():
+    line = make_line("115", tax_rates=[make_tax_rate("10"), make_tax_rate("5")])
+
+    result = calculate_invoice(InvoiceInput(tax_inclusive=True, lines=[line]))
+
+    [line_result] = result.lines
+    assert line_result.unit_excluding_tax_amount == Decimal("100")
+    assert line_result.total_tax_amount == Decimal("15.00")
+    assert line_result.total_amount == Decimal("115.00")
+    assert [a.amount for a in result.tax_allocations] == [Decimal("10.00"), Decimal("5.00")]
+
+
+def test_calculate_invoice_allocates_invoice_coupon_proportionally():
+    coupon = make_coupon(amount="10")
+    first_line = make_line("10")
+    second_line = make_line("20")
+    discounted_line = make_line("30", coupons=[make_coupon(percentage="50")])
+
+    result = calculate_invoice(
+        InvoiceInput(
+            tax_inclusive=False,
+            lines=[first_line, second_line, discounted_line],
+            coupons=[coupon],
+        )
+    )
+
+    invoice_allocations = [a for a in result.discount_allocations if a.source == InvoiceDiscountSource.INVOICE]
+    assert [(a.line_id, a.amount) for a in invoice_allocations] == [
+        (first_line.id, Decimal("3.33")),
+        (second_line.id, Decimal("6.67")),
+    ]
+    assert result.subtotal_amount == Decimal("45")
+    assert result.total_discount_amount == Decimal("25.00")
+    assert result.total_amount == Decimal("35.00")
+
+
+def test_calculate_invoice_uses_invoice_tax_rates_for_lines_without_own_rates():
+    invoice_tax_rate = make_tax_rate("20")
+    line_tax_rate = make_tax_rate("10")
+    taxed_line = make_line("100", tax_rates=[line_tax_rate])
+    untaxed_line = make_line("100")
+
+    result = calculate_invoice(
+        InvoiceInput(tax_inclusive=False, lines=[taxed_line, untaxed_line], tax_rates=[invoice_tax_rate])
+    )
+
+    assert [(a.line_id, a.tax_rate_id, a.source) for a in result.tax_allocations] == [
+        (taxed_line.id, line_tax_rate.id, InvoiceTaxSource.LINE),
+        (untaxed_line.id, invoice_tax_rate.id, InvoiceTaxSource.INVOICE),
+    ]
+    assert result.total_tax_amount == Decimal("30.00")
+
+
+def test_calculate_invoice_includes_shipping():
+    shipping = ShippingInput(id=uuid.uuid4(), amount=Decimal("12"), tax_rates=[make_tax_rate("20")])
+
+    result = calculate_invoice(InvoiceInput(tax_inclusive=True, lines=[make_line("24")], shipping=shipping))
+
+    assert result.shipping is not None
+    assert result.shipping_amount == Decimal("12")
+    assert result.total_excluding_tax_amount == Decimal("34")
+    assert result.total_tax_amount == Decimal("2.00")
+    assert result.total_amount == Decimal("36.00")
+
+
+def test_calculate_shipping_inclusive():
+    tax_rate = make_tax_rate("20")
+    shipping = ShippingInput(id=uuid.uuid4(), amount=Decimal("12"), tax_rates=[tax_rate])
+
+    result = calculate_shipping(shipping, tax_inclusive=True)
+
+    assert result.total_excluding_tax_amount == Decimal("10")
+    assert result.total_tax_amount == Decimal("2.00")
+    assert result.total_amount == Decimal("12.00")
+    assert [(a.shipping_id, a.tax_rate_id, a.source) for a in result.tax_allocations] == [
+        (shipping.id, tax_rate.id, InvoiceTaxSource.SHIPPING),
+    ]
+
+
+def test_calculate_invoice_without_lines():
+    result = calculate_invoice(InvoiceInput(tax_inclusive=False, coupons=[make_coupon(amount="10")]))
+
+    assert result.lines == []
+    assert result.discount_allocations == []
+    assert result.total_amount == Decimal("0")
@@ -0,0 +1,164 @@
+import json
+import os
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from django.db import connection, transaction
+
+from openinvoice.invoices.choices import InvoiceStatus
+from openinvoice.invoices.models import Invoice
+from tests.factories import AccountFactory, CustomerFactory, InvoiceFactory, NumberingSystemFactory
+
+# Run with `pytest -m benchmark`, optionally lowering BENCHMARK_INVOICE_ROWS for a quicker check
+pytestmark = [pytest.mark.django_db, pytest.mark.benchmark]
+
+ROWS = int(os.environ.get("BENCHMARK_INVOICE_ROWS", "1000000"))
+ACCOUNTS = 10
+CUSTOMERS_PER_ACCOUNT = 10
+
+# Every customer gets invoices on every day and in every status: out of every 20, 14 paid, 2 open, 3 drafts, 1 voided
+STATUSES = [InvoiceStatus.PAID] * 14 + [InvoiceStatus.OPEN] * 2 + [InvoiceStatus.DRAFT] * 3 + [InvoiceStatus.VOIDED]
+
+GENERATED_COLUMNS = {
+    "id": "gen_random_uuid()",
+    "number": "CASE WHEN s.status = 'draft' THEN NULL ELSE 'BENCH-' || g END",
+    "status": "s.status",
+    "account_id": "(%(accounts)s::uuid[])[1 + (g %% %(customers_count)s) / %(customers_per_account)s]",
+    "customer_id": "(%(customers)s::uuid[])[1 + g %% %(customers_count)s]",
+    "numbering_system_id": (
+        "CASE WHEN s.status = 'draft' "
+        "THEN (%(numbering_systems)s::uuid[])[1 + (g %% %(customers_count)s) / %(customers_per_account)s] END"
+    ),
+    "issue_date": "date '2020-01-01' + (g / %(customers_count)s) %% 1800",
+    "due_date": "date '2020-01-15' + (g / %(customers_count)s) %% 1800",
+    "created_at": "timestamptz '2020-01-01' + g * interval '2 minutes'",
+}
+
+
+@pytest.fixture(scope="module")
+def invoices(django_db_setup, django_db_blocker):  # noqa: ARG001
+    """Fill the invoices table with ``ROWS`` copies of a template invoice spread over accounts, customers and dates.
+
+    The data is loaded once for the module inside a transaction that's rolled back afterwards.
+    """
+    with django_db_blocker.unblock(), transaction.atomic():
+        with connection.cursor() as cursor:
+            # The rollup triggers would dominate the load time and aren't what's measured here. They have to be
+            # disabled before anything touches the table within the transaction.
+            cursor.execute("ALTER TABLE invoices_invoice DISABLE TRIGGER USER")
+
+        accounts = AccountFactory.create_batch(ACCOUNTS)
+        customers = [
+            customer
+            for account in accounts
+            for customer in CustomerFactory.create_batch(CUSTOMERS_PER_ACCOUNT, account=account)
+        ]
+        numbering_systems = [NumberingSystemFactory(account=account) for account in accounts]
+        template = InvoiceFactory(account=accounts[0], customer=customers[0])
+
+        with connection.cursor() as cursor:
+            columns = [
+                column.name for column in connection.introspection.get_table_description(cursor, "invoices_invoice")
+            ]
+            expressions = [GENERATED_COLUMNS.get(column, f"t.{column}") for column in columns]
+            cursor.execute(
+                f"""
+                INSERT INTO invoices_invoice ({", ".join(columns)})
+                SELECT {", ".join(expressions)}
+                FROM invoices_invoice t
+                CROSS JOIN generate_series(1, %(rows)s) AS g
+                CROSS JOIN LATERAL (SELECT (%(statuses)s::text[])[1 + (g / %(customers_count)s) %% 20] AS status) AS s
+                WHERE t.id = %(template)s
+                """,  # noqa: S608
+                {
+                    "rows": ROWS,
+                    "statuses": [str(status) for status in STATUSES],
+                    "accounts": [account.id for account in accounts],
+                    "customers": [customer.id for customer in customers],
+                    "customers_count": len(customers),
+                    "customers_per_account": CUSTOMERS_PER_ACCOUNT,
+                    "numbering_systems": [numbering_system.id for numbering_system in numbering_systems],
+                    "template": template.id,
+                },
+            )
+            cursor.execute("ANALYZE invoices_invoice")
+
+        yield SimpleNamespace(
+            account=accounts[1],
+            customer=customers[CUSTOMERS_PER_ACCOUNT + 1],
+            numbering_system=numbering_systems[1],
+            currency=template.currency,
+        )
+        transaction.set_rollback(True)
+
+
+def used_indexes(queryset) -> set[str]:
+    def walk(node):
+        if "Index Name" in node:
+            yield node["Index Name"]
+        for child in node.get("Plans", []):
+            yield from walk(child)
+
+    plan = json.loads(queryset.explain(format="json"))[0]["Plan"]
+    return set(walk(plan))
+
+
+def test_list_invoices_uses_account_created_index(invoices):
+    queryset = Invoice.objects.for_account(invoices.account).order_by("-created_at")[:25]
+
+    assert "invoice_account_created_idx" in used_indexes(queryset)
+
+
+def test_list_invoices_by_status_uses_account_status_index(invoices):
+    queryset = (
+        Invoice.objects.for_account(invoices.account).filter(status=InvoiceStatus.PAID).order_by("-created_at")[:25]
+    )
+
+    assert "invoice_account_status_idx" in used_indexes(queryset)
+
+
+def test_list_invoices_by_customer_uses_customer_created_index(invoices):
+    queryset = (
+        Invoice.objects.for_account(invoices.account).filter(customer=invoices.customer).order_by("-created_at")[:25]
+    )
+
+    assert "invoice_customer_created_idx" in used_indexes(queryset)
+
+
+def test_list_invoices_by_issue_date_uses_account_issue_date_index(invoices):
+    queryset = Invoice.objects.for_account(invoices.account).filter(
+        issue_date__gte=date(2021, 3, 1),
+        issue_date__lte=date(2021, 3, 7),
+    )
+
+    assert "invoice_account_issue_date_idx" in used_indexes(queryset)
+
+
+def test_list_invoices_by_due_date_uses_account_due_date_index(invoices):
+    queryset = Invoice.objects.for_account(invoices.account).filter(
+        due_date__gte=date(2021, 3, 1),
+        due_date__lte=date(2021, 3, 7),
+    )
+
+    assert "invoice_account_due_date_idx" in used_indexes(queryset)
+
+
+def test_overdue_invoices_use_open_due_date_index(invoices):
+    queryset = Invoice.objects.for_account(invoices.account).filter(
+        status=InvoiceStatus.OPEN,
+        currency=invoices.currency,
+        due_date__gte=date(2024, 10, 1),
+        due_date__lt=date(2024, 10, 20),
+    )
+
+    assert "invoice_open_due_date_idx" in used_indexes(queryset)
+
+
+def test_drafts_by_numbering_system_use_draft_numbering_index(invoices):
+    queryset = Invoice.objects.filter(
+        numbering_system=invoices.numbering_system,
+        status=InvoiceStatus.DRAFT,
+    ).order_by("created_at")[:25]
+
+    assert "invoice_draft_numbering_idx" in used_indexes(queryset)
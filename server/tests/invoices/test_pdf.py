@@ -0,0 +1,38 @@
+import pytest
+
+from openinvoice.files.choices import FilePurpose
+from openinvoice.invoices.choices import InvoiceStatus
+from openinvoice.invoices.pdf import render_invoice_documents
+from openinvoice.rendering.choices import RenderStatus
+from tests.factories import InvoiceDocumentFactory, InvoiceFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_render_invoice_documents_renders_each_document(pdf_generator):
+    invoice = InvoiceFactory(status=InvoiceStatus.OPEN)
+    documents = [
+        InvoiceDocumentFactory(invoice=invoice, language=language, status=RenderStatus.PENDING)
+        for language in ("en-us", "de-de", "fr-fr")
+    ]
+
+    render_invoice_documents(invoice)
+
+    assert len(pdf_generator.requests) == 3
+    for document in documents:
+        document.refresh_from_db()
+        assert document.status == RenderStatus.READY
+        assert document.file.account_id == invoice.account_id
+        assert document.file.purpose == FilePurpose.INVOICE_PDF
+        assert document.file.filename == f"{document.id}.pdf"
+        assert document.file.content_type == "application/pdf"
+        assert document.file.data.read() == b"PDF content"
+    assert len({document.file_id for document in documents}) == 3
+
+
+def test_render_invoice_documents_without_documents(pdf_generator):
+    invoice = InvoiceFactory(status=InvoiceStatus.OPEN)
+
+    render_invoice_documents(invoice)
+
+    assert pdf_generator.requests == []
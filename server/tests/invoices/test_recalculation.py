@@ -0,0 +1,135 @@
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from djmoney.money import Money
+
+from openinvoice.invoices.choices import InvoiceStatus, InvoiceTaxBehavior
+from openinvoice.invoices.models import Invoice
+from openinvoice.invoices.recalculation import recalculate_chunk, recalculate_invoices
+from tests.factories import (
+    AccountFactory,
+    CouponFactory,
+    InvoiceFactory,
+    InvoiceLineFactory,
+    ShippingRateFactory,
+    TaxRateFactory,
+)
+from tests.invoices.test_calculation import snapshot_invoice_calculation
+
+pytestmark = pytest.mark.django_db
+
+
+def make_invoice(account, tax_rate, **kwargs):
+    invoice = InvoiceFactory(account=account, currency="EUR", tax_behavior=InvoiceTaxBehavior.EXCLUSIVE, **kwargs)
+    invoice.set_coupons([CouponFactory(account=account, currency="EUR", percentage=Decimal("10"))])
+    invoice.set_tax_rates([tax_rate])
+    for unit_amount in ("10", "25"):
+        InvoiceLineFactory(invoice=invoice, unit_amount=Decimal(unit_amount), quantity=2, amount=Decimal("0"))
+    line = InvoiceLineFactory(invoice=invoice, unit_amount=Decimal("40"), quantity=1, amount=Decimal("0"))
+    line.set_coupons([CouponFactory(account=account, currency="EUR", amount=Money(5, "EUR"), percentage=None)])
+    line.set_tax_rates([TaxRateFactory(account=account, percentage=Decimal("5"))])
+    shipping_rate = ShippingRateFactory(account=account, currency="EUR", amount=Decimal("15"))
+    invoice.add_shipping(shipping_rate, tax_rates=[tax_rate])
+    invoice.recalculate()
+    return invoice
+
+
+def test_recalculate_invoices_matches_recalculate():
+    account = AccountFactory()
+    tax_rate = TaxRateFactory(account=account, percentage=Decimal("20"))
+    invoices = [make_invoice(account, tax_rate) for _ in range(3)]
+
+    tax_rate.percentage = Decimal("23")
+    tax_rate.save()
+    progress = recalculate_invoices(Invoice.objects.filter(account=account), chunk_size=2)
+
+    assert progress.total == 3
+    assert progress.processed == 3
+    snapshots = [snapshot_invoice_calculation(invoice) for invoice in invoices]
+    for invoice in invoices:
+        invoice.recalculate()
+    assert [snapshot_invoice_calculation(invoice) for invoice in invoices] == snapshots
+
+    invoice = invoices[0]
+    invoice.refresh_from_db()
+    invoice.shipping.refresh_from_db()
+    assert invoice.shipping.total_tax_amount == Money("3.45", "EUR")
+    assert invoice.total_tax_amount == Money("19.69", "EUR")
+    assert invoice.total_amount == Money("132.69", "EUR")
+
+
+def test_recalculate_invoices_skips_finalized_invoices():
+    account = AccountFactory()
+    tax_rate = TaxRateFactory(account=account, percentage=Decimal("20"))
+    draft = make_invoice(account, tax_rate)
+    finalized = make_invoice(account, tax_rate)
+    Invoice.objects.filter(id=finalized.id).update(status=InvoiceStatus.OPEN)
+
+    tax_rate.percentage = Decimal("23")
+    tax_rate.save()
+    progress = recalculate_invoices(Invoice.objects.filter(account=account))
+
+    assert progress.processed == 1
+    draft.refresh_from_db()
+    finalized.refresh_from_db()
+    assert draft.total_tax_amount == Money("19.69", "EUR")
+    assert finalized.total_tax_amount == Money("17.35", "EUR")
+
+
+def test_recalculate_chunk_query_count_does_not_grow_with_chunk_size(django_assert_num_queries):
+    account = AccountFactory()
+    tax_rate = TaxRateFactory(account=account, percentage=Decimal("20"))
+    invoices = [make_invoice(account, tax_rate) for _ in range(4)]
+    tax_rate.percentage = Decimal("23")
+    tax_rate.save()
+
+    # savepoint, invoices with shipping, lines, line coupons, line tax rates, invoice coupons, invoice tax rates,
+    # shipping tax rates, existing discount and tax allocations, tax allocation, line, shipping and invoice
+    # updates and savepoint release
+    with django_assert_num_queries(15):
+        recalculate_chunk([invoice.id for invoice in invoices[:2]])
+
+    with django_assert_num_queries(15):
+        recalculate_chunk([invoice.id for invoice in invoices[2:]] + [invoices[1].id])
+
+
+def test_recalculate_invoices_reports_progress_per_chunk():
+    account = AccountFactory()
+    tax_rate = TaxRateFactory(account=account, percentage=Decimal("20"))
+    for _ in range(3):
+        make_invoice(account, tax_rate)
+    reported = []
+
+    recalculate_invoices(
+        Invoice.objects.filter(account=account),
+        chunk_size=2,
+        on_progress=lambda progress: reported.append((progress.processed, progress.total)),
+    )
+
+    assert reported == [(2, 3), (3, 3)]
+
+
+def test_recalculate_invoices_command_filters_by_tax_rate():
+    account = AccountFactory()
+    tax_rate = TaxRateFactory(account=account, percentage=Decimal("20"))
+    other_tax_rate = TaxRateFactory(account=account, percentage=Decimal("20"))
+    invoice = make_invoice(account, tax_rate)
+    other_invoice = make_invoice(account, other_tax_rate)
+
+    Invoice.objects.filter(id__in=[invoice.id, other_invoice.id]).update(total_amount=Decimal("0"))
+    out = StringIO()
+    call_command("recalculate_invoices", "--tax-rate", str(tax_rate.id), stdout=out)
+
+    invoice.refresh_from_db()
+    other_invoice.refresh_from_db()
+    assert invoice.total_amount == Money("130.35", "EUR")
+    assert other_invoice.total_amount == Money("0", "EUR")
+    assert "Recalculated 1/1 invoices" in out.getvalue()
+    assert "Recalculated 1 draft invoices" in out.getvalue()
+
+
+def test_recalculate_invoices_command_requires_filter():
+    with pytest.raises(CommandError):
+        call_command("recalculate_invoices")
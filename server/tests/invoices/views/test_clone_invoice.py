@@ -167,6 +167,7 @@ def test_clone_invoice(api_client, user, account):
                 "memo": response.data["documents"][0]["memo"],
                 "custom_fields": response.data["documents"][0]["custom_fields"],
                 "url": None,
+                "status": None,
                 "created_at": ANY,
                 "updated_at": ANY,
             }
@@ -35,6 +35,7 @@ def test_create_invoice_document(api_client, user, account):
         "memo": "Memo",
         "custom_fields": {"ref": "DOC-1"},
         "url": None,
+        "status": None,
         "created_at": ANY,
         "updated_at": ANY,
     }
@@ -126,6 +126,7 @@ def test_create_invoice_revision(api_client, user, account):
                 "memo": document.memo,
                 "custom_fields": document.custom_fields,
                 "url": None,
+                "status": None,
                 "created_at": ANY,
                 "updated_at": ANY,
             }
@@ -4,12 +4,14 @@ from decimal import Decimal
 from unittest.mock import ANY, patch
 
 import pytest
+from django.core.management import call_command
 from django.utils import timezone
 
 from openinvoice.integrations.choices import PaymentProvider
 from openinvoice.integrations.exceptions import IntegrationError
 from openinvoice.invoices.choices import InvoiceDeliveryMethod, InvoiceDocumentAudience, InvoiceStatus
 from openinvoice.payments.choices import PaymentStatus
+from openinvoice.rendering.choices import RenderStatus
 from tests.factories import (
     AddressFactory,
     BillingProfileFactory,
@@ -127,6 +129,7 @@ def test_finalize_invoice(api_client, user, account):
                 "memo": document.memo,
                 "custom_fields": document.custom_fields,
                 "url": document.file.data.url,
+                "status": "ready",
                 "created_at": ANY,
                 "updated_at": ANY,
             }
@@ -360,6 +363,7 @@ def test_finalize_invoice_with_zero_outstanding_amount(api_client, user, account
                 "memo": document.memo,
                 "custom_fields": document.custom_fields,
                 "url": document.file.data.url,
+                "status": "ready",
                 "created_at": ANY,
                 "updated_at": ANY,
             }
@@ -459,17 +463,86 @@ def test_finalize_invoice_with_payment_provider_checkout_error(api_client, user,
 
     assert response.status_code == 200
     invoice.refresh_from_db()
+    assert invoice.status == InvoiceStatus.OPEN
     assert invoice.payments.count() == 1
     payment = invoice.payments.first()
-    assert payment.status == PaymentStatus.FAILED
+    assert payment.status == PaymentStatus.PENDING_CHECKOUT
     assert payment.transaction_id is None
     assert payment.url is None
     assert payment.message == "Checkout error"
-    assert payment.extra_data == {}
-    assert payment.received_at is not None
+    assert payment.checkout_attempts == 1
+    assert payment.checkout_after > timezone.now()
     stripe_checkout_mock.assert_called_once_with(invoice=invoice, payment_id=payment.id)
 
 
+def test_finalize_invoice_with_payment_provider_defers_checkout(
+    api_client, user, account, settings, stripe_checkout_mock
+):
+    settings.PAYMENT_CHECKOUT_ASYNC = True
+    connection = StripeConnectionFactory(account=account)
+    invoice = InvoiceFactory(
+        account=account,
+        payment_provider=PaymentProvider.STRIPE,
+        payment_connection_id=connection.id,
+        total_amount=Decimal("10.00"),
+        outstanding_amount=Decimal("10.00"),
+    )
+    InvoiceLineFactory(invoice=invoice, description="Test line", quantity=1, unit_amount=Decimal("10.00"))
+
+    api_client.force_login(user)
+    api_client.force_account(account)
+    response = api_client.post(f"/api/v1/invoices/{invoice.id}/finalize")
+
+    assert response.status_code == 200
+    payment = invoice.payments.get()
+    assert payment.status == PaymentStatus.PENDING_CHECKOUT
+    assert payment.transaction_id is None
+    assert payment.checkout_attempts == 0
+    stripe_checkout_mock.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "workers",
+    [
+        ["process_render_jobs", "process_payment_checkouts"],
+        ["process_payment_checkouts", "process_render_jobs"],
+    ],
+)
+def test_finalize_invoice_delivers_once_checkout_and_rendering_are_done(
+    api_client, user, account, settings, stripe_checkout_mock, mailoutbox, django_capture_on_commit_callbacks, workers
+):
+    settings.PDF_RENDER_ASYNC = True
+    settings.PAYMENT_CHECKOUT_ASYNC = True
+    connection = StripeConnectionFactory(account=account)
+    invoice = InvoiceFactory(
+        account=account,
+        payment_provider=PaymentProvider.STRIPE,
+        payment_connection_id=connection.id,
+        delivery_method=InvoiceDeliveryMethod.AUTOMATIC,
+        recipients=["test@example.com"],
+        total_amount=Decimal("10.00"),
+        outstanding_amount=Decimal("10.00"),
+    )
+    InvoiceDocumentFactory(invoice=invoice, audience=[InvoiceDocumentAudience.CUSTOMER])
+    InvoiceLineFactory(invoice=invoice, description="Test line", quantity=1, unit_amount=Decimal("10.00"))
+    stripe_checkout_mock.return_value = ("cs_123", "https://stripe.example/checkout")
+
+    api_client.force_login(user)
+    api_client.force_account(account)
+    response = api_client.post(f"/api/v1/invoices/{invoice.id}/finalize")
+
+    assert response.status_code == 200
+    with django_capture_on_commit_callbacks(execute=True):
+        call_command(workers[0], "--once")
+    assert len(mailoutbox) == 0
+
+    with django_capture_on_commit_callbacks(execute=True):
+        call_command(workers[1], "--once")
+    assert len(mailoutbox) == 1
+    html, _ = mailoutbox[0].alternatives[0]
+    assert "https://stripe.example/checkout" in html
+
+
 def test_finalize_invoice_without_due_date(api_client, user, account):
     net_payment_term = 30
     invoice = InvoiceFactory(
@@ -489,7 +562,9 @@ def test_finalize_invoice_without_due_date(api_client, user, account):
     assert invoice.status == InvoiceStatus.OPEN
 
 
-def test_finalize_invoice_with_automatic_delivery_method(api_client, user, account, mailoutbox):
+def test_finalize_invoice_with_automatic_delivery_method(
+    api_client, user, account, mailoutbox, django_capture_on_commit_callbacks
+):
     invoice = InvoiceFactory(
         account=account,
         delivery_method=InvoiceDeliveryMethod.AUTOMATIC,
@@ -501,7 +576,8 @@ def test_finalize_invoice_with_automatic_delivery_method(api_client, user, accou
 
     api_client.force_login(user)
     api_client.force_account(account)
-    response = api_client.post(f"/api/v1/invoices/{invoice.id}/finalize")
+    with django_capture_on_commit_callbacks(execute=True):
+        response = api_client.post(f"/api/v1/invoices/{invoice.id}/finalize")
 
     assert response.status_code == 200
     assert len(mailoutbox) == 1
@@ -510,6 +586,39 @@ def test_finalize_invoice_with_automatic_delivery_method(api_client, user, accou
     assert email.to == ["test@example.com"]
 
 
+def test_finalize_invoice_renders_documents_asynchronously(
+    api_client, user, account, settings, mailoutbox, django_capture_on_commit_callbacks
+):
+    settings.PDF_RENDER_ASYNC = True
+    invoice = InvoiceFactory(
+        account=account,
+        delivery_method=InvoiceDeliveryMethod.AUTOMATIC,
+        recipients=["test@example.com"],
+        total_amount=Decimal("10.00"),
+    )
+    document = InvoiceDocumentFactory(invoice=invoice, audience=[InvoiceDocumentAudience.CUSTOMER])
+    InvoiceLineFactory(invoice=invoice, description="Test line", quantity=1, unit_amount=Decimal("10.00"))
+
+    api_client.force_login(user)
+    api_client.force_account(account)
+    response = api_client.post(f"/api/v1/invoices/{invoice.id}/finalize")
+
+    assert response.status_code == 200
+    assert response.data["status"] == InvoiceStatus.OPEN
+    assert response.data["documents"][0]["status"] == RenderStatus.PENDING
+    assert response.data["documents"][0]["url"] is None
+    assert len(mailoutbox) == 0
+
+    with django_capture_on_commit_callbacks(execute=True):
+        call_command("process_render_jobs", "--once")
+
+    document.refresh_from_db()
+    assert document.status == RenderStatus.READY
+    assert document.file is not None
+    assert len(mailoutbox) == 1
+    assert mailoutbox[0].to == ["test@example.com"]
+
+
 def test_finalize_invoice_with_automatic_delivery_method_no_recipients(api_client, user, account, mailoutbox):
     invoice = InvoiceFactory(
         account=account, delivery_method=InvoiceDeliveryMethod.AUTOMATIC, recipients=[], total_amount=Decimal("10.00")
@@ -46,6 +46,7 @@ def test_list_invoice_documents(api_client, user, account):
                 "memo": first_document.memo,
                 "custom_fields": first_document.custom_fields,
                 "url": None,
+                "status": None,
                 "created_at": ANY,
                 "updated_at": ANY,
             },
@@ -57,6 +58,7 @@ def test_list_invoice_documents(api_client, user, account):
                 "memo": second_document.memo,
                 "custom_fields": second_document.custom_fields,
                 "url": None,
+                "status": None,
                 "created_at": ANY,
                 "updated_at": ANY,
             },
@@ -2,11 +2,20 @@ from datetime import timedelta
 from unittest.mock import ANY
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from openinvoice.invoices.choices import InvoiceDeliveryMethod, InvoiceDocumentAudience, InvoiceStatus
 from openinvoice.invoices.models import Invoice
-from tests.factories import CustomerFactory, InvoiceDocumentFactory, InvoiceFactory, InvoiceLineFactory
+from openinvoice.numbering_systems.choices import NumberingSystemResetInterval
+from tests.factories import (
+    CustomerFactory,
+    InvoiceDocumentFactory,
+    InvoiceFactory,
+    InvoiceLineFactory,
+    NumberingSystemFactory,
+)
 
 pytestmark = pytest.mark.django_db
 
@@ -109,6 +118,7 @@ def test_list_invoices(api_client, user, account):
                         "memo": document.memo,
                         "custom_fields": document.custom_fields,
                         "url": None,
+                        "status": None,
                         "created_at": ANY,
                         "updated_at": ANY,
                     }
@@ -290,6 +300,82 @@ def test_list_invoices_search_by_number(api_client, user, account):
     assert [r["id"] for r in response.data["results"]] == [str(invoice.id)]
 
 
+def test_list_invoices_projects_draft_numbers(api_client, user, account):
+    yearly = NumberingSystemFactory(
+        account=account,
+        template="INV-{yyyy}-{nnn}",
+        reset_interval=NumberingSystemResetInterval.YEARLY,
+    )
+    never = NumberingSystemFactory(account=account, template="N-{n}")
+    InvoiceFactory(account=account, numbering_system=never, status=InvoiceStatus.OPEN, number="N-1")
+    never.allocate_number(effective_at=timezone.now())
+    old_draft = InvoiceFactory(account=account, numbering_system=yearly, number=None)
+    Invoice.objects.filter(id=old_draft.id).update(created_at=timezone.now() - timedelta(days=400))
+    drafts = [
+        InvoiceFactory(account=account, numbering_system=numbering_system, number=None)
+        for numbering_system in (yearly, never, yearly, never, yearly)
+    ]
+
+    api_client.force_login(user)
+    api_client.force_account(account)
+    response = api_client.get("/api/v1/invoices")
+
+    assert response.status_code == 200
+    numbers = {result["id"]: result["number"] for result in response.data["results"]}
+    year = timezone.now().year
+    assert [numbers[str(draft.id)] for draft in [old_draft, *drafts]] == [
+        f"INV-{year}-001",
+        f"INV-{year}-001",
+        "N-3",
+        f"INV-{year}-002",
+        "N-4",
+        f"INV-{year}-003",
+    ]
+    assert numbers == {str(invoice.id): invoice.effective_number for invoice in Invoice.objects.all()}
+
+
+def test_list_invoices_draft_numbers_query_count_does_not_grow(api_client, user, account):
+    numbering_system = NumberingSystemFactory(account=account)
+    numbering_system.allocate_number(effective_at=timezone.now())
+    InvoiceFactory.create_batch(2, account=account, numbering_system=numbering_system, number=None)
+
+    api_client.force_login(user)
+    api_client.force_account(account)
+    with CaptureQueriesContext(connection) as few:
+        api_client.get("/api/v1/invoices")
+
+    InvoiceFactory.create_batch(5, account=account, numbering_system=numbering_system, number=None)
+    with CaptureQueriesContext(connection) as many:
+        response = api_client.get("/api/v1/invoices")
+
+    assert [result["number"] for result in response.data["results"]] == [f"INV-{n}" for n in range(8, 1, -1)]
+    assert len(many) == len(few)
+
+
+def test_list_invoices_draft_numbers_without_sequence_query_count_does_not_grow(api_client, user, account):
+    numbering_system = NumberingSystemFactory(account=account, template="INV-{n}")
+    InvoiceFactory(
+        account=account,
+        numbering_system=numbering_system,
+        status=InvoiceStatus.OPEN,
+        number="INV-1",
+        opened_at=timezone.now(),
+    )
+    InvoiceFactory.create_batch(2, account=account, numbering_system=numbering_system, number=None)
+
+    api_client.force_login(user)
+    api_client.force_account(account)
+    with CaptureQueriesContext(connection) as few:
+        api_client.get("/api/v1/invoices")
+
+    InvoiceFactory.create_batch(5, account=account, numbering_system=numbering_system, number=None)
+    with CaptureQueriesContext(connection) as many:
+        response = api_client.get("/api/v1/invoices")
+
+    assert [result["number"] for result in response.data["results"]] == [f"INV-{n}" for n in range(8, 0, -1)]
+    assert len(many) == len(few)
+
+
 def test_list_invoices_order_by_created_at(api_client, user, account):
     base = timezone.now()
     older = InvoiceFactory(account=account)
@@ -326,3 +412,69 @@ def test_list_invoices_order_by_created_at_desc(api_client, user, account):
         str(newer.id),
         str(older.id),
     ]
+
+
+def test_list_invoices_with_selected_fields(api_client, user, account):
+    invoice = InvoiceFactory(account=account)
+
+    api_client.force_login(user)
+    api_client.force_account(account)
+    response = api_client.get("/api/v1/invoices", {"fields": "id,number,status,total_amount"})
+
+    assert response.status_code == 200
+    assert response.data["results"] == [
+        {
+            "id": str(invoice.id),
+            "number": invoice.effective_number,
+            "status": invoice.status,
+            "total_amount": f"{invoice.total_amount.amount:.2f}",
+        }
+    ]
+
+
+def test_list_invoices_with_selected_nested_fields(api_client, user, account):
+    invoice = InvoiceFactory(account=account)
+    InvoiceLineFactory(invoice=invoice)
+
+    api_client.force_login(user)
+    api_client.force_account(account)
+    response = api_client.get("/api/v1/invoices", {"fields": "id,lines"})
+
+    assert response.status_code == 200
+    assert [result.keys() for result in response.data["results"]] == [{"id", "lines"}]
+    assert response.data["results"][0]["lines"][0]["id"] == str(invoice.lines.get().id)
+
+
+def test_list_invoices_with_unknown_field(api_client, user, account):
+    api_client.force_login(user)
+    api_client.force_account(account)
+    response = api_client.get("/api/v1/invoices", {"fields": "id,secret"})
+
+    assert response.status_code == 400
+    assert response.data == {
+        "type": "validation_error",
+        "errors": [
+            {
+                "attr": "fields",
+                "code": "invalid",
+                "detail": "Unknown field: secret",
+            }
+        ],
+    }
+
+
+def test_list_invoices_selected_fields_query_count_does_not_grow(api_client, user, account):
+    InvoiceFactory.create_batch(2, account=account)
+
+    api_client.force_login(user)
+    api_client.force_account(account)
+    with CaptureQueriesContext(connection) as few:
+        api_client.get("/api/v1/invoices", {"fields": "id,number,status,total_amount", "page_size": 100})
+
+    InvoiceFactory.create_batch(98, account=account)
+    with CaptureQueriesContext(connection) as many:
+        response = api_client.get("/api/v1/invoices", {"fields": "id,number,status,total_amount", "page_size": 100})
+
+    assert len(response.data["results"]) == 100
+    assert len(many) == len(few)
+    assert not any("invoices_invoiceline" in query["sql"] for query in many.captured_queries)
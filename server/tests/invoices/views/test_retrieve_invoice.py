@@ -3,8 +3,10 @@ from decimal import Decimal
 from unittest.mock import ANY
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
-from openinvoice.invoices.choices import InvoiceDeliveryMethod, InvoiceDocumentAudience
+from openinvoice.invoices.choices import InvoiceDeliveryMethod, InvoiceDocumentAudience, InvoiceStatus
 from tests.factories import (
     AccountFactory,
     AddressFactory,
@@ -112,6 +114,7 @@ def test_retrieve_invoice(api_client, user, account):
                 "memo": document.memo,
                 "custom_fields": document.custom_fields,
                 "url": None,
+                "status": None,
                 "created_at": ANY,
                 "updated_at": ANY,
             }
@@ -521,3 +524,77 @@ def test_retrieve_invoice_requires_authentication(api_client, account):
             }
         ],
     }
+
+
+def test_retrieve_finalized_invoice_supports_conditional_requests(api_client, user, account):
+    invoice = InvoiceFactory(account=account, status=InvoiceStatus.OPEN)
+
+    api_client.force_login(user)
+    api_client.force_account(account)
+    response = api_client.get(f"/api/v1/invoices/{invoice.id}")
+
+    assert response.status_code == 200
+    assert response.headers["ETag"]
+    assert response.headers["Last-Modified"]
+
+    response = api_client.get(f"/api/v1/invoices/{invoice.id}", headers={"If-None-Match": response.headers["ETag"]})
+
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+def test_retrieve_draft_invoice_has_no_etag(api_client, user, account):
+    invoice = InvoiceFactory(account=account)
+
+    api_client.force_login(user)
+    api_client.force_account(account)
+    response = api_client.get(f"/api/v1/invoices/{invoice.id}")
+
+    assert response.status_code == 200
+    assert "ETag" not in response.headers
+
+
+def test_retrieve_invoice_etag_changes_when_voided(api_client, user, account):
+    invoice = InvoiceFactory(account=account, status=InvoiceStatus.OPEN)
+
+    api_client.force_login(user)
+    api_client.force_account(account)
+    etag = api_client.get(f"/api/v1/invoices/{invoice.id}").headers["ETag"]
+    api_client.post(f"/api/v1/invoices/{invoice.id}/void")
+    response = api_client.get(f"/api/v1/invoices/{invoice.id}", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.data["status"] == InvoiceStatus.VOIDED
+    assert response.headers["ETag"] != etag
+
+
+def test_retrieve_invoice_etag_changes_when_tax_rate_renamed(api_client, user, account):
+    invoice = InvoiceFactory(account=account, status=InvoiceStatus.OPEN)
+    tax_rate = TaxRateFactory(account=account)
+    invoice.set_tax_rates([tax_rate])
+
+    api_client.force_login(user)
+    api_client.force_account(account)
+    etag = api_client.get(f"/api/v1/invoices/{invoice.id}").headers["ETag"]
+    tax_rate.name = "Renamed"
+    tax_rate.save()
+    response = api_client.get(f"/api/v1/invoices/{invoice.id}", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.data["tax_rates"][0]["name"] == "Renamed"
+
+
+@pytest.mark.usefixtures("locmem_cache")
+def test_retrieve_finalized_invoice_serves_cached_payload(api_client, user, account):
+    invoice = InvoiceFactory(account=account, status=InvoiceStatus.OPEN)
+    InvoiceLineFactory(invoice=invoice)
+
+    api_client.force_login(user)
+    api_client.force_account(account)
+    first = api_client.get(f"/api/v1/invoices/{invoice.id}")
+    with CaptureQueriesContext(connection) as queries:
+        second = api_client.get(f"/api/v1/invoices/{invoice.id}")
+
+    assert second.status_code == 200
+    assert second.data == first.data
+    assert not any('FROM "invoices_invoiceline"' in query["sql"] for query in queries.captured_queries)
@@ -126,6 +126,7 @@ def test_update_invoice(api_client, user, account):
                 "memo": document.memo,
                 "custom_fields": document.custom_fields,
                 "url": None,
+                "status": None,
                 "created_at": ANY,
                 "updated_at": ANY,
             }
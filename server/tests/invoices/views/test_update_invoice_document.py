@@ -33,6 +33,7 @@ def test_update_invoice_document(api_client, user, account):
         "memo": "Updated memo",
         "custom_fields": {"ref": "DOC-UPDATED"},
         "url": None,
+        "status": None,
         "created_at": ANY,
         "updated_at": ANY,
     }
@@ -1,9 +1,13 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime
 
 import pytest
+from django.db import connection
 
+from openinvoice.invoices.choices import InvoiceStatus
 from openinvoice.numbering_systems.choices import NumberingSystemResetInterval
-from tests.factories import NumberingSystemFactory
+from openinvoice.numbering_systems.models import NumberingSequence
+from tests.factories import InvoiceFactory, NumberingSystemFactory
 
 pytestmark = pytest.mark.django_db
 
@@ -93,3 +97,66 @@ def test_calculate_numbering_system_bounds(interval, effective_at, expected_star
 
     assert start == expected_start
     assert end == expected_end
+
+
+def test_allocate_number_seeds_sequence_from_numbered_documents():
+    numbering_system = NumberingSystemFactory(template="INV-{nnn}")
+    InvoiceFactory.create_batch(2, numbering_system=numbering_system, status=InvoiceStatus.OPEN)
+    InvoiceFactory(numbering_system=numbering_system, status=InvoiceStatus.DRAFT)
+    effective_at = datetime(2024, 4, 15, tzinfo=UTC)
+
+    assert numbering_system.allocate_number(effective_at=effective_at) == "INV-003"
+    assert numbering_system.allocate_number(effective_at=effective_at) == "INV-004"
+    assert numbering_system.project_number(effective_at=effective_at) == "INV-005"
+    assert numbering_system.project_number(effective_at=effective_at, offset=2) == "INV-007"
+
+    sequence = NumberingSequence.objects.get(numbering_system=numbering_system)
+    assert sequence.period_start is None
+    assert sequence.last_value == 4
+
+
+def test_allocate_number_keeps_one_sequence_per_period():
+    numbering_system = NumberingSystemFactory(
+        template="INV-{yyyy}{mm}-{nn}",
+        reset_interval=NumberingSystemResetInterval.MONTHLY,
+    )
+    april = datetime(2024, 4, 15, tzinfo=UTC)
+    may = datetime(2024, 5, 2, tzinfo=UTC)
+
+    assert numbering_system.allocate_number(effective_at=april) == "INV-202404-01"
+    assert numbering_system.allocate_number(effective_at=may) == "INV-202405-01"
+    assert numbering_system.allocate_number(effective_at=april) == "INV-202404-02"
+
+    assert list(
+        NumberingSequence.objects.filter(numbering_system=numbering_system)
+        .order_by("period_start")
+        .values_list("period_start", "last_value")
+    ) == [(datetime(2024, 4, 1, tzinfo=UTC), 2), (datetime(2024, 5, 1, tzinfo=UTC), 1)]
+
+
+def test_allocate_number_does_not_scan_documents_once_seeded(django_assert_num_queries):
+    numbering_system = NumberingSystemFactory()
+    effective_at = datetime(2024, 4, 15, tzinfo=UTC)
+    numbering_system.allocate_number(effective_at=effective_at)
+    InvoiceFactory.create_batch(3, numbering_system=numbering_system, status=InvoiceStatus.OPEN)
+
+    # savepoint, locked sequence lookup, increment and savepoint release
+    with django_assert_num_queries(4):
+        assert numbering_system.allocate_number(effective_at=effective_at) == "INV-2"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_allocate_number_hands_out_distinct_numbers_concurrently():
+    numbering_system = NumberingSystemFactory()
+    effective_at = datetime(2024, 4, 15, tzinfo=UTC)
+
+    def allocate(_):
+        try:
+            return numbering_system.allocate_number(effective_at=effective_at)
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        numbers = list(executor.map(allocate, range(24)))
+
+    assert sorted(numbers, key=lambda number: int(number.removeprefix("INV-"))) == [f"INV-{i}" for i in range(1, 25)]
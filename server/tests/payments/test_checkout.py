@@ -0,0 +1,113 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from openinvoice.integrations.choices import PaymentProvider
+from openinvoice.integrations.exceptions import IntegrationError
+from openinvoice.integrations.stripe.cache import connection_cache
+from openinvoice.invoices.choices import InvoiceStatus
+from openinvoice.payments.choices import PaymentStatus
+from openinvoice.payments.models import Payment
+from tests.factories import InvoiceFactory, InvoiceLineFactory, StripeConnectionFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def async_checkout(settings):
+    settings.PAYMENT_CHECKOUT_ASYNC = True
+    settings.PAYMENT_CHECKOUT_MAX_ATTEMPTS = 2
+    settings.PAYMENT_CHECKOUT_RETRY_DELAY = 10
+
+
+@pytest.fixture
+def invoice(account):
+    connection_cache.clear()
+    connection = StripeConnectionFactory(account=account)
+    invoice = InvoiceFactory(
+        account=account,
+        status=InvoiceStatus.OPEN,
+        payment_provider=PaymentProvider.STRIPE,
+        payment_connection_id=connection.id,
+        total_amount=Decimal("10.00"),
+    )
+    InvoiceLineFactory(invoice=invoice, description="Test line", quantity=1, unit_amount=Decimal("10.00"))
+    return invoice
+
+
+def test_checkout_invoice_creates_session_when_checkout_is_synchronous(invoice):
+    # Goes through the fake Stripe transport configured for tests
+    payment = Payment.objects.checkout_invoice(invoice)
+
+    payment.refresh_from_db()
+    assert payment.status == PaymentStatus.PENDING
+    assert payment.transaction_id.startswith("cs_test_")
+    assert payment.url == f"https://checkout.stripe.com/c/pay/{payment.transaction_id}"
+    assert payment.checkout_attempts == 1
+    assert list(payment.invoices.all()) == [invoice]
+
+
+@pytest.mark.usefixtures("async_checkout")
+def test_process_next_checkout_creates_session_of_queued_payment(invoice):
+    payment = Payment.objects.checkout_invoice(invoice)
+    payment.refresh_from_db()
+    assert payment.status == PaymentStatus.PENDING_CHECKOUT
+
+    assert Payment.objects.process_next_checkout() == payment
+    assert Payment.objects.process_next_checkout() is None
+
+    payment.refresh_from_db()
+    assert payment.status == PaymentStatus.PENDING
+    assert payment.transaction_id.startswith("cs_test_")
+
+
+@pytest.mark.usefixtures("async_checkout")
+def test_failed_checkout_is_retried_with_backoff(invoice):
+    payment = Payment.objects.checkout_invoice(invoice)
+
+    before = timezone.now()
+    with patch("openinvoice.integrations.stripe.integration.StripeIntegration.checkout") as checkout:
+        checkout.side_effect = IntegrationError("Stripe unavailable")
+        Payment.objects.process_next_checkout()
+
+        payment.refresh_from_db()
+        assert payment.status == PaymentStatus.PENDING_CHECKOUT
+        assert payment.message == "Stripe unavailable"
+        assert payment.checkout_attempts == 1
+        assert payment.checkout_after >= before + timedelta(seconds=10)
+        assert Payment.objects.process_next_checkout() is None
+
+        Payment.objects.filter(id=payment.id).update(checkout_after=timezone.now())
+        Payment.objects.process_next_checkout()
+
+    payment.refresh_from_db()
+    assert payment.status == PaymentStatus.FAILED
+    assert payment.checkout_attempts == 2
+    assert Payment.objects.process_next_checkout() is None
+
+
+@pytest.mark.usefixtures("async_checkout")
+def test_checkout_fails_right_away_without_connection(invoice):
+    payment = Payment.objects.checkout_invoice(invoice)
+    invoice.account.stripe_connections.all().delete()
+
+    Payment.objects.process_next_checkout()
+
+    payment.refresh_from_db()
+    assert payment.status == PaymentStatus.FAILED
+    assert payment.checkout_attempts == 1
+
+
+@pytest.mark.usefixtures("async_checkout")
+def test_process_payment_checkouts_command(invoice, capsys):
+    payment = Payment.objects.checkout_invoice(invoice)
+
+    call_command("process_payment_checkouts", once=True)
+
+    payment.refresh_from_db()
+    assert payment.status == PaymentStatus.PENDING
+    assert f"for payment {payment.id}" in capsys.readouterr().out
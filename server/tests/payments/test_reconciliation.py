@@ -0,0 +1,41 @@
+from decimal import Decimal
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from openinvoice.invoices.choices import InvoiceStatus
+from openinvoice.payments.models import Payment
+from tests.factories import InvoiceFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_reconcile_payments_command(account, tmp_path, capsys):
+    invoice = InvoiceFactory(account=account, status=InvoiceStatus.OPEN, total_amount=Decimal("100.00"))
+    statement = tmp_path / "statement.csv"
+    statement.write_text(
+        "invoice_id,amount,transaction_id,received_at\n"
+        f"{invoice.id},60.00,tx_1,2024-05-01T10:00:00\n"
+        f"{invoice.id},60.00,tx_2,\n"
+        f"{invoice.id},40.00,tx_3,\n"
+        f"{invoice.id},40.00,tx_3,\n"
+    )
+
+    call_command("reconcile_payments", str(account.id), str(statement), batch_size=2)
+
+    output = capsys.readouterr()
+    assert "Recorded 2 payments, skipped 1 duplicates and rejected 1 rows" in output.out
+    assert "Line 3: Payment amount exceeds outstanding amount" in output.err
+    assert set(Payment.objects.values_list("transaction_id", flat=True)) == {"tx_1", "tx_3"}
+    invoice.refresh_from_db()
+    assert invoice.status == InvoiceStatus.PAID
+
+
+def test_reconcile_payments_command_rejects_invalid_rows(account, tmp_path):
+    statement = tmp_path / "statement.csv"
+    statement.write_text("invoice_id,amount,transaction_id\nnot-a-uuid,10.00,tx_1\n")
+
+    with pytest.raises(CommandError, match="Line 2"):
+        call_command("reconcile_payments", str(account.id), str(statement))
+
+    assert not Payment.objects.exists()
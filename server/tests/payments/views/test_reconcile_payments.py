@@ -0,0 +1,192 @@
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from openinvoice.invoices.choices import InvoiceStatus
+from openinvoice.invoices.models import Invoice
+from openinvoice.payments.choices import PaymentStatus, ReconciliationStatus
+from openinvoice.payments.models import Payment
+from tests.factories import AccountFactory, InvoiceFactory, PaymentFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def row(invoice_id, amount, transaction_id, **kwargs):
+    return {"invoice_id": str(invoice_id), "amount": amount, "transaction_id": transaction_id, **kwargs}
+
+
+def test_reconcile_payments(api_client, user, account):
+    invoice = InvoiceFactory(account=account, status=InvoiceStatus.OPEN, total_amount=Decimal("100.00"))
+    partial_invoice = InvoiceFactory(account=account, status=InvoiceStatus.OPEN, total_amount=Decimal("100.00"))
+
+    api_client.force_login(user)
+    api_client.force_account(account)
+    response = api_client.post(
+        "/api/v1/payments/reconcile",
+        {
+            "payments": [
+                row(invoice.id, "60.00", "tx_1", received_at="2024-05-01T10:00:00Z"),
+                row(invoice.id, "40.00", "tx_2"),
+                row(partial_invoice.id, "30.00", "tx_3"),
+            ]
+        },
+        format="json",
+    )
+
+    assert response.status_code == 200
+    payments = {payment.transaction_id: payment for payment in Payment.objects.all()}
+    assert response.data == {
+        "results": [
+            {
+                "index": 0,
+                "status": ReconciliationStatus.RECORDED,
+                "payment_id": str(payments["tx_1"].id),
+                "error": None,
+            },
+            {
+                "index": 1,
+                "status": ReconciliationStatus.RECORDED,
+                "payment_id": str(payments["tx_2"].id),
+                "error": None,
+            },
+            {
+                "index": 2,
+                "status": ReconciliationStatus.RECORDED,
+                "payment_id": str(payments["tx_3"].id),
+                "error": None,
+            },
+        ]
+    }
+    assert payments["tx_1"].status == PaymentStatus.SUCCEEDED
+    assert payments["tx_1"].account == account
+    assert payments["tx_1"].currency == invoice.currency
+    assert payments["tx_1"].received_at.isoformat() == "2024-05-01T10:00:00+00:00"
+    assert list(payments["tx_1"].invoices.all()) == [invoice]
+
+    invoice.refresh_from_db()
+    assert invoice.status == InvoiceStatus.PAID
+    assert invoice.paid_at is not None
+    assert invoice.total_paid_amount.amount == Decimal("100.00")
+    assert invoice.outstanding_amount.amount == Decimal("0.00")
+
+    partial_invoice.refresh_from_db()
+    assert partial_invoice.status == InvoiceStatus.OPEN
+    assert partial_invoice.paid_at is None
+    assert partial_invoice.total_paid_amount.amount == Decimal("30.00")
+    assert partial_invoice.outstanding_amount.amount == Decimal("70.00")
+
+
+def test_reconcile_payments_reports_rejected_rows(api_client, user, account):
+    invoice = InvoiceFactory(account=account, status=InvoiceStatus.OPEN, total_amount=Decimal("100.00"))
+    draft = InvoiceFactory(account=account, status=InvoiceStatus.DRAFT, total_amount=Decimal("100.00"))
+    foreign_invoice = InvoiceFactory(
+        account=AccountFactory(), status=InvoiceStatus.OPEN, total_amount=Decimal("100.00")
+    )
+
+    api_client.force_login(user)
+    api_client.force_account(account)
+    response = api_client.post(
+        "/api/v1/payments/reconcile",
+        {
+            "payments": [
+                row(invoice.id, "80.00", "tx_1"),
+                row(invoice.id, "30.00", "tx_2"),
+                row(invoice.id, "0.00", "tx_3"),
+                row(draft.id, "10.00", "tx_4"),
+                row(foreign_invoice.id, "10.00", "tx_5"),
+                row(uuid4(), "10.00", "tx_6"),
+            ]
+        },
+        format="json",
+    )
+
+    assert response.status_code == 200
+    assert [(result["status"], result["error"]) for result in response.data["results"]] == [
+        (ReconciliationStatus.RECORDED, None),
+        (ReconciliationStatus.REJECTED, "Payment amount exceeds outstanding amount"),
+        (ReconciliationStatus.REJECTED, "Payment amount must be positive"),
+        (ReconciliationStatus.REJECTED, "Cannot record payment for invoice in status draft"),
+        (ReconciliationStatus.REJECTED, "Invoice not found"),
+        (ReconciliationStatus.REJECTED, "Invoice not found"),
+    ]
+    assert Payment.objects.count() == 1
+    invoice.refresh_from_db()
+    assert invoice.outstanding_amount.amount == Decimal("20.00")
+
+
+def test_reconcile_payments_skips_recorded_transactions(api_client, user, account):
+    invoice = InvoiceFactory(account=account, status=InvoiceStatus.OPEN, total_amount=Decimal("100.00"))
+    payment = PaymentFactory(
+        account=account, status=PaymentStatus.SUCCEEDED, amount=Decimal("10.00"), transaction_id="tx_1"
+    )
+    payment.invoices.add(invoice)
+
+    api_client.force_login(user)
+    api_client.force_account(account)
+    response = api_client.post(
+        "/api/v1/payments/reconcile",
+        {
+            "payments": [
+                row(invoice.id, "10.00", "tx_1"),
+                row(invoice.id, "20.00", "tx_2"),
+                row(invoice.id, "20.00", "tx_2"),
+            ]
+        },
+        format="json",
+    )
+
+    assert response.status_code == 200
+    assert [result["status"] for result in response.data["results"]] == [
+        ReconciliationStatus.DUPLICATE,
+        ReconciliationStatus.RECORDED,
+        ReconciliationStatus.DUPLICATE,
+    ]
+    assert Payment.objects.count() == 2
+
+
+def test_reconcile_payments_query_count_does_not_grow_with_rows(
+    api_client, user, account, django_assert_max_num_queries
+):
+    invoices = InvoiceFactory.create_batch(
+        20, account=account, status=InvoiceStatus.OPEN, total_amount=Decimal("100.00")
+    )
+
+    api_client.force_login(user)
+    api_client.force_account(account)
+    with django_assert_max_num_queries(15):
+        response = api_client.post(
+            "/api/v1/payments/reconcile",
+            {"payments": [row(invoice.id, "100.00", f"tx_{index}") for index, invoice in enumerate(invoices)]},
+            format="json",
+        )
+
+    assert response.status_code == 200
+    assert Payment.objects.count() == 20
+    assert set(Invoice.objects.values_list("status", flat=True)) == {InvoiceStatus.PAID}
+
+
+def test_reconcile_payments_validates_rows(api_client, user, account):
+    api_client.force_login(user)
+    api_client.force_account(account)
+    response = api_client.post(
+        "/api/v1/payments/reconcile",
+        {"payments": [{"invoice_id": "invalid", "amount": "10.00", "transaction_id": "tx_1"}]},
+        format="json",
+    )
+
+    assert response.status_code == 400
+    assert response.data["errors"][0]["attr"] == "payments.0.invoice_id"
+
+
+def test_reconcile_payments_requires_authentication(api_client, account):
+    invoice = InvoiceFactory(account=account, status=InvoiceStatus.OPEN, total_amount=Decimal("10.00"))
+
+    response = api_client.post(
+        "/api/v1/payments/reconcile",
+        {"payments": [row(invoice.id, "10.00", "tx_1")]},
+        format="json",
+    )
+
+    assert response.status_code == 403
+    assert Payment.objects.count() == 0
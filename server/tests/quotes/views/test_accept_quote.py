@@ -117,6 +117,7 @@ def test_accept_quote(api_client, user, account):
         "accepted_at": "2024-07-10T12:34:56Z",
         "canceled_at": None,
         "pdf_id": None,
+        "pdf_status": None,
         "invoice_id": ANY,
         "lines": [
             {
@@ -93,6 +93,7 @@ def test_cancel_quote(api_client, user, account):
         "accepted_at": None,
         "canceled_at": "2025-06-01T10:00:00Z",
         "pdf_id": None,
+        "pdf_status": None,
         "invoice_id": None,
         "lines": [],
         "discounts": [],
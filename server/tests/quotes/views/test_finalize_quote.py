@@ -2,9 +2,11 @@ import uuid
 from datetime import date
 
 import pytest
+from django.core.management import call_command
 from freezegun import freeze_time
 
 from openinvoice.quotes.choices import QuoteDeliveryMethod, QuoteStatus
+from openinvoice.rendering.choices import RenderStatus
 from tests.factories import CustomerFactory, QuoteFactory
 
 pytestmark = pytest.mark.django_db
@@ -65,7 +67,9 @@ def test_finalize_quote(api_client, user, account, pdf_generator):
     assert len(pdf_generator.requests) == 1
 
 
-def test_finalize_quote_with_automatic_delivery(api_client, user, account, pdf_generator, mailoutbox):
+def test_finalize_quote_with_automatic_delivery(
+    api_client, user, account, pdf_generator, mailoutbox, django_capture_on_commit_callbacks
+):
     customer = CustomerFactory(account=account)
     quote = QuoteFactory(
         account=account,
@@ -77,7 +81,8 @@ def test_finalize_quote_with_automatic_delivery(api_client, user, account, pdf_g
 
     api_client.force_login(user)
     api_client.force_account(account)
-    response = api_client.post(f"/api/v1/quotes/{quote.id}/finalize")
+    with django_capture_on_commit_callbacks(execute=True):
+        response = api_client.post(f"/api/v1/quotes/{quote.id}/finalize")
 
     assert response.status_code == 200
     assert len(pdf_generator.requests) == 1
@@ -87,6 +92,40 @@ def test_finalize_quote_with_automatic_delivery(api_client, user, account, pdf_g
     assert email.to == ["test@example.com"]
 
 
+def test_finalize_quote_renders_pdf_asynchronously(
+    api_client, user, account, settings, pdf_generator, mailoutbox, django_capture_on_commit_callbacks
+):
+    settings.PDF_RENDER_ASYNC = True
+    customer = CustomerFactory(account=account)
+    quote = QuoteFactory(
+        account=account,
+        customer=customer,
+        number="QT-2025-3003",
+        delivery_method=QuoteDeliveryMethod.AUTOMATIC,
+        recipients=["test@example.com"],
+    )
+
+    api_client.force_login(user)
+    api_client.force_account(account)
+    response = api_client.post(f"/api/v1/quotes/{quote.id}/finalize")
+
+    assert response.status_code == 200
+    assert response.data["status"] == QuoteStatus.OPEN
+    assert response.data["pdf_id"] is None
+    assert response.data["pdf_status"] == RenderStatus.PENDING
+    assert len(pdf_generator.requests) == 0
+    assert len(mailoutbox) == 0
+
+    with django_capture_on_commit_callbacks(execute=True):
+        call_command("process_render_jobs", "--once")
+
+    quote.refresh_from_db()
+    assert quote.pdf_id is not None
+    assert quote.pdf_status == RenderStatus.READY
+    assert len(pdf_generator.requests) == 1
+    assert len(mailoutbox) == 1
+
+
 def test_finalize_quote_with_no_recipients(api_client, user, account, pdf_generator, mailoutbox):
     customer = CustomerFactory(account=account)
     quote = QuoteFactory(
@@ -271,3 +271,22 @@ def test_list_quotes_requires_account(api_client, user):
             }
         ],
     }
+
+
+def test_list_quotes_projects_draft_numbers(api_client, user, account):
+    numbering_system = NumberingSystemFactory(
+        account=account,
+        template="QT-{n}",
+        applies_to=NumberingSystemAppliesTo.QUOTE,
+    )
+    numbering_system.allocate_number(effective_at=timezone.now())
+    drafts = QuoteFactory.create_batch(3, account=account, numbering_system=numbering_system)
+
+    api_client.force_login(user)
+    api_client.force_account(account)
+    response = api_client.get("/api/v1/quotes")
+
+    assert response.status_code == 200
+    numbers = {result["id"]: result["number"] for result in response.data["results"]}
+    assert [numbers[str(draft.id)] for draft in drafts] == ["QT-2", "QT-3", "QT-4"]
+    assert numbers == {str(quote.id): quote.effective_number for quote in Quote.objects.all()}
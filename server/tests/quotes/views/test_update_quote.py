@@ -103,6 +103,7 @@ def test_update_quote(api_client, user, account):
         "accepted_at": None,
         "canceled_at": None,
         "pdf_id": None,
+        "pdf_status": None,
         "invoice_id": None,
         "lines": [],
         "discounts": [],
@@ -0,0 +1,156 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from openinvoice.invoices.choices import InvoiceDeliveryMethod, InvoiceDocumentAudience, InvoiceStatus
+from openinvoice.rendering.choices import RenderJobKind, RenderJobStatus, RenderStatus
+from openinvoice.rendering.models import RenderJob
+from tests.factories import InvoiceDocumentFactory, InvoiceFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def async_rendering(settings):
+    settings.PDF_RENDER_ASYNC = True
+    settings.PDF_RENDER_MAX_ATTEMPTS = 2
+    settings.PDF_RENDER_RETRY_DELAY = 10
+
+
+@pytest.fixture
+def invoice():
+    invoice = InvoiceFactory(status=InvoiceStatus.OPEN)
+    InvoiceDocumentFactory(invoice=invoice, audience=[InvoiceDocumentAudience.CUSTOMER], status=RenderStatus.PENDING)
+    return invoice
+
+
+def test_enqueue_renders_inline_when_rendering_is_synchronous(invoice, pdf_generator):
+    assert RenderJob.objects.enqueue(RenderJobKind.INVOICE, invoice.id) is None
+
+    assert not RenderJob.objects.exists()
+    assert invoice.documents.get().status == RenderStatus.READY
+    assert len(pdf_generator.requests) == 1
+
+
+@pytest.mark.usefixtures("async_rendering")
+def test_enqueue_defers_job_when_rendering_is_asynchronous(invoice, pdf_generator):
+    job = RenderJob.objects.enqueue(RenderJobKind.INVOICE, invoice.id)
+
+    job.refresh_from_db()
+    assert job.status == RenderJobStatus.PENDING
+    assert job.attempts == 0
+    assert pdf_generator.requests == []
+
+
+@pytest.mark.usefixtures("async_rendering")
+def test_process_next_renders_due_job(invoice, pdf_generator):
+    job = RenderJob.objects.enqueue(RenderJobKind.INVOICE, invoice.id)
+
+    assert RenderJob.objects.process_next() == job
+    assert RenderJob.objects.process_next() is None
+
+    job.refresh_from_db()
+    document = invoice.documents.get()
+    assert job.status == RenderJobStatus.COMPLETED
+    assert document.status == RenderStatus.READY
+    assert document.file is not None
+    assert len(pdf_generator.requests) == 1
+
+
+@pytest.mark.usefixtures("async_rendering")
+def test_process_next_skips_jobs_scheduled_later(invoice):
+    RenderJob.objects.create(
+        kind=RenderJobKind.INVOICE,
+        object_id=invoice.id,
+        run_after=timezone.now() + timedelta(minutes=1),
+    )
+
+    assert RenderJob.objects.process_next() is None
+
+
+@pytest.mark.usefixtures("async_rendering")
+def test_process_next_skips_running_jobs(invoice):
+    job = RenderJob.objects.enqueue(RenderJobKind.INVOICE, invoice.id)
+    job.claim()
+
+    assert RenderJob.objects.process_next() is None
+
+
+@pytest.mark.usefixtures("async_rendering")
+def test_process_next_takes_over_job_with_expired_lease(invoice, pdf_generator):
+    job = RenderJob.objects.enqueue(RenderJobKind.INVOICE, invoice.id)
+    job.claim()
+    RenderJob.objects.filter(id=job.id).update(run_after=timezone.now())
+
+    assert RenderJob.objects.process_next() == job
+
+    job.refresh_from_db()
+    assert job.status == RenderJobStatus.COMPLETED
+    assert len(pdf_generator.requests) == 1
+
+
+@pytest.mark.usefixtures("async_rendering")
+def test_process_next_delivers_invoice_after_commit(django_capture_on_commit_callbacks, mailoutbox):
+    invoice = InvoiceFactory(
+        status=InvoiceStatus.OPEN,
+        delivery_method=InvoiceDeliveryMethod.AUTOMATIC,
+        recipients=["test@example.com"],
+    )
+    InvoiceDocumentFactory(invoice=invoice, audience=[InvoiceDocumentAudience.CUSTOMER], status=RenderStatus.PENDING)
+    RenderJob.objects.enqueue(RenderJobKind.INVOICE, invoice.id)
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        RenderJob.objects.process_next()
+
+    assert len(mailoutbox) == 0
+
+    for callback in callbacks:
+        callback()
+
+    assert len(mailoutbox) == 1
+    assert mailoutbox[0].to == ["test@example.com"]
+
+
+@pytest.mark.usefixtures("async_rendering")
+def test_failed_job_is_retried_with_backoff(invoice):
+    job = RenderJob.objects.enqueue(RenderJobKind.INVOICE, invoice.id)
+
+    with patch("openinvoice.invoices.pdf.generate_pdfs", side_effect=RuntimeError("Renderer unavailable")):
+        RenderJob.objects.process_next()
+
+    job.refresh_from_db()
+    document = invoice.documents.get()
+    assert job.status == RenderJobStatus.PENDING
+    assert job.attempts == 1
+    assert job.last_error == "RuntimeError('Renderer unavailable')"
+    assert job.run_after > timezone.now() + timedelta(seconds=5)
+    assert document.status == RenderStatus.PENDING
+    assert document.file is None
+
+
+@pytest.mark.usefixtures("async_rendering")
+def test_job_fails_after_max_attempts(invoice):
+    job = RenderJob.objects.enqueue(RenderJobKind.INVOICE, invoice.id)
+
+    with patch("openinvoice.invoices.pdf.generate_pdfs", side_effect=RuntimeError("Renderer unavailable")):
+        RenderJob.objects.process_next()
+        RenderJob.objects.filter(id=job.id).update(run_after=timezone.now())
+        RenderJob.objects.process_next()
+
+    job.refresh_from_db()
+    assert job.status == RenderJobStatus.FAILED
+    assert job.attempts == 2
+    assert invoice.documents.get().status == RenderStatus.FAILED
+
+
+@pytest.mark.usefixtures("async_rendering")
+def test_process_render_jobs_command(invoice, capsys):
+    RenderJob.objects.enqueue(RenderJobKind.INVOICE, invoice.id)
+
+    call_command("process_render_jobs", "--once")
+
+    assert f"Rendered invoice {invoice.id}" in capsys.readouterr().out
+    assert invoice.documents.get().status == RenderStatus.READY
@@ -0,0 +1,127 @@
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from openinvoice.search.choices import SearchDocumentKind
+from openinvoice.search.models import SearchDocument
+from openinvoice.search.queries import has_trigram_index, search_documents
+from tests.factories import BillingProfileFactory, CustomerFactory, InvoiceFactory, ProductFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_search_document_indexes_saved_objects(account):
+    customer = CustomerFactory(
+        account=account,
+        name="Acme",
+        default_billing_profile=BillingProfileFactory(email="billing@acme.test", phone="555123"),
+    )
+    invoice = InvoiceFactory(account=account, customer=customer, number="INV-42")
+    product = ProductFactory(account=account, name="Widget", description="Blue")
+
+    documents = {document.object_id: document.text for document in SearchDocument.objects.filter(account=account)}
+
+    assert documents == {
+        customer.id: f"{customer.id} Acme billing@acme.test 555123 {customer.description}",
+        invoice.id: f"{invoice.id} INV-42 Acme {invoice.billing_profile.email}",
+        product.id: f"{product.id} Widget Blue",
+    }
+
+
+def test_search_document_follows_customer_and_billing_profile_changes(account):
+    customer = CustomerFactory(account=account, name="Old name")
+    invoice = InvoiceFactory(account=account, customer=customer, billing_profile=customer.default_billing_profile)
+
+    customer.name = "New name"
+    customer.save()
+    customer.default_billing_profile.email = "new@example.com"
+    customer.default_billing_profile.save()
+
+    matches = search_documents(account_id=account.id, terms=["new"], limit=5)
+    assert matches[SearchDocumentKind.CUSTOMER] == [customer.id]
+    assert matches[SearchDocumentKind.INVOICE] == [invoice.id]
+    assert search_documents(account_id=account.id, terms=["old"], limit=5) == {}
+    assert "new@example.com" in SearchDocument.objects.get(object_id=invoice.id).text
+
+
+def test_search_document_skips_saves_of_unindexed_fields(account, django_assert_num_queries):
+    product = ProductFactory(account=account, name="Widget")
+
+    with django_assert_num_queries(1):
+        product.save(update_fields=["metadata"])
+
+
+def test_search_document_reindexes_invoices_only_when_customer_name_changes(account, django_assert_num_queries):
+    customer = CustomerFactory(account=account, name="Acme")
+    InvoiceFactory(account=account, customer=customer)
+
+    # Customer name lookup, save, customer document
+    with django_assert_num_queries(3):
+        customer.description = "Rockets"
+        customer.save()
+
+    with django_assert_num_queries(4):
+        customer.name = "Acme Corp"
+        customer.save()
+
+
+def test_search_documents_matches_word_prefixes(account):
+    product = ProductFactory(account=account, name="Widget Deluxe")
+    ProductFactory(account=account, name="Gadget")
+
+    matches = search_documents(account_id=account.id, terms=["wid", "del"], limit=5)
+
+    assert matches[SearchDocumentKind.PRODUCT] == [product.id]
+
+
+def test_search_document_removed_with_object(account):
+    product = ProductFactory(account=account)
+
+    product.delete()
+
+    assert not SearchDocument.objects.filter(object_id=product.id).exists()
+
+
+def test_search_documents_ranks_whole_words_first(account):
+    partial = ProductFactory(account=account, name="Alphabet")
+    whole = ProductFactory(account=account, name="Alpha")
+    older_partial = ProductFactory(account=account, name="Alphanumeric")
+    SearchDocument.objects.filter(object_id=older_partial.id).update(created_at=partial.created_at.replace(year=2000))
+
+    matches = search_documents(account_id=account.id, terms=["alpha"], limit=5)
+
+    assert matches[SearchDocumentKind.PRODUCT] == [whole.id, partial.id, older_partial.id]
+
+
+def test_search_documents_escapes_like_wildcards(account):
+    if not has_trigram_index():
+        pytest.skip("substring matches require the pg_trgm extension")
+
+    ProductFactory(account=account, name="Plain")
+    discounted = ProductFactory(account=account, name="50% off")
+
+    matches = search_documents(account_id=account.id, terms=["%"], limit=5)
+
+    assert matches[SearchDocumentKind.PRODUCT] == [discounted.id]
+
+
+def test_rebuild_search_index_command(account):
+    product = ProductFactory(account=account, name="Widget")
+    customer = CustomerFactory(account=account)
+    InvoiceFactory(account=account, customer=customer)
+    SearchDocument.objects.all().delete()
+
+    out = StringIO()
+    call_command("rebuild_search_index", "--account", str(account.id), stdout=out)
+
+    assert SearchDocument.objects.filter(account=account).count() == 3
+    assert search_documents(account_id=account.id, terms=["widget"], limit=5) == {
+        SearchDocumentKind.PRODUCT: [product.id]
+    }
+    assert "Indexed 3 search documents" in out.getvalue()
+
+
+def test_rebuild_search_index_command_requires_scope():
+    with pytest.raises(CommandError):
+        call_command("rebuild_search_index")
@@ -1,6 +1,8 @@
 from unittest.mock import ANY
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from openinvoice.invoices.choices import InvoiceDocumentAudience
 from tests.factories import (
@@ -209,6 +211,7 @@ def test_search_all(api_client, user, account):
                         "memo": document.memo,
                         "custom_fields": document.custom_fields,
                         "url": None,
+                        "status": None,
                         "created_at": ANY,
                         "updated_at": ANY,
                     }
@@ -508,3 +511,21 @@ def test_search_requires_account(api_client, user):
             }
         ],
     }
+
+
+def test_search_matches_in_a_single_query(api_client, user, account):
+    for i in range(3):
+        customer = CustomerFactory(account=account, name=f"Alpha Customer {i}")
+        ProductFactory(account=account, name=f"Alpha Product {i}")
+        InvoiceFactory(account=account, customer=customer)
+
+    api_client.force_login(user)
+    api_client.force_account(account)
+    with CaptureQueriesContext(connection) as captured:
+        response = api_client.get("/api/v1/search", {"search": "Alpha"})
+
+    assert response.status_code == 200
+    assert len(response.data["invoices"]) == 3
+    searches = [query["sql"] for query in captured.captured_queries if "TO_TSQUERY" in query["sql"].upper()]
+    assert len(searches) == 1
+    assert "search_searchdocument" in searches[0]
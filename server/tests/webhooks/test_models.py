@@ -0,0 +1,190 @@
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from openinvoice.payments.choices import PaymentStatus
+from openinvoice.webhooks.choices import WebhookEventStatus, WebhookSource
+from openinvoice.webhooks.models import WebhookEvent
+from tests.factories import PaymentFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def async_webhooks(settings):
+    settings.WEBHOOK_PROCESS_ASYNC = True
+    settings.WEBHOOK_MAX_ATTEMPTS = 2
+    settings.WEBHOOK_RETRY_DELAY = 10
+
+
+def checkout_event(event_id, payment_id, event_type="checkout.session.completed", created=1_700_000_000):
+    return {
+        "id": event_id,
+        "type": event_type,
+        "created": created,
+        "data": {"object": {"client_reference_id": str(payment_id), "created": created, "payment_status": "paid"}},
+    }
+
+
+def test_receive_processes_event_when_processing_is_synchronous():
+    payment = PaymentFactory(status=PaymentStatus.PENDING, amount=Decimal("10.00"))
+
+    event = WebhookEvent.objects.receive(WebhookSource.STRIPE_CONNECTION, checkout_event("evt_1", payment.id))
+
+    payment.refresh_from_db()
+    assert event.status == WebhookEventStatus.PROCESSED
+    assert event.attempts == 1
+    assert event.ordering_key == str(payment.id)
+    assert event.occurred_at == datetime.fromtimestamp(1_700_000_000, tz=UTC)
+    assert payment.status == PaymentStatus.SUCCEEDED
+
+
+def test_delayed_payment_is_settled_by_its_async_event():
+    payment = PaymentFactory(status=PaymentStatus.PENDING, amount=Decimal("10.00"))
+    completed = checkout_event("evt_1", payment.id)
+    completed["data"]["object"]["payment_status"] = "unpaid"
+
+    WebhookEvent.objects.receive(WebhookSource.STRIPE_CONNECTION, completed)
+    payment.refresh_from_db()
+    assert payment.status == PaymentStatus.PENDING
+
+    WebhookEvent.objects.receive(
+        WebhookSource.STRIPE_CONNECTION,
+        checkout_event("evt_2", payment.id, "checkout.session.async_payment_failed", created=1_700_000_100),
+    )
+    payment.refresh_from_db()
+    assert payment.status == PaymentStatus.FAILED
+
+
+def test_receive_ignores_unhandled_event_types():
+    event = WebhookEvent.objects.receive(WebhookSource.STRIPE, {"id": "evt_1", "type": "invoice.created"})
+
+    assert event is None
+    assert not WebhookEvent.objects.exists()
+
+
+@pytest.mark.usefixtures("async_webhooks")
+def test_receive_defers_event_when_processing_is_asynchronous():
+    payment = PaymentFactory(status=PaymentStatus.PENDING)
+
+    event = WebhookEvent.objects.receive(WebhookSource.STRIPE_CONNECTION, checkout_event("evt_1", payment.id))
+
+    event.refresh_from_db()
+    payment.refresh_from_db()
+    assert event.status == WebhookEventStatus.PENDING
+    assert event.attempts == 0
+    assert payment.status == PaymentStatus.PENDING
+
+
+@pytest.mark.usefixtures("async_webhooks")
+def test_receive_stores_redelivered_event_once():
+    payment = PaymentFactory(status=PaymentStatus.PENDING)
+
+    first = WebhookEvent.objects.receive(WebhookSource.STRIPE_CONNECTION, checkout_event("evt_1", payment.id))
+    second = WebhookEvent.objects.receive(WebhookSource.STRIPE_CONNECTION, checkout_event("evt_1", payment.id))
+
+    first.refresh_from_db()
+    assert first == second
+    assert first.duplicates == 1
+    assert WebhookEvent.objects.count() == 1
+
+
+def test_redelivered_event_is_not_processed_again():
+    payment = PaymentFactory(status=PaymentStatus.PENDING)
+    WebhookEvent.objects.receive(WebhookSource.STRIPE_CONNECTION, checkout_event("evt_1", payment.id))
+    payment.refresh_from_db()
+    received_at = payment.received_at
+
+    with patch("openinvoice.invoices.models.Invoice.recalculate_paid") as recalculate_paid:
+        event = WebhookEvent.objects.receive(WebhookSource.STRIPE_CONNECTION, checkout_event("evt_1", payment.id))
+
+    event.refresh_from_db()
+    payment.refresh_from_db()
+    assert event.attempts == 1
+    assert event.duplicates == 1
+    assert payment.received_at == received_at
+    recalculate_paid.assert_not_called()
+
+
+@pytest.mark.usefixtures("async_webhooks")
+def test_process_batch_processes_due_events():
+    payments = PaymentFactory.create_batch(3, status=PaymentStatus.PENDING)
+    for index, payment in enumerate(payments):
+        WebhookEvent.objects.receive(WebhookSource.STRIPE_CONNECTION, checkout_event(f"evt_{index}", payment.id))
+
+    processed = WebhookEvent.objects.process_batch(limit=2)
+
+    assert [event.event_id for event in processed] == ["evt_0", "evt_1"]
+    assert WebhookEvent.objects.filter(status=WebhookEventStatus.PENDING).count() == 1
+    assert len(WebhookEvent.objects.process_batch(limit=2)) == 1
+    assert WebhookEvent.objects.process_batch(limit=2) == []
+
+
+@pytest.mark.usefixtures("async_webhooks")
+def test_process_batch_keeps_events_of_a_payment_in_order():
+    payment = PaymentFactory(status=PaymentStatus.PENDING)
+    # Delivered out of order: the failure happened before the later success
+    WebhookEvent.objects.receive(
+        WebhookSource.STRIPE_CONNECTION,
+        checkout_event("evt_2", payment.id, "checkout.session.async_payment_succeeded", created=1_700_000_100),
+    )
+    WebhookEvent.objects.receive(
+        WebhookSource.STRIPE_CONNECTION,
+        checkout_event("evt_1", payment.id, "checkout.session.async_payment_failed", created=1_700_000_000),
+    )
+
+    assert [event.event_id for event in WebhookEvent.objects.process_batch(limit=10)] == ["evt_1", "evt_2"]
+
+
+@pytest.mark.usefixtures("async_webhooks")
+def test_failed_event_is_retried_with_backoff_and_holds_back_later_events():
+    missing = WebhookEvent.objects.receive(
+        WebhookSource.STRIPE_CONNECTION, checkout_event("evt_1", "00000000-0000-0000-0000-000000000000")
+    )
+    WebhookEvent.objects.receive(
+        WebhookSource.STRIPE_CONNECTION,
+        checkout_event("evt_2", "00000000-0000-0000-0000-000000000000", "checkout.session.expired", 1_700_000_100),
+    )
+
+    before = timezone.now()
+    assert WebhookEvent.objects.process_batch(limit=10) == [missing]
+
+    missing.refresh_from_db()
+    assert missing.status == WebhookEventStatus.PENDING
+    assert missing.attempts == 1
+    assert "DoesNotExist" in missing.last_error
+    assert missing.run_after >= before + timedelta(seconds=10)
+    assert WebhookEvent.objects.process_batch(limit=10) == []
+
+
+@pytest.mark.usefixtures("async_webhooks")
+def test_event_is_dead_lettered_after_max_attempts():
+    event = WebhookEvent.objects.receive(
+        WebhookSource.STRIPE_CONNECTION, checkout_event("evt_1", "00000000-0000-0000-0000-000000000000")
+    )
+
+    WebhookEvent.objects.process_batch(limit=10)
+    WebhookEvent.objects.filter(id=event.id).update(run_after=timezone.now())
+    WebhookEvent.objects.process_batch(limit=10)
+
+    event.refresh_from_db()
+    assert event.status == WebhookEventStatus.FAILED
+    assert event.attempts == 2
+    assert WebhookEvent.objects.process_batch(limit=10) == []
+
+
+@pytest.mark.usefixtures("async_webhooks")
+def test_process_webhook_events_command_drains_inbox(capsys):
+    payment = PaymentFactory(status=PaymentStatus.PENDING)
+    WebhookEvent.objects.receive(WebhookSource.STRIPE_CONNECTION, checkout_event("evt_1", payment.id))
+
+    call_command("process_webhook_events", once=True)
+
+    payment.refresh_from_db()
+    assert "Processed checkout.session.completed evt_1" in capsys.readouterr().out
+    assert payment.status == PaymentStatus.SUCCEEDED
+    assert not WebhookEvent.objects.filter(status=WebhookEventStatus.PENDING).exists()